@@ -70,12 +70,79 @@ APP_PUBLIC_URL = _raw_public or ""
 # SMTP connection mode: port 465 often uses implicit SSL; 587 typically uses STARTTLS.
 SMTP_USE_SSL = _bool_env("SMTP_USE_SSL", False) or _bool_env("EMAIL_USE_SSL", False)
 SMTP_USE_TLS = _bool_env("SMTP_USE_TLS", True)
+# One authenticated SMTP session is reused across sends: it is replaced after
+# SMTP_KEEPALIVE_SECONDS idle (servers drop idle clients after a few minutes) or
+# SMTP_MAX_MESSAGES_PER_CONNECTION messages (a common per-session server limit).
+SMTP_TIMEOUT_SECONDS = _int_env("SMTP_TIMEOUT_SECONDS", default=30)
+SMTP_KEEPALIVE_SECONDS = _int_env("SMTP_KEEPALIVE_SECONDS", default=240)
+SMTP_MAX_MESSAGES_PER_CONNECTION = _int_env("SMTP_MAX_MESSAGES_PER_CONNECTION", default=100)
 
 # WhatsApp configuration (using Twilio or similar service)
 WHATSAPP_ACCOUNT_SID = os.getenv("WHATSAPP_ACCOUNT_SID", "")
 WHATSAPP_AUTH_TOKEN = os.getenv("WHATSAPP_AUTH_TOKEN", "")
 WHATSAPP_FROM_NUMBER = os.getenv("WHATSAPP_FROM_NUMBER", "")
 
+# Notification outbox: alerts are queued with the change and delivered by a dispatcher.
+# The in-process worker suits long-running servers; on Vercel (VERCEL is set there)
+# it is off and the /api/internal/cron/notifications cron drains the outbox instead.
+OUTBOX_WORKER_ENABLED = _bool_env("OUTBOX_WORKER_ENABLED", not os.getenv("VERCEL"))
+OUTBOX_POLL_SECONDS = _int_env("OUTBOX_POLL_SECONDS", default=30)
+# Retries back off exponentially from OUTBOX_RETRY_BASE_SECONDS (capped at an hour);
+# a message is marked failed after OUTBOX_MAX_ATTEMPTS attempts.
+OUTBOX_MAX_ATTEMPTS = _int_env("OUTBOX_MAX_ATTEMPTS", default=6)
+OUTBOX_RETRY_BASE_SECONDS = _int_env("OUTBOX_RETRY_BASE_SECONDS", default=60)
+# Admin alert digest: when ADMIN_ALERT_DIGEST_MINUTES > 0, new advance / off-day
+# requests within that window produce one summary of everything still pending
+# instead of one alert each (0 keeps per-request alerts). The digest also goes
+# to ADMIN_NOTIFICATION_WHATSAPP when set (format: whatsapp:+1234567890).
+ADMIN_ALERT_DIGEST_MINUTES = _int_env("ADMIN_ALERT_DIGEST_MINUTES", default=0)
+ADMIN_NOTIFICATION_WHATSAPP = (os.getenv("ADMIN_NOTIFICATION_WHATSAPP") or "").strip()
+
+# Seconds before the in-process employee directory (names, roles) is reloaded.
+# Local writes invalidate it immediately; this bounds staleness across instances.
+EMPLOYEE_DIRECTORY_TTL_SECONDS = _int_env("EMPLOYEE_DIRECTORY_TTL_SECONDS", default=300)
+
+# Seconds the admin dashboard aggregate (GET /api/admin/dashboard) is served from cache.
+DASHBOARD_CACHE_TTL_SECONDS = _int_env("DASHBOARD_CACHE_TTL_SECONDS", default=15)
+
+# Seconds the payroll register of a closed month is kept once built (closed months
+# do not change; this only bounds memory held for rarely downloaded months).
+PAYROLL_REGISTER_CACHE_TTL_SECONDS = _int_env("PAYROLL_REGISTER_CACHE_TTL_SECONDS", default=86400)
+
+# Payslip ZIPs (GET /api/admin/payroll/payslips): batches of at least
+# PAYSLIP_POOL_MIN_BATCH payslips render on a pool of PAYSLIP_RENDER_WORKERS
+# processes (below 2 always renders in-process).
+PAYSLIP_RENDER_WORKERS = _int_env("PAYSLIP_RENDER_WORKERS", default=min(4, os.cpu_count() or 1))
+PAYSLIP_POOL_MIN_BATCH = _int_env("PAYSLIP_POOL_MIN_BATCH", default=500)
+
+# Responses at least this large (bytes) are gzip/brotli compressed when the client accepts it.
+COMPRESSION_MIN_SIZE = _int_env("COMPRESSION_MIN_SIZE", default=1024)
+
+# Delta sync (GET /api/sync) holds back rows stamped within this many seconds, so a
+# transaction that commits shortly after stamping updated_at is not skipped.
+SYNC_SETTLE_SECONDS = _int_env("SYNC_SETTLE_SECONDS", default=2)
+
+# Live admin events (GET /api/events/stream). With several instances on Postgres,
+# enable this so writes are fanned out through LISTEN/NOTIFY to every instance.
+EVENTS_PG_NOTIFY = _bool_env("EVENTS_PG_NOTIFY", False)
+
+# Signed session tokens issued by /api/login (HS256). Without JWT_SECRET no tokens
+# are issued (login returns access_token: null), since a per-process secret would
+# not work across instances. Must be the same on every instance.
+JWT_SECRET = (os.getenv("JWT_SECRET") or "").strip()
+JWT_ALGORITHM = "HS256"
+ACCESS_TOKEN_TTL_MINUTES = _int_env("ACCESS_TOKEN_TTL_MINUTES", default=60)
+# When true, protected endpoints reject requests without a Bearer token instead of
+# falling back to the ids in the request body (legacy dashboards). Requires JWT_SECRET;
+# the app refuses to start without it.
+AUTH_REQUIRE_TOKEN = _bool_env("AUTH_REQUIRE_TOKEN", False)
+
+# Rate-limit counters (login 5/minute, AI 10/minute). "memory://" is per process;
+# "sqlite:////path/limits.db" shares them between workers on one host and
+# "redis://host:6379/0" across instances (needs the redis package).
+RATE_LIMIT_STORAGE_URI = (os.getenv("RATE_LIMIT_STORAGE_URI") or "memory://").strip()
+RATE_LIMIT_STRATEGY = (os.getenv("RATE_LIMIT_STRATEGY") or "sliding-window-counter").strip()
+
 # Vercel Cron: set in project env; sent as Authorization: Bearer <value> on cron requests
 CRON_SECRET = (os.getenv("CRON_SECRET") or "").strip()
 
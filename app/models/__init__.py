@@ -13,6 +13,10 @@ from .schema import (
     OffDayStatus,
     SalaryPayment,
     PayrollPeriodClose,
+    PayRunEntry,
+    SyncTombstone,
+    NotificationOutbox,
+    OutboxStatus,
     create_tables,
     get_engine,
     get_session,
@@ -29,6 +33,10 @@ __all__ = [
     "OffDayStatus",
     "SalaryPayment",
     "PayrollPeriodClose",
+    "PayRunEntry",
+    "SyncTombstone",
+    "NotificationOutbox",
+    "OutboxStatus",
     "create_tables",
     "get_engine",
     "get_session",
@@ -15,6 +15,7 @@ from sqlalchemy import (
     Enum,
     Text,
     UniqueConstraint,
+    Index,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
@@ -38,6 +39,13 @@ class AdvanceStatus(enum.Enum):
     DENIED = "denied"
 
 
+class OutboxStatus(enum.Enum):
+    """Delivery state of a queued notification"""
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"  # gave up after the last retry
+
+
 class OffDayStatus(enum.Enum):
     """Status for off day requests"""
     PENDING = "pending"
@@ -66,7 +74,7 @@ class Employee(Base):
     # Unpaid balance rolled forward when admin closes prior payroll periods (see payroll_service)
     salary_arrears = Column(Float, nullable=True, default=0.0)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relationships
     advances = relationship("Advance", back_populates="employee")
@@ -82,15 +90,29 @@ class Employee(Base):
 class UserAuth(Base):
     """Simple authentication table (e.g. for PIN-based or lightweight auth)."""
     __tablename__ = 'user_auth'
+    __table_args__ = (
+        # Login looks up (first_name, pin) then joins employee by primary key
+        Index("ix_user_auth_first_name_pin", "first_name", "pin"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
+    # One PIN per employee (nullable only for legacy rows the backfill could not match)
+    employee_id = Column(
+        Integer,
+        ForeignKey('employee.id', ondelete='CASCADE'),
+        nullable=True,
+        unique=True,
+        index=True,
+    )
     # 4-digit integer PIN
     pin = Column(Integer, nullable=False)
     first_name = Column(String(100), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    employee = relationship("Employee")
+
     def __repr__(self):
-        return f"<UserAuth(id={self.id}, first_name={self.first_name})>"
+        return f"<UserAuth(id={self.id}, employee_id={self.employee_id}, first_name={self.first_name})>"
 
 
 class Bill(Base):
@@ -112,7 +134,7 @@ class Bill(Base):
     recorded_by_id = Column(Integer, ForeignKey('employee.id'), nullable=False)
 
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     # Relationships
     billed_employee = relationship("Employee", foreign_keys=[billed_employee_id], back_populates="bills_received")
@@ -137,7 +159,7 @@ class Advance(Base):
     approval_notes = Column(Text, nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)  # when advance was requested
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     # Relationship back to employee
     employee = relationship("Employee", back_populates="advances")
@@ -169,7 +191,7 @@ class OffDay(Base):
     status = Column(Enum(OffDayStatus), nullable=False, default=OffDayStatus.PENDING)
 
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     # Relationship back to employee
     employee = relationship("Employee", back_populates="off_days")
@@ -200,7 +222,7 @@ class SalaryPayment(Base):
     payroll_month = Column(Integer, nullable=True)
     
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relationships
     employee = relationship("Employee", foreign_keys=[employee_id], back_populates="salary_payments")
@@ -229,6 +251,68 @@ class PayrollPeriodClose(Base):
     employee = relationship("Employee", backref="payroll_period_closes")
 
 
+class PayRunEntry(Base):
+    """Idempotency + audit: an employee was paid by the pay run for a payroll month."""
+    __tablename__ = "pay_run_entry"
+    __table_args__ = (
+        UniqueConstraint(
+            "employee_id", "year", "month", name="uq_pay_run_emp_ym"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    employee_id = Column(Integer, ForeignKey("employee.id"), nullable=False)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    salary_payment_id = Column(Integer, ForeignKey("salary_payment.id"), nullable=False)
+    amount_paid = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class SyncTombstone(Base):
+    """Deleted rows of synced tables, so offline clients (/api/sync) can drop them too."""
+    __tablename__ = "sync_tombstone"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    table_name = Column(String(50), nullable=False)
+    row_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<SyncTombstone(table_name={self.table_name}, row_id={self.row_id})>"
+
+
+class NotificationOutbox(Base):
+    """
+    Notifications queued in the same transaction as the change they announce,
+    delivered later by the outbox dispatcher (with retries).
+    """
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        # Dispatcher scan: due pending rows, oldest first
+        Index("ix_notification_outbox_due", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String(50), nullable=False)  # e.g. "advance.created"
+    record_id = Column(Integer, nullable=True)  # id of the advance / off day / ...
+    channel = Column(String(20), nullable=False)  # "email" or "whatsapp"
+    recipient = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=True)
+    body = Column(Text, nullable=False)
+    body_html = Column(Text, nullable=True)
+
+    status = Column(Enum(OutboxStatus), nullable=False, default=OutboxStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<NotificationOutbox(id={self.id}, kind={self.kind}, status={self.status.value})>"
+
+
 def create_tables(engine):
     """Create all tables in the database"""
     Base.metadata.create_all(engine)
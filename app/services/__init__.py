@@ -9,6 +9,11 @@ from .advance_service import (
     get_employee_advances
 )
 
+from .approval_service import (
+    decide_advances,
+    decide_off_days,
+)
+
 from .bill_service import (
     add_bill,
     update_bill,
@@ -33,6 +38,8 @@ from .notification_service import (
     send_advance_decision_notification,
     notify_admin_new_advance,
     notify_admin_new_off_day,
+    queue_admin_new_advance,
+    queue_admin_new_off_day,
 )
 
 from .attendance_service import (
@@ -56,12 +63,17 @@ from .salary_payment_service import (
     get_salary_payment_by_id
 )
 
+from .pay_run_service import run_pay_run
+
 __all__ = [
     # Advance service
     'request_advance',
     'approve_advance',
     'get_pending_advances',
     'get_employee_advances',
+    # Approval service (batch decisions)
+    'decide_advances',
+    'decide_off_days',
     # Bill service
     'add_bill',
     'update_bill',
@@ -82,6 +94,8 @@ __all__ = [
     'send_advance_decision_notification',
     'notify_admin_new_advance',
     'notify_admin_new_off_day',
+    'queue_admin_new_advance',
+    'queue_admin_new_off_day',
     # Attendance service
     'is_today_off_day',
     'update_employee_attendance_for_date',
@@ -96,6 +110,8 @@ __all__ = [
     'record_salary_payment',
     'get_employee_salary_payments',
     'get_all_salary_payments',
-    'get_salary_payment_by_id'
+    'get_salary_payment_by_id',
+    # Pay run service
+    'run_pay_run',
 ]
 
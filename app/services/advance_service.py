@@ -3,8 +3,11 @@ Service for handling advance requests
 Staff and Managers can request advances, Admin can approve/deny them
 """
 
+from typing import Optional
 from sqlalchemy.orm import Session
-from app.models.schema import Employee, Advance, Role, AdvanceStatus
+from app.models.schema import Advance, Role, AdvanceStatus
+from app.services.auth_service import TokenClaims, resolve_role
+from app.services.employee_directory import employee_directory
 from datetime import datetime
 
 
@@ -28,7 +31,7 @@ def request_advance(
         BillAdvance object
     """
     # Verify employee exists
-    employee = session.query(Employee).filter(Employee.id == employee_id).first()
+    employee = employee_directory.get(session, employee_id)
     if not employee:
         raise ValueError("Employee not found")
     
@@ -46,7 +49,8 @@ def request_advance(
     
     session.add(advance)
     session.commit()
-    session.refresh(advance)
+    if session.expire_on_commit:
+        session.refresh(advance)
     
     return advance
 
@@ -56,7 +60,8 @@ def approve_advance(
     advance_id: int,
     admin_id: int,
     approved: bool,
-    notes: str = None
+    notes: str = None,
+    claims: Optional[TokenClaims] = None,
 ) -> Advance:
     """
     Admin can approve or deny an advance request
@@ -67,16 +72,17 @@ def approve_advance(
         admin_id: ID of admin approving/denying
         approved: True to approve, False to deny
         notes: Optional approval notes
+        claims: Verified token claims of the caller (skips the admin role lookup)
     
     Returns:
         Updated BillAdvance object
     """
     # Verify admin exists and has admin role
-    admin = session.query(Employee).filter(Employee.id == admin_id).first()
-    if not admin:
+    admin_role = resolve_role(session, admin_id, claims)
+    if admin_role is None:
         raise ValueError("Admin not found")
     
-    if admin.role != Role.ADMIN:
+    if admin_role != Role.ADMIN:
         raise PermissionError("Only admins can approve advances")
     
     # Get advance request
@@ -94,7 +100,8 @@ def approve_advance(
     advance.approval_notes = notes
     
     session.commit()
-    session.refresh(advance)
+    if session.expire_on_commit:
+        session.refresh(advance)
     
     return advance
 
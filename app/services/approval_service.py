@@ -0,0 +1,190 @@
+"""
+Batch decisions on advance and off-day requests.
+
+Each batch runs in one transaction:
+
+- the pending rows are locked with ``SELECT ... FOR UPDATE SKIP LOCKED`` (in id
+  order), so two admins deciding overlapping batches do not block each other;
+  a row held by the other transaction is reported as ``locked`` and can be
+  retried;
+- advance approvals are checked against net pay from the batched payroll
+  aggregates (:func:`get_payroll_breakdowns`, a fixed handful of queries), in
+  request order per employee (oldest first), each approval reducing what is
+  left for the next. The employees concerned are locked first
+  (:func:`lock_employees`, also taken by the single approval endpoint), so a
+  concurrent approval for the same employee waits for this one to commit and
+  then sees it, instead of both spending the same net pay;
+- off-day decisions refresh the attendance counters of the affected employees
+  with one off-day query;
+- status changes go through the ORM, so the usual change events fire, and are
+  committed once.
+
+Every requested id gets a result: ``approved``, ``denied``, ``auto_denied``
+(over remaining net pay), ``not_found``, ``already_decided`` or ``locked``.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any, NamedTuple, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.schema import Advance, AdvanceStatus, Employee, OffDay, OffDayStatus
+from app.services.payroll_service import get_payroll_breakdowns
+from app.utils.attendance import calculate_attendance_many
+
+
+class Decision(NamedTuple):
+    id: int
+    approved: bool
+    notes: Optional[str] = None
+
+
+def auto_reject_notes(amount: float, remaining: float, notes: Optional[str]) -> str:
+    """Approval notes for an approval refused because it exceeds remaining net pay."""
+    message = (
+        f" [AUTO-REJECTED: Advance KSH {amount:,.2f} exceeds remaining net pay "
+        f"KSH {remaining:,.2f}]"
+    )
+    return (notes + message) if notes else message.strip()
+
+
+def _result(record_id: int, outcome: str, status: Optional[str] = None, **extra) -> dict[str, Any]:
+    return {"id": record_id, "result": outcome, "status": status, **extra}
+
+
+def _unclaimed_results(db: Session, model, ids: set[int], pending) -> dict[int, dict[str, Any]]:
+    """Why requested ids were not locked: gone, already decided, or held elsewhere."""
+    if not ids:
+        return {}
+    statuses = dict(db.execute(select(model.id, model.status).where(model.id.in_(ids))).all())
+    results = {}
+    for record_id in ids:
+        status = statuses.get(record_id)
+        if status is None:
+            results[record_id] = _result(record_id, "not_found")
+        elif status == pending:
+            results[record_id] = _result(record_id, "locked", status.value)
+        else:
+            results[record_id] = _result(record_id, "already_decided", status.value)
+    return results
+
+
+def _lock_pending(db: Session, model, pending, ids: set[int]) -> list:
+    return (
+        db.query(model)
+        .filter(model.id.in_(ids), model.status == pending)
+        .order_by(model.id)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+
+def lock_employees(db: Session, employee_ids) -> None:
+    """
+    ``SELECT ... FOR UPDATE`` the employees' rows (in id order), serialising
+    advance approvals per employee until the transaction ends. Take it after
+    locking the advances and before reading remaining net pay.
+    """
+    if employee_ids:
+        db.execute(
+            select(Employee.id)
+            .where(Employee.id.in_(set(employee_ids)))
+            .order_by(Employee.id)
+            .with_for_update()
+        )
+
+
+def decide_advances(
+    db: Session,
+    decisions: Sequence[Decision],
+    as_of: Optional[date] = None,
+) -> list[dict[str, Any]]:
+    """
+    Approve or deny many advance requests in one transaction (committed here).
+
+    Returns:
+        One result per decision, in request order
+    """
+    as_of = as_of or date.today()
+    by_id = {d.id: d for d in decisions}
+    advances = _lock_pending(db, Advance, AdvanceStatus.PENDING, set(by_id))
+    results = _unclaimed_results(
+        db, Advance, set(by_id) - {a.id for a in advances}, AdvanceStatus.PENDING
+    )
+
+    approvals = [a for a in advances if by_id[a.id].approved]
+    lock_employees(db, {a.employee_id for a in approvals})
+    remaining = {
+        employee_id: breakdown["remaining_salary"]
+        for employee_id, breakdown in get_payroll_breakdowns(
+            db, as_of, {a.employee_id for a in approvals}
+        ).items()
+    }
+
+    now = datetime.utcnow()
+    for advance in sorted(advances, key=lambda a: (a.employee_id, a.created_at or now, a.id)):
+        decision = by_id[advance.id]
+        advance.approved_at = now
+        if not decision.approved:
+            advance.status = AdvanceStatus.DENIED
+            advance.approval_notes = decision.notes
+            results[advance.id] = _result(advance.id, "denied", AdvanceStatus.DENIED.value)
+            continue
+
+        left = remaining.get(advance.employee_id, 0.0)
+        amount = float(advance.amount_for_advance or 0)
+        if left <= 0 or amount > left:
+            advance.status = AdvanceStatus.DENIED
+            advance.approval_notes = auto_reject_notes(amount, left, decision.notes)
+            results[advance.id] = _result(
+                advance.id, "auto_denied", AdvanceStatus.DENIED.value, remaining_salary=left
+            )
+        else:
+            advance.status = AdvanceStatus.APPROVED
+            advance.approval_notes = decision.notes
+            remaining[advance.employee_id] = left - amount
+            results[advance.id] = _result(
+                advance.id, "approved", AdvanceStatus.APPROVED.value,
+                remaining_salary=left - amount,
+            )
+
+    db.commit()
+    return [results[d.id] for d in decisions]
+
+
+def decide_off_days(
+    db: Session,
+    decisions: Sequence[Decision],
+    reference_date: Optional[date] = None,
+) -> list[dict[str, Any]]:
+    """
+    Approve or deny many off-day requests in one transaction (committed here),
+    refreshing the attendance counters of the employees concerned.
+
+    Returns:
+        One result per decision, in request order
+    """
+    by_id = {d.id: d for d in decisions}
+    off_days = _lock_pending(db, OffDay, OffDayStatus.PENDING, set(by_id))
+    results = _unclaimed_results(
+        db, OffDay, set(by_id) - {o.id for o in off_days}, OffDayStatus.PENDING
+    )
+
+    for off in off_days:
+        approved = by_id[off.id].approved
+        off.status = OffDayStatus.APPROVED if approved else OffDayStatus.DENIED
+        results[off.id] = _result(off.id, "approved" if approved else "denied", off.status.value)
+
+    affected = {o.employee_id for o in off_days if o.status == OffDayStatus.APPROVED}
+    if affected:
+        db.flush()
+        employees = db.query(Employee).filter(Employee.id.in_(affected)).all()
+        attendance = calculate_attendance_many(db, employees, reference_date)
+        for employee in employees:
+            employee.days_worked_this_month = attendance[employee.id]["days_worked_this_month"]
+            employee.total_days_worked = attendance[employee.id]["total_days_worked"]
+
+    db.commit()
+    return [results[d.id] for d in decisions]
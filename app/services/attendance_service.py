@@ -116,7 +116,7 @@ def update_employee_attendance_for_date(
     employee.total_days_worked += 1
     
     # Update the updated_at timestamp
-    employee.updated_at = datetime.now()
+    employee.updated_at = datetime.utcnow()
     
     db.commit()
     db.refresh(employee)
@@ -184,7 +184,7 @@ def update_all_employees_attendance(
             stats['off_days'] += 1
             # Still update the timestamp to track that we processed today
             # (to prevent reprocessing if script runs multiple times)
-            employee.updated_at = datetime.now()
+            employee.updated_at = datetime.utcnow()
             db.commit()
             continue
         
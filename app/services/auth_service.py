@@ -1,52 +1,166 @@
 """
 Service for role-based permission checks
+Roles are resolved from the in-process employee directory (no query when warm),
+or straight from the claims of a signed session token when one is presented.
 """
 
-from app.models.schema import Employee, Role
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import jwt
+
+from app.config.config import (
+    ACCESS_TOKEN_TTL_MINUTES,
+    AUTH_REQUIRE_TOKEN,
+    JWT_ALGORITHM,
+    JWT_SECRET,
+)
+from app.models.schema import Role
+from app.services.employee_directory import employee_directory
 from sqlalchemy.orm import Session
 
 
-def check_permission(session: Session, employee_id: int, required_role: Role) -> bool:
+
+def _configured_signing_key(secret: str, require_token: bool) -> Optional[str]:
+    """
+    The shared signing key, or None when tokens are disabled.
+
+    A per-process random key would make tokens issued by one worker or
+    serverless instance fail on the next, so without JWT_SECRET no tokens are
+    issued at all (clients keep using the ids in the request body).
+
+    Raises:
+        RuntimeError: if tokens are required but no secret is configured
+    """
+    if secret:
+        return secret
+    if require_token:
+        raise RuntimeError("AUTH_REQUIRE_TOKEN is set but JWT_SECRET is not; set JWT_SECRET.")
+    print("Warning: JWT_SECRET is not set; session tokens are disabled.")
+    return None
+
+
+_signing_key = _configured_signing_key(JWT_SECRET, AUTH_REQUIRE_TOKEN)
+
+
+@dataclass(frozen=True)
+class TokenClaims:
+    """Identity carried by an access token. ``employee_id`` is None for the built-in admin."""
+    employee_id: Optional[int]
+    role: Role
+    expires_at: datetime
+
+    def is_employee(self, employee_id: int) -> bool:
+        return self.employee_id is not None and self.employee_id == employee_id
+
+
+def issue_access_token(
+    employee_id: Optional[int], role: Role
+) -> tuple[Optional[str], Optional[int]]:
+    """
+    Sign a short-lived token with ``employee_id`` and ``role`` claims.
+
+    Returns:
+        (token, expires_in_seconds), or (None, None) when JWT_SECRET is not set
+    """
+    if _signing_key is None:
+        return None, None
+    ttl = timedelta(minutes=ACCESS_TOKEN_TTL_MINUTES)
+    now = datetime.now(timezone.utc)
+    payload = {
+        "sub": "admin" if employee_id is None else str(employee_id),
+        "employee_id": employee_id,
+        "role": role.value,
+        "iat": now,
+        "exp": now + ttl,
+    }
+    token = jwt.encode(payload, _signing_key, algorithm=JWT_ALGORITHM)
+    return token, int(ttl.total_seconds())
+
+
+def decode_access_token(token: str) -> TokenClaims:
+    """
+    Verify signature and expiry; no database access.
+
+    Raises:
+        ValueError: if the token is invalid, expired or carries an unknown role
+    """
+    if _signing_key is None:
+        raise ValueError("Session tokens are not enabled on this server.")
+    try:
+        payload = jwt.decode(
+            token,
+            _signing_key,
+            algorithms=[JWT_ALGORITHM],
+            options={"require": ["exp", "role"]},
+        )
+        role = Role(payload["role"])
+    except jwt.ExpiredSignatureError as e:
+        raise ValueError("Session expired. Please sign in again.") from e
+    except (jwt.PyJWTError, ValueError, KeyError) as e:
+        raise ValueError("Invalid session token.") from e
+
+    employee_id = payload.get("employee_id")
+    return TokenClaims(
+        employee_id=int(employee_id) if employee_id is not None else None,
+        role=role,
+        expires_at=datetime.fromtimestamp(payload["exp"], tz=timezone.utc),
+    )
+
+
+def resolve_role(session: Session, employee_id: int, claims: Optional[TokenClaims]) -> Optional[Role]:
+    """Role from the token when it identifies this employee, else from the directory (None if unknown)."""
+    if claims is not None and claims.is_employee(employee_id):
+        return claims.role
+    employee = employee_directory.get(session, employee_id)
+    return employee.role if employee else None
+
+
+def check_permission(
+    session: Session,
+    employee_id: int,
+    required_role: Role,
+    claims: Optional[TokenClaims] = None,
+) -> bool:
     """
     Check if employee has required role
-    
+
     Args:
         session: Database session
         employee_id: ID of employee
         required_role: Required role
-    
+        claims: Verified token claims; used instead of a lookup when they identify the employee
+
     Returns:
         True if employee has required role
     """
-    employee = session.query(Employee).filter(Employee.id == employee_id).first()
-    if not employee:
-        return False
-    
-    return employee.role == required_role
+    return resolve_role(session, employee_id, claims) == required_role
 
 
-def can_request_advance(session: Session, employee_id: int) -> bool:
+def can_request_advance(
+    session: Session, employee_id: int, claims: Optional[TokenClaims] = None
+) -> bool:
     """Check if employee can request advances (staff and managers)"""
-    employee = session.query(Employee).filter(Employee.id == employee_id).first()
-    if not employee:
-        return False
-    return employee.role in [Role.STAFF, Role.MANAGER]
+    return resolve_role(session, employee_id, claims) in [Role.STAFF, Role.MANAGER]
 
 
-def can_add_bills(session: Session, employee_id: int) -> bool:
+def can_add_bills(
+    session: Session, employee_id: int, claims: Optional[TokenClaims] = None
+) -> bool:
     """Check if employee can add bills (managers and admins)"""
-    employee = session.query(Employee).filter(Employee.id == employee_id).first()
-    if not employee:
-        return False
-    return employee.role in [Role.MANAGER, Role.ADMIN]
+    return resolve_role(session, employee_id, claims) in [Role.MANAGER, Role.ADMIN]
 
 
-def can_approve_advances(session: Session, employee_id: int) -> bool:
+def can_approve_advances(
+    session: Session, employee_id: int, claims: Optional[TokenClaims] = None
+) -> bool:
     """Check if employee can approve advances (admin only)"""
-    return check_permission(session, employee_id, Role.ADMIN)
+    return check_permission(session, employee_id, Role.ADMIN, claims)
 
 
-def can_view_all(session: Session, employee_id: int) -> bool:
+def can_view_all(
+    session: Session, employee_id: int, claims: Optional[TokenClaims] = None
+) -> bool:
     """Check if employee can view all records (admin only)"""
-    return check_permission(session, employee_id, Role.ADMIN)
-
+    return check_permission(session, employee_id, Role.ADMIN, claims)
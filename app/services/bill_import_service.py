@@ -0,0 +1,268 @@
+"""
+Bulk bill import (CSV or a JSON array), for month-end sheets that would
+otherwise be entered one ``POST /api/bills`` at a time.
+
+An import is all-or-nothing:
+
+- every row is parsed and checked first (amount, date, recorder and billed
+  employee roles, with the same rules as :func:`bill_service.add_bill`),
+  against one bulk lookup in the employee directory; any invalid row rejects
+  the whole import with a per-row error list;
+- valid rows are inserted with one batched ``INSERT ... RETURNING`` (sent as
+  multi-row statements, several hundred rows each), and ``bill.created`` events are queued for them
+  as for single bills;
+- negative-balance warnings for every employee billed come from one batched
+  payroll pass after the commit.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import math
+from datetime import date, datetime
+from typing import Any, Iterable, NamedTuple, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.schema import Bill, Role
+from app.services.auth_service import TokenClaims
+from app.services.employee_directory import employee_directory
+from app.services.event_hub import make_event, queue_events
+from app.services.payroll_service import get_payroll_breakdowns
+
+BILL_IMPORT_MAX_ROWS = 5000
+IMPORT_COLUMNS = ("employee_id", "amount", "date", "reason", "manager_id")
+_REQUIRED_COLUMNS = ("employee_id", "amount")
+
+
+class BillImportError(ValueError):
+    """The import was rejected; ``errors`` lists ``{"row", "error"}`` per problem."""
+
+    def __init__(self, errors: list[dict[str, Any]]):
+        self.errors = errors
+        super().__init__(f"{len(errors)} invalid row(s); nothing was imported.")
+
+
+class _ParsedBill(NamedTuple):
+    row: int
+    employee_id: int
+    amount: float
+    date: datetime
+    reason: Optional[str]
+    recorded_by_id: Optional[int]
+
+
+def parse_bill_csv(text: str) -> list[dict[str, Any]]:
+    """
+    Rows of a CSV with a header line (``employee_id,amount`` required;
+    ``date``, ``reason`` and ``manager_id`` optional).
+
+    Raises:
+        ValueError: if a required column is missing
+    """
+    reader = csv.DictReader(io.StringIO(text))
+    header = [h.strip().lower() for h in reader.fieldnames or ()]
+    missing = [c for c in _REQUIRED_COLUMNS if c not in header]
+    if missing:
+        raise ValueError(f"CSV is missing column(s): {', '.join(missing)}.")
+    reader.fieldnames = header
+    return [
+        {k: (v.strip() or None) if isinstance(v, str) else v for k, v in row.items() if k}
+        for row in reader
+    ]
+
+
+def parse_bill_json(raw: bytes | str) -> list[dict[str, Any]]:
+    """
+    Rows of a JSON array of bill objects (same keys as the CSV columns).
+
+    Raises:
+        ValueError: if the body is not a JSON array of objects
+    """
+    try:
+        rows = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {e.msg}.") from e
+    if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+        raise ValueError("Expected a JSON array of bill objects.")
+    return rows
+
+
+def _parse_date(value: Any) -> datetime:
+    if value in (None, ""):
+        return datetime.utcnow()
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    text = str(value).strip()
+    try:
+        if "T" in text or " " in text:
+            return datetime.fromisoformat(text)
+        return datetime.combine(date.fromisoformat(text), datetime.min.time())
+    except ValueError:
+        raise ValueError(f"Invalid date {text!r} (expected YYYY-MM-DD).")
+
+
+def _parse_int(value: Any, name: str) -> Optional[int]:
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer.")
+
+
+def _parse_row(n: int, raw: dict[str, Any], default_recorder: Optional[int]) -> _ParsedBill:
+    employee_id = _parse_int(raw.get("employee_id"), "employee_id")
+    if employee_id is None:
+        raise ValueError("employee_id is required.")
+    try:
+        amount = float(raw.get("amount"))
+    except (TypeError, ValueError):
+        raise ValueError("amount must be a number.")
+    if not math.isfinite(amount):
+        raise ValueError("amount must be a finite number.")
+    if not amount > 0:
+        raise ValueError("amount must be greater than 0.")
+    recorder = _parse_int(raw.get("manager_id"), "manager_id")
+    reason = raw.get("reason")
+    return _ParsedBill(
+        n,
+        employee_id,
+        amount,
+        _parse_date(raw.get("date")),
+        str(reason) if reason not in (None, "") else None,
+        recorder if recorder is not None else default_recorder,
+    )
+
+
+def _check_roles(session: Session, bills: list[_ParsedBill], claims: Optional[TokenClaims]) -> list[dict]:
+    directory = employee_directory.get_many(
+        session, {b.employee_id for b in bills} | {b.recorded_by_id for b in bills}
+    )
+    errors = []
+    for bill in bills:
+        if bill.recorded_by_id is None:
+            error = "manager_id is required (per row or for the whole import)."
+        elif claims is not None and claims.employee_id is not None and claims.employee_id != bill.recorded_by_id:
+            error = "You can only record bills as yourself."
+        else:
+            error = _role_error(bill, directory, claims)
+        if error:
+            errors.append({"row": bill.row, "error": error})
+    return errors
+
+
+def _role_error(bill: _ParsedBill, directory: dict, claims: Optional[TokenClaims]) -> Optional[str]:
+    recorder = directory.get(bill.recorded_by_id)
+    if claims is not None and claims.is_employee(bill.recorded_by_id):
+        recorder_role = claims.role
+    else:
+        recorder_role = recorder.role if recorder else None
+    if recorder_role is None:
+        return f"Recorder {bill.recorded_by_id} not found."
+    if recorder_role not in (Role.MANAGER, Role.ADMIN):
+        return "Only managers and admins can add bills."
+    employee = directory.get(bill.employee_id)
+    if employee is None:
+        return f"Employee {bill.employee_id} not found."
+    if employee.role not in (Role.STAFF, Role.MANAGER):
+        return "Bills can only be added for staff and managers."
+    if recorder_role == Role.MANAGER and bill.recorded_by_id == bill.employee_id:
+        return "Managers cannot add bills for themselves."
+    return None
+
+
+def negative_balance_warnings(
+    session: Session, employee_ids: Iterable[int], as_of: Optional[date] = None
+) -> list[dict[str, Any]]:
+    """Employees whose net pay is below zero, from one batched payroll pass."""
+    breakdowns = get_payroll_breakdowns(session, as_of or date.today(), employee_ids)
+    warnings = []
+    for employee_id, breakdown in sorted(breakdowns.items()):
+        remaining = breakdown["remaining_salary"]
+        if remaining >= 0:
+            continue
+        employee = employee_directory.get(session, employee_id)
+        name = employee.full_name if employee else f"ID {employee_id}"
+        warnings.append({
+            "employee_id": employee_id,
+            "remaining_salary": remaining,
+            "message": (
+                f"⚠️ WARNING: {name} net pay is negative after this import. "
+                f"Remaining: KSH {remaining:,.2f}."
+            ),
+        })
+    return warnings
+
+
+def import_bills(
+    session: Session,
+    rows: list[dict[str, Any]],
+    recorded_by_id: Optional[int] = None,
+    claims: Optional[TokenClaims] = None,
+    as_of: Optional[date] = None,
+) -> dict[str, Any]:
+    """
+    Validate and insert bills in one transaction (committed here).
+
+    Args:
+        rows: Parsed rows (see :func:`parse_bill_csv` / :func:`parse_bill_json`)
+        recorded_by_id: Recorder for rows without a ``manager_id``
+        claims: Verified token claims of the caller; a caller identified by
+            them may only record as themselves
+
+    Returns:
+        ``imported`` count, new bill ``ids`` (ascending) and ``warnings``
+
+    Raises:
+        BillImportError: if any row is invalid (nothing is inserted)
+    """
+    if not rows:
+        raise BillImportError([{"row": None, "error": "No bills to import."}])
+    if len(rows) > BILL_IMPORT_MAX_ROWS:
+        raise BillImportError([{
+            "row": None,
+            "error": f"At most {BILL_IMPORT_MAX_ROWS} bills per import (got {len(rows)}).",
+        }])
+
+    bills, errors = [], []
+    for n, raw in enumerate(rows, start=1):
+        try:
+            bills.append(_parse_row(n, raw, recorded_by_id))
+        except ValueError as e:
+            errors.append({"row": n, "error": str(e)})
+    errors += _check_roles(session, bills, claims)
+    if errors:
+        raise BillImportError(sorted(errors, key=lambda e: e["row"]))
+
+    # No sort_by_parameter_order: it makes SQLite insert row by row. Each
+    # returned row carries what its event needs instead.
+    inserted = sorted(session.execute(
+        insert(Bill).returning(Bill.id, Bill.billed_employee_id, Bill.amount_billed),
+        [
+            {
+                "employee_id": b.employee_id,
+                "billed_employee_id": b.employee_id,
+                "amount_billed": b.amount,
+                "date": b.date,
+                "reason": b.reason,
+                "recorded_by_id": b.recorded_by_id,
+            }
+            for b in bills
+        ],
+    ).all())
+    queue_events(session, [
+        make_event("bill", "created", r.id, r.billed_employee_id, amount=float(r.amount_billed))
+        for r in inserted
+    ])
+    session.commit()
+
+    return {
+        "imported": len(inserted),
+        "ids": [r.id for r in inserted],
+        "warnings": negative_balance_warnings(session, {b.employee_id for b in bills}, as_of),
+    }
@@ -3,8 +3,11 @@ Service for handling bills
 Managers and Admins can add/update bills for staff and managers
 """
 
+from typing import Optional
 from sqlalchemy.orm import Session
-from app.models.schema import Employee, Bill, Role
+from app.models.schema import Bill, Role
+from app.services.auth_service import TokenClaims, resolve_role
+from app.services.employee_directory import employee_directory
 from datetime import datetime
 
 
@@ -15,6 +18,7 @@ def add_bill(
     amount: float,
     date: datetime = None,
     reason: str = None,
+    claims: Optional[TokenClaims] = None,
 ) -> Bill:
     """
     Manager or Admin can add a bill for a staff member or manager
@@ -26,21 +30,22 @@ def add_bill(
         amount: Bill amount
         date: Date of bill (defaults to now)
         reason: Optional reason for bill
-        pin: Optional unique pin, if not provided will be auto-generated
+        claims: Verified token claims of the caller; the recorder's role is taken
+            from them (no lookup) when they identify ``recorded_by_id``
     
     Returns:
         BillAdvance object
     """
     # Verify person recording exists and has appropriate role
-    recorder = session.query(Employee).filter(Employee.id == recorded_by_id).first()
-    if not recorder:
+    recorder_role = resolve_role(session, recorded_by_id, claims)
+    if recorder_role is None:
         raise ValueError("Person recording bill not found")
     
-    if recorder.role not in [Role.MANAGER, Role.ADMIN]:
+    if recorder_role not in [Role.MANAGER, Role.ADMIN]:
         raise PermissionError("Only managers and admins can add bills")
     
     # Verify employee exists and is staff or manager (not admin)
-    employee = session.query(Employee).filter(Employee.id == employee_id).first()
+    employee = employee_directory.get(session, employee_id)
     if not employee:
         raise ValueError("Employee not found")
     
@@ -48,7 +53,7 @@ def add_bill(
         raise PermissionError("Bills can only be added for staff and managers")
     
     # Managers cannot add bills for themselves
-    if recorder.role == Role.MANAGER and recorded_by_id == employee_id:
+    if recorder_role == Role.MANAGER and recorded_by_id == employee_id:
         raise PermissionError("Managers cannot add bills for themselves")
     
     # Use current date if not provided
@@ -67,7 +72,8 @@ def add_bill(
     
     session.add(bill)
     session.commit()
-    session.refresh(bill)
+    if session.expire_on_commit:
+        session.refresh(bill)
     
     return bill
 
@@ -95,7 +101,7 @@ def update_bill(
         Updated BillAdvance object
     """
     # Verify employee exists and has appropriate role
-    employee = session.query(Employee).filter(Employee.id == employee_id).first()
+    employee = employee_directory.get(session, employee_id)
     if not employee:
         raise ValueError("Employee not found")
     
@@ -121,7 +127,8 @@ def update_bill(
         bill.reason = reason
     
     session.commit()
-    session.refresh(bill)
+    if session.expire_on_commit:
+        session.refresh(bill)
     
     return bill
 
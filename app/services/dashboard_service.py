@@ -0,0 +1,151 @@
+"""
+Admin dashboard read model: pending queues, month totals, top balances and
+the latest items of each kind, in one response.
+
+Computed with a fixed handful of queries regardless of head count: one
+``UNION ALL`` of grouped aggregates, the batched payroll breakdown (four
+queries) and one ``LIMIT`` query per latest-items list. ``main`` serves the
+result from a short TTL cache.
+"""
+from __future__ import annotations
+
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Float, Integer, String, case, cast, extract, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.schema import (
+    Advance,
+    AdvanceStatus,
+    Bill,
+    OffDay,
+    OffDayStatus,
+    SalaryPayment,
+)
+from app.services import listing_service
+from app.services.employee_directory import employee_directory
+from app.services.payroll_service import get_payroll_breakdowns
+from app.utils.name_map import EmployeeNameMap
+
+
+def _aggregate(name: str, count, total, stmt_from, *where):
+    return (
+        select(
+            literal(name, String).label("name"),
+            cast(count, Integer).label("count"),
+            cast(func.coalesce(total, 0.0), Float).label("total"),
+        )
+        .select_from(stmt_from)
+        .where(*where)
+    )
+
+
+def _totals(db: Session, as_of: date) -> dict[str, tuple[int, float]]:
+    """``name -> (count, total)`` for every dashboard figure, in one round trip."""
+    y, m = as_of.year, as_of.month
+    month_start = datetime(y, m, 1)
+    next_month_start = month_start + timedelta(days=monthrange(y, m)[1])
+    advance_at = func.coalesce(Advance.approved_at, Advance.created_at)
+    off_days = OffDay.day_count * case((OffDay.off_type == "half", 0.5), else_=1.0)
+    stmt = union_all(
+        _aggregate(
+            "pending_advances", func.count(), func.sum(Advance.amount_for_advance),
+            Advance, Advance.status == AdvanceStatus.PENDING,
+        ),
+        _aggregate(
+            "pending_off_days", func.count(), func.sum(off_days),
+            OffDay, OffDay.status == OffDayStatus.PENDING,
+        ),
+        _aggregate(
+            "month_bills", func.count(), func.sum(Bill.amount_billed),
+            Bill, extract("year", Bill.date) == y, extract("month", Bill.date) == m,
+        ),
+        _aggregate(
+            "month_advances", func.count(), func.sum(Advance.amount_for_advance),
+            Advance,
+            Advance.status == AdvanceStatus.APPROVED,
+            advance_at >= month_start,
+            advance_at < next_month_start,
+        ),
+        _aggregate(
+            "month_salary_payments", func.count(), func.sum(SalaryPayment.amount_paid),
+            SalaryPayment,
+            extract("year", SalaryPayment.payment_date) == y,
+            extract("month", SalaryPayment.payment_date) == m,
+        ),
+        _aggregate(
+            "month_off_days", func.count(), func.sum(off_days),
+            OffDay,
+            OffDay.status == OffDayStatus.APPROVED,
+            extract("year", OffDay.date) == y,
+            extract("month", OffDay.date) == m,
+        ),
+    )
+    return {r.name: (int(r.count or 0), float(r.total or 0)) for r in db.execute(stmt)}
+
+
+def _count_amount(totals, name: str) -> dict[str, Any]:
+    count, total = totals.get(name, (0, 0.0))
+    return {"count": count, "amount": round(total, 2)}
+
+
+def _count_days(totals, name: str) -> dict[str, Any]:
+    count, total = totals.get(name, (0, 0.0))
+    return {"count": count, "days": total}
+
+
+def build_admin_dashboard(
+    db: Session, as_of: date | None = None, latest: int = 5, top: int = 5
+) -> dict[str, Any]:
+    if as_of is None:
+        as_of = date.today()
+    totals = _totals(db, as_of)
+
+    breakdowns = get_payroll_breakdowns(db, as_of)
+    ranked = sorted(
+        breakdowns.items(), key=lambda kv: kv[1]["remaining_salary"], reverse=True
+    )[:top]
+    records = employee_directory.get_many(db, [emp_id for emp_id, _ in ranked])
+    top_balances = []
+    for emp_id, pb in ranked:
+        rec = records.get(emp_id)
+        top_balances.append(
+            {
+                "employee_id": emp_id,
+                "employee_name": rec.full_name if rec else "Unknown",
+                "role": rec.role_value if rec else None,
+                "remaining_salary": round(pb["remaining_salary"], 2),
+                "salary_arrears": round(pb["salary_arrears"], 2),
+            }
+        )
+
+    names = EmployeeNameMap(db)
+    return {
+        "generated_at": datetime.utcnow(),
+        "as_of": as_of,
+        "pending": {
+            "advances": _count_amount(totals, "pending_advances"),
+            "off_days": _count_days(totals, "pending_off_days"),
+        },
+        "month": {
+            "year": as_of.year,
+            "month": as_of.month,
+            "bills": _count_amount(totals, "month_bills"),
+            "advances": _count_amount(totals, "month_advances"),
+            "salary_payments": _count_amount(totals, "month_salary_payments"),
+            "off_days": _count_days(totals, "month_off_days"),
+        },
+        "employee_count": len(breakdowns),
+        "total_remaining_salary": round(
+            sum(pb["remaining_salary"] for pb in breakdowns.values()), 2
+        ),
+        "top_balances": top_balances,
+        "latest": {
+            "advances": listing_service.advance_rows(db, names, limit=latest),
+            "bills": listing_service.bill_rows(db, names, limit=latest),
+            "off_days": listing_service.off_day_rows(db, limit=latest),
+            "salary_payments": listing_service.salary_payment_rows(db, names, limit=latest),
+        },
+    }
@@ -0,0 +1,174 @@
+"""
+Process-wide employee directory: id → name, role, salary and start date.
+
+Most endpoints only need an employee's name or role (permission checks,
+response labels, admin alerts). The directory keeps those fields in compact
+``__slots__`` records so they can be resolved without a query:
+
+- ``warm`` bulk-loads every employee in one query (called on startup);
+- the whole directory is reloaded once it is older than the TTL, so changes
+  made by other workers / instances show up within ``ttl_seconds``;
+- inserts, updates and deletes of ``Employee`` rows through the ORM drop the
+  affected ids immediately (and again after commit), so this process never
+  serves its own stale writes.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from datetime import date
+from typing import Iterable, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+
+from app.config.config import EMPLOYEE_DIRECTORY_TTL_SECONDS
+from app.models.schema import Employee, Role
+
+
+class EmployeeRecord:
+    """Read-only snapshot of the Employee columns most code paths need."""
+
+    __slots__ = (
+        "id",
+        "first_name",
+        "last_name",
+        "role",
+        "salary",
+        "employment_start_date",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        first_name: str,
+        last_name: str,
+        role: Role,
+        salary: float,
+        employment_start_date: date,
+    ):
+        self.id = id
+        self.first_name = first_name
+        self.last_name = last_name
+        self.role = role
+        self.salary = float(salary or 0)
+        self.employment_start_date = employment_start_date
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}"
+
+    @property
+    def role_value(self) -> str:
+        return self.role.value if hasattr(self.role, "value") else str(self.role)
+
+    def __repr__(self):
+        return f"<EmployeeRecord(id={self.id}, name={self.full_name}, role={self.role_value})>"
+
+
+_COLUMNS = (
+    Employee.id,
+    Employee.first_name,
+    Employee.last_name,
+    Employee.role,
+    Employee.salary,
+    Employee.employment_start_date,
+)
+
+
+class EmployeeDirectory:
+    def __init__(self, ttl_seconds: float = EMPLOYEE_DIRECTORY_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._records: dict[int, EmployeeRecord] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _is_stale(self) -> bool:
+        return self._loaded_at is None or (
+            time.monotonic() - self._loaded_at > self.ttl_seconds
+        )
+
+    def warm(self, db: Session) -> int:
+        """Replace the directory with every employee (one query). Returns the count."""
+        records = {
+            row[0]: EmployeeRecord(*row) for row in db.execute(select(*_COLUMNS))
+        }
+        with self._lock:
+            self._records = records
+            self._loaded_at = time.monotonic()
+        return len(records)
+
+    def _load_missing(self, db: Session, employee_ids: set[int]) -> None:
+        rows = db.execute(select(*_COLUMNS).where(Employee.id.in_(employee_ids)))
+        with self._lock:
+            for row in rows:
+                self._records[row[0]] = EmployeeRecord(*row)
+
+    def get_many(
+        self, db: Session, employee_ids: Iterable[int | None]
+    ) -> dict[int, EmployeeRecord]:
+        """Records for the given ids (unknown ids are omitted); at most one query."""
+        wanted = {i for i in employee_ids if i is not None}
+        if self._is_stale():
+            self.warm(db)
+        missing = wanted.difference(self._records)
+        if missing:
+            self._load_missing(db, missing)
+        records = self._records
+        return {i: records[i] for i in wanted if i in records}
+
+    def get(self, db: Session, employee_id: int | None) -> Optional[EmployeeRecord]:
+        if employee_id is None:
+            return None
+        return self.get_many(db, (employee_id,)).get(employee_id)
+
+    def all(self, db: Session) -> list[EmployeeRecord]:
+        if self._is_stale():
+            self.warm(db)
+        return list(self._records.values())
+
+    def invalidate(self, employee_id: int | None = None) -> None:
+        """Drop one employee, or everything when ``employee_id`` is None."""
+        with self._lock:
+            if employee_id is None:
+                self._records = {}
+                self._loaded_at = None
+            else:
+                self._records.pop(employee_id, None)
+
+    def clear(self) -> None:
+        self.invalidate()
+
+
+employee_directory = EmployeeDirectory()
+
+
+# ---------------------------------------------------------------------------
+# Write-event invalidation
+# ---------------------------------------------------------------------------
+
+_DIRTY_KEY = "employee_directory_dirty"
+
+
+def _on_employee_write(mapper, connection, target: Employee) -> None:
+    employee_directory.invalidate(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_DIRTY_KEY, set()).add(target.id)
+
+
+for _evt in ("after_insert", "after_update", "after_delete"):
+    event.listen(Employee, _evt, _on_employee_write)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    # A concurrent request may have re-read the old row between our flush and
+    # commit; drop the ids again now that the new values are visible.
+    for employee_id in session.info.pop(_DIRTY_KEY, ()):
+        employee_directory.invalidate(employee_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
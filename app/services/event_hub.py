@@ -0,0 +1,245 @@
+"""
+Live change events for admin dashboards (served as server-sent events).
+
+Writes to advances, off days, bills and salary payments are turned into small
+events by ORM mapper hooks, so every code path that commits one (endpoints,
+services, jobs) is covered without touching it:
+
+- ``advance.created`` / ``off_day.created`` / ``bill.created`` /
+  ``salary_payment.created`` on insert;
+- ``advance.approved`` / ``advance.denied`` (and the ``off_day.*`` pair) when
+  a status changes.
+
+Events are queued on the session and published to the in-process
+:data:`event_hub` after the transaction commits (dropped on rollback). When
+the Postgres bridge is active (``EVENTS_PG_NOTIFY``), they are sent with
+``pg_notify`` inside the writing transaction instead; Postgres delivers them
+on commit to the LISTEN thread of every instance, which publishes locally.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import threading
+from datetime import date, datetime
+from typing import Any, Optional
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session, object_session
+
+from app.models.schema import Advance, Bill, OffDay, SalaryPayment
+
+PG_CHANNEL = "payroll_events"
+
+# Events buffered per subscriber before it is considered too slow and dropped
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Seconds between keep-alive comments on an idle stream (proxies drop silent ones)
+SSE_HEARTBEAT_SECONDS = 15.0
+
+Event = dict[str, Any]
+
+
+class EventHub:
+    """Fan-out of events to asyncio subscribers; ``publish`` is safe from any thread."""
+
+    def __init__(self):
+        self._subscribers: set["Subscription"] = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def publish(self, evt: Event) -> None:
+        evt = dict(evt, seq=next(self._ids))
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            sub.offer(evt)
+
+    def subscribe(self, types: Optional[set[str]] = None) -> "Subscription":
+        """Register a subscriber on the running event loop (use as a context manager)."""
+        sub = Subscription(self, asyncio.get_running_loop(), types)
+        with self._lock:
+            self._subscribers.add(sub)
+        return sub
+
+    def _remove(self, sub: "Subscription") -> None:
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+class Subscription:
+    def __init__(self, hub: EventHub, loop: asyncio.AbstractEventLoop, types: Optional[set[str]]):
+        self.hub = hub
+        self.loop = loop
+        self.types = types
+        self.queue: asyncio.Queue[Event] = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+
+    def offer(self, evt: Event) -> None:
+        if self.types and evt.get("type") not in self.types:
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._put, evt)
+        except RuntimeError:  # loop closed: the client is gone
+            self.hub._remove(self)
+
+    def _put(self, evt: Event) -> None:
+        try:
+            self.queue.put_nowait(evt)
+        except asyncio.QueueFull:
+            # The client should reload instead of trusting a gapped stream
+            self.overflowed = True
+
+    async def get(self, timeout: float) -> Optional[Event]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.hub._remove(self)
+
+
+event_hub = EventHub()
+
+
+def format_sse(evt: Event) -> str:
+    """One ``text/event-stream`` frame."""
+    data = json.dumps(evt, default=_json_default, separators=(",", ":"))
+    return f"id: {evt.get('seq', '')}\nevent: {evt['type']}\ndata: {data}\n\n"
+
+
+async def sse_stream(request, types: Optional[set[str]] = None, heartbeat: float = SSE_HEARTBEAT_SECONDS):
+    """
+    Body of an SSE response: events from :data:`event_hub` until the client
+    disconnects. A subscriber that falls too far behind gets a ``resync``
+    event and the stream ends, so the dashboard reloads instead of missing data.
+    """
+    with event_hub.subscribe(types) as sub:
+        yield "retry: 5000\n\n"
+        while not await request.is_disconnected():
+            evt = await sub.get(heartbeat)
+            if sub.overflowed:
+                yield "event: resync\ndata: {}\n\n"
+                return
+            yield format_sse(evt) if evt is not None else ": keep-alive\n\n"
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if hasattr(obj, "value"):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# ---------------------------------------------------------------------------
+# ORM hooks: write -> event
+# ---------------------------------------------------------------------------
+
+_PENDING_KEY = "event_hub_pending"
+
+_pg_notify = False
+
+
+def use_pg_notify(enabled: bool) -> None:
+    """Route events through Postgres NOTIFY (set while a PgEventBridge is listening)."""
+    global _pg_notify
+    _pg_notify = enabled
+
+
+def make_event(kind: str, action: str, record_id: int, employee_id: Optional[int], **extra) -> Event:
+    return {
+        "type": f"{kind}.{action}",
+        "id": record_id,
+        "employee_id": employee_id,
+        "at": datetime.utcnow().isoformat(),
+        **extra,
+    }
+
+
+def _event(kind: str, action: str, target, **extra) -> Event:
+    employee_id = getattr(target, "billed_employee_id", None) or getattr(target, "employee_id", None)
+    return make_event(kind, action, target.id, employee_id, **extra)
+
+
+def _queue(session: Optional[Session], connection, evt: Event) -> None:
+    if _pg_notify and connection.dialect.name == "postgresql":
+        # Delivered by Postgres on commit (and never if the transaction rolls back)
+        connection.execute(
+            select(func.pg_notify(PG_CHANNEL, json.dumps(evt, default=_json_default)))
+        )
+        return
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, []).append(evt)
+
+
+def _emit(connection, target, evt: Event) -> None:
+    _queue(object_session(target), connection, evt)
+
+
+def queue_events(session: Session, events: list[Event]) -> None:
+    """
+    Publish events for writes made outside the ORM unit of work (bulk Core
+    inserts), on the same terms as the mapper hooks: after commit, or via
+    ``pg_notify`` in the transaction when the Postgres bridge is active.
+    """
+    connection = session.connection()
+    for evt in events:
+        _queue(session, connection, evt)
+
+
+def _status_value(target) -> Optional[str]:
+    status = getattr(target, "status", None)
+    return status.value if hasattr(status, "value") else status
+
+
+_EVENT_SOURCES = {
+    Advance: ("advance", "amount_for_advance"),
+    OffDay: ("off_day", None),
+    Bill: ("bill", "amount_billed"),
+    SalaryPayment: ("salary_payment", "amount_paid"),
+}
+
+
+def _listen(model, kind: str, amount_attr: Optional[str]) -> None:
+    def after_insert(mapper, connection, target) -> None:
+        extra = {"status": _status_value(target)} if hasattr(target, "status") else {}
+        if amount_attr:
+            extra["amount"] = float(getattr(target, amount_attr) or 0)
+        _emit(connection, target, _event(kind, "created", target, **extra))
+
+    def after_update(mapper, connection, target) -> None:
+        if not hasattr(target, "status"):
+            return
+        history = inspect(target).attrs.status.history
+        if not history.has_changes():
+            return
+        status = _status_value(target)
+        _emit(connection, target, _event(kind, status, target, status=status))
+
+    event.listen(model, "after_insert", after_insert)
+    event.listen(model, "after_update", after_update)
+
+
+for _model, (_kind, _amount_attr) in _EVENT_SOURCES.items():
+    _listen(_model, _kind, _amount_attr)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session) -> None:
+    for evt in session.info.pop(_PENDING_KEY, ()):
+        event_hub.publish(evt)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,227 @@
+"""
+Streaming exports for accountants: full-history bills, advances, off days and
+salary payments as CSV or NDJSON.
+
+Rows come from a server-side cursor (``yield_per`` implies ``stream_results``)
+and are encoded one partition at a time, so memory stays flat regardless of
+table size. No ORM objects or Pydantic models are built on this path.
+
+:func:`encode_table` writes tables computed in Python (payroll previews and
+registers) in the same two formats, one chunk per batch of rows.
+"""
+from __future__ import annotations
+
+import csv
+import enum
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Iterable, Iterator
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session, aliased
+
+from app.models.schema import Advance, Bill, Employee, OffDay, SalaryPayment
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _full_name(emp) -> Any:
+    return emp.first_name + " " + emp.last_name
+
+
+def _bills_query() -> Select:
+    billed = aliased(Employee)
+    recorder = aliased(Employee)
+    return (
+        select(
+            Bill.id,
+            Bill.date,
+            Bill.billed_employee_id.label("employee_id"),
+            _full_name(billed).label("employee_name"),
+            Bill.amount_billed.label("amount"),
+            Bill.reason,
+            Bill.recorded_by_id,
+            _full_name(recorder).label("recorded_by_name"),
+            Bill.created_at,
+        )
+        .join(billed, Bill.billed_employee_id == billed.id)
+        .join(recorder, Bill.recorded_by_id == recorder.id)
+        .order_by(Bill.id)
+    )
+
+
+def _advances_query() -> Select:
+    return (
+        select(
+            Advance.id,
+            Advance.employee_id,
+            _full_name(Employee).label("employee_name"),
+            Advance.amount_for_advance,
+            Advance.reason,
+            Advance.status,
+            Advance.created_at,
+            Advance.approved_at,
+            Advance.approval_notes,
+        )
+        .join(Employee, Advance.employee_id == Employee.id)
+        .order_by(Advance.id)
+    )
+
+
+def _off_days_query() -> Select:
+    return (
+        select(
+            OffDay.id,
+            OffDay.employee_id,
+            _full_name(Employee).label("employee_name"),
+            OffDay.date,
+            OffDay.day_count,
+            OffDay.off_type,
+            OffDay.reason,
+            OffDay.status,
+            OffDay.created_at,
+        )
+        .join(Employee, OffDay.employee_id == Employee.id)
+        .order_by(OffDay.id)
+    )
+
+
+def _salary_payments_query() -> Select:
+    employee = aliased(Employee)
+    admin = aliased(Employee)
+    return (
+        select(
+            SalaryPayment.id,
+            SalaryPayment.employee_id,
+            _full_name(employee).label("employee_name"),
+            SalaryPayment.amount_paid,
+            SalaryPayment.payment_date,
+            SalaryPayment.notes,
+            SalaryPayment.paid_by_id,
+            _full_name(admin).label("paid_by_name"),
+            SalaryPayment.payroll_year,
+            SalaryPayment.payroll_month,
+            SalaryPayment.created_at,
+        )
+        .join(employee, SalaryPayment.employee_id == employee.id)
+        .join(admin, SalaryPayment.paid_by_id == admin.id)
+        .order_by(SalaryPayment.id)
+    )
+
+
+EXPORT_QUERIES: dict[str, Callable[[], Select]] = {
+    "bills": _bills_query,
+    "advances": _advances_query,
+    "off-days": _off_days_query,
+    "salary-payments": _salary_payments_query,
+}
+
+
+def _plain(value: Any) -> Any:
+    """Enums → their value, dates → ISO strings; everything else unchanged."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def iter_export_partitions(
+    db: Session, entity: str, batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[tuple[list[str], list[tuple]]]:
+    """
+    Yield ``(columns, rows)`` partitions of at most ``batch_size`` rows each,
+    read through a server-side cursor.
+    """
+    if entity not in EXPORT_QUERIES:
+        raise ValueError(f"Unknown export entity: {entity}")
+    stmt = EXPORT_QUERIES[entity]().execution_options(yield_per=batch_size)
+    result = db.execute(stmt)
+    columns = list(result.keys())
+    try:
+        for partition in result.partitions():
+            yield columns, partition
+    finally:
+        result.close()
+
+
+def csv_chunks(columns: list[str], partitions: Iterable[Iterable[tuple]]) -> Iterator[bytes]:
+    """CSV with a header row (even when there are no rows); one chunk per partition."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    for rows in partitions:
+        for row in rows:
+            writer.writerow(["" if v is None else _plain(v) for v in row])
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def ndjson_chunks(columns: list[str], partitions: Iterable[Iterable[tuple]]) -> Iterator[bytes]:
+    """One JSON object per line; one chunk per partition."""
+    for rows in partitions:
+        lines = [
+            json.dumps(
+                {c: _plain(v) for c, v in zip(columns, row)},
+                ensure_ascii=False,
+            )
+            for row in rows
+        ]
+        if lines:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def encode_table(
+    fmt: str, columns: list[str], partitions: Iterable[Iterable[tuple]]
+) -> Iterator[bytes]:
+    """CSV or NDJSON for row partitions (tuples in ``columns`` order) built in Python."""
+    if fmt == "csv":
+        return csv_chunks(columns, partitions)
+    if fmt == "ndjson":
+        return ndjson_chunks(columns, partitions)
+    raise ValueError(f"Unsupported export format: {fmt}")
+
+
+def _partitions(db: Session, entity: str, batch_size: int) -> Iterator[list[tuple]]:
+    for _, rows in iter_export_partitions(db, entity, batch_size):
+        yield rows
+
+
+def stream_csv(
+    db: Session, entity: str, batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[bytes]:
+    """CSV with a header row; one encoded chunk per cursor partition."""
+    if entity not in EXPORT_QUERIES:
+        raise ValueError(f"Unknown export entity: {entity}")
+    columns = list(EXPORT_QUERIES[entity]().selected_columns.keys())
+    return csv_chunks(columns, _partitions(db, entity, batch_size))
+
+
+def stream_ndjson(
+    db: Session, entity: str, batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[bytes]:
+    """One JSON object per line; one encoded chunk per cursor partition."""
+    if entity not in EXPORT_QUERIES:
+        raise ValueError(f"Unknown export entity: {entity}")
+    columns = list(EXPORT_QUERIES[entity]().selected_columns.keys())
+    return ndjson_chunks(columns, _partitions(db, entity, batch_size))
+
+
+def stream_export(
+    db: Session, entity: str, fmt: str, batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[bytes]:
+    if fmt == "csv":
+        return stream_csv(db, entity, batch_size)
+    if fmt == "ndjson":
+        return stream_ndjson(db, entity, batch_size)
+    raise ValueError(f"Unsupported export format: {fmt}")
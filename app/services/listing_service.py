@@ -0,0 +1,247 @@
+"""
+Row builders for the admin / manager listing endpoints.
+
+Each function runs one Core ``select`` of just the columns a listing shows and
+returns plain dicts shaped like the matching ``*Out`` model in ``main.py``
+(EmployeeOut, AdvanceOut, BillOut, OffDayOut, SalaryPaymentOut). The dicts are
+serialized once by ``FastJSONResponse``; no ORM objects or Pydantic models are
+built per row. Names of other people come from the request's EmployeeNameMap.
+
+Every output key is declared once in a ``*_FIELDS`` table with the columns it
+needs. Passing ``fields`` (a sparse fieldset, see :func:`parse_fields`) selects
+only those columns and emits only those keys; name lookups run only when a
+``*_name`` field is asked for. The tables double as the per-endpoint allow-lists.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, Mapping, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.schema import Advance, Bill, Employee, OffDay, SalaryPayment
+from app.utils.name_map import EmployeeNameMap
+
+Row = dict[str, Any]
+Fields = Optional[Iterable[str]]
+
+
+class Field(NamedTuple):
+    """One output key: the columns it reads and how to build its value."""
+    columns: tuple
+    value: Callable[[Any, Optional[EmployeeNameMap]], Any]
+    # Row attributes holding employee ids the value resolves through the name map
+    names: tuple[str, ...] = ()
+
+
+def _value(v: Any) -> Any:
+    return v.value if hasattr(v, "value") else v
+
+
+def _full_name(r) -> str:
+    return f"{r.first_name} {r.last_name}"
+
+
+def parse_fields(raw: Optional[str], allowed: Mapping[str, Field]) -> Optional[tuple[str, ...]]:
+    """
+    Parse a ``fields=a,b`` query value against a listing's allow-list.
+
+    Returns:
+        The requested keys in request order, or None (all fields) when empty
+
+    Raises:
+        ValueError: if a key is not in ``allowed``
+    """
+    if not raw:
+        return None
+    requested = tuple(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}."
+        )
+    return requested or None
+
+
+def _rows(
+    db: Session,
+    spec: Mapping[str, Field],
+    fields: Fields,
+    build: Callable[[Any], Any],
+    names: Optional[EmployeeNameMap] = None,
+) -> list[Row]:
+    """Select the columns behind ``fields`` (all of ``spec`` when None) and shape each row."""
+    wanted = spec if fields is None else {f: spec[f] for f in fields}
+    columns = {}
+    for field in wanted.values():
+        for column in field.columns:
+            columns.setdefault(column.key, column)
+    if not columns:  # only constant fields asked for: still one row per record
+        columns = {c.key: c for c in spec["id"].columns}
+    rows = db.execute(build(select(*columns.values()))).all()
+
+    name_attrs = {attr for field in wanted.values() for attr in field.names}
+    if name_attrs and names is not None:
+        names.load(getattr(r, attr) for r in rows for attr in name_attrs)
+    return [{key: field.value(r, names) for key, field in wanted.items()} for r in rows]
+
+
+def _plain(column) -> Field:
+    """Field that copies one column as-is (enums as their value)."""
+    key = column.key
+    return Field((column,), lambda r, names: _value(getattr(r, key)))
+
+
+def _name_of(column, attr: str) -> Field:
+    return Field((column,), lambda r, names: names.name(getattr(r, attr)), names=(attr,))
+
+
+EMPLOYEE_FIELDS: dict[str, Field] = {
+    "id": _plain(Employee.id),
+    "first_name": _plain(Employee.first_name),
+    "last_name": _plain(Employee.last_name),
+    "role": _plain(Employee.role),
+    "salary": Field((Employee.salary,), lambda r, names: float(r.salary)),
+    "phone_no": _plain(Employee.phone_no),
+    "employment_start_date": _plain(Employee.employment_start_date),
+    "days_worked_this_month": _plain(Employee.days_worked_this_month),
+    "total_days_worked": _plain(Employee.total_days_worked),
+    "salary_arrears": Field(
+        (Employee.salary_arrears,), lambda r, names: float(r.salary_arrears or 0)
+    ),
+}
+
+
+def employee_rows(db: Session, fields: Fields = None) -> list[Row]:
+    return _rows(
+        db,
+        EMPLOYEE_FIELDS,
+        fields,
+        lambda stmt: stmt.order_by(Employee.first_name, Employee.last_name),
+    )
+
+
+ADVANCE_FIELDS: dict[str, Field] = {
+    "id": _plain(Advance.id),
+    "employee_id": _plain(Advance.employee_id),
+    "employee_name": _name_of(Advance.employee_id, "employee_id"),
+    "amount_for_advance": _plain(Advance.amount_for_advance),
+    "reason": _plain(Advance.reason),
+    "status": _plain(Advance.status),
+    "created_at": _plain(Advance.created_at),
+    "approved_at": _plain(Advance.approved_at),
+    "approval_notes": _plain(Advance.approval_notes),
+}
+
+
+def advance_rows(
+    db: Session,
+    names: EmployeeNameMap,
+    limit: int | None = None,
+    fields: Fields = None,
+) -> list[Row]:
+    def build(stmt):
+        stmt = stmt.select_from(Advance).order_by(Advance.created_at.desc())
+        return stmt.limit(limit) if limit is not None else stmt
+
+    return _rows(db, ADVANCE_FIELDS, fields, build, names)
+
+
+BILL_FIELDS: dict[str, Field] = {
+    "id": _plain(Bill.id),
+    "date": _plain(Bill.date),
+    "employee_id": _plain(Employee.id.label("employee_id")),
+    "employee_name": Field(
+        (Employee.first_name, Employee.last_name), lambda r, names: _full_name(r)
+    ),
+    "role": _plain(Employee.role),
+    "amount": _plain(Bill.amount_billed),
+    "reason": _plain(Bill.reason),
+    "record_type": Field((), lambda r, names: "bill"),
+    # Recorders are a handful of managers/admins: resolved in one lookup
+    "recorded_by_name": _name_of(Bill.recorded_by_id, "recorded_by_id"),
+}
+
+
+def bill_rows(
+    db: Session,
+    names: EmployeeNameMap,
+    recorded_by_id: int | None = None,
+    limit: int | None = None,
+    fields: Fields = None,
+) -> list[Row]:
+    """All bills, or the latest ``limit`` recorded by one manager."""
+
+    def build(stmt):
+        stmt = (
+            stmt.select_from(Bill)
+            .join(Employee, Bill.billed_employee_id == Employee.id)
+            .order_by(Bill.date.desc())
+        )
+        if recorded_by_id is not None:
+            stmt = stmt.where(Bill.recorded_by_id == recorded_by_id)
+        return stmt.limit(limit) if limit is not None else stmt
+
+    return _rows(db, BILL_FIELDS, fields, build, names)
+
+
+OFF_DAY_FIELDS: dict[str, Field] = {
+    "id": _plain(OffDay.id),
+    "employee_id": _plain(OffDay.employee_id),
+    "employee_name": Field(
+        (Employee.first_name, Employee.last_name), lambda r, names: _full_name(r)
+    ),
+    "days_worked_this_month": _plain(Employee.days_worked_this_month),
+    "total_days_worked": _plain(Employee.total_days_worked),
+    "date": _plain(OffDay.date),
+    "day_count": _plain(OffDay.day_count),
+    "off_type": _plain(OffDay.off_type),
+    "reason": _plain(OffDay.reason),
+    "status": _plain(OffDay.status),
+    "created_at": _plain(OffDay.created_at),
+}
+
+
+def off_day_rows(db: Session, limit: int | None = None, fields: Fields = None) -> list[Row]:
+    def build(stmt):
+        stmt = (
+            stmt.select_from(OffDay)
+            .join(Employee, OffDay.employee_id == Employee.id)
+            .order_by(OffDay.created_at.desc())
+        )
+        return stmt.limit(limit) if limit is not None else stmt
+
+    return _rows(db, OFF_DAY_FIELDS, fields, build)
+
+
+SALARY_PAYMENT_FIELDS: dict[str, Field] = {
+    "id": _plain(SalaryPayment.id),
+    "employee_id": _plain(SalaryPayment.employee_id),
+    "employee_name": _name_of(SalaryPayment.employee_id, "employee_id"),
+    "amount_paid": _plain(SalaryPayment.amount_paid),
+    "payment_date": _plain(SalaryPayment.payment_date),
+    "notes": _plain(SalaryPayment.notes),
+    "paid_by_id": _plain(SalaryPayment.paid_by_id),
+    "paid_by_name": _name_of(SalaryPayment.paid_by_id, "paid_by_id"),
+    "created_at": _plain(SalaryPayment.created_at),
+    "payroll_year": _plain(SalaryPayment.payroll_year),
+    "payroll_month": _plain(SalaryPayment.payroll_month),
+}
+
+
+def salary_payment_rows(
+    db: Session,
+    names: EmployeeNameMap,
+    employee_id: int | None = None,
+    limit: int | None = None,
+    fields: Fields = None,
+) -> list[Row]:
+    def build(stmt):
+        stmt = stmt.select_from(SalaryPayment).order_by(
+            SalaryPayment.payment_date.desc(), SalaryPayment.created_at.desc()
+        )
+        if employee_id is not None:
+            stmt = stmt.where(SalaryPayment.employee_id == employee_id)
+        return stmt.limit(limit) if limit is not None else stmt
+
+    return _rows(db, SALARY_PAYMENT_FIELDS, fields, build, names)
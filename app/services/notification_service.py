@@ -1,16 +1,27 @@
 """
 Service for sending notifications via Email and WhatsApp
 Admins receive notifications about pending approvals
+
+Request handlers do not send: ``queue_admin_new_advance`` / ``queue_admin_new_off_day``
+write the rendered alert to the notification outbox in the caller's transaction,
+and the outbox dispatcher (``outbox_service``) delivers it with retries.
+With ``ADMIN_ALERT_DIGEST_MINUTES`` set, they queue one digest per window
+instead, rendered when it falls due from the requests still pending then.
+
+Email goes over one reused, authenticated SMTP session and WhatsApp through one
+pooled Twilio client (see ``notification_transport``).
 """
 
 import html
-import smtplib
+from datetime import datetime, timedelta
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from twilio.rest import Client
+from typing import Optional, Sequence
 
 from app.config.config import (
+    ADMIN_ALERT_DIGEST_MINUTES,
     ADMIN_NOTIFICATION_EMAIL,
+    ADMIN_NOTIFICATION_WHATSAPP,
     APP_PUBLIC_URL,
     EMAIL_FROM,
     EMAIL_HOST,
@@ -18,15 +29,38 @@ from app.config.config import (
     EMAIL_PORT,
     EMAIL_USER,
     ENABLE_ADMIN_EMAIL_NOTIFICATIONS,
+    SMTP_KEEPALIVE_SECONDS,
+    SMTP_MAX_MESSAGES_PER_CONNECTION,
+    SMTP_TIMEOUT_SECONDS,
     SMTP_USE_SSL,
     SMTP_USE_TLS,
     WHATSAPP_ACCOUNT_SID,
     WHATSAPP_AUTH_TOKEN,
     WHATSAPP_FROM_NUMBER,
 )
-from app.models.schema import Advance, Employee, OffDay
+from app.models.schema import (
+    Advance,
+    AdvanceStatus,
+    Employee,
+    NotificationOutbox,
+    OffDay,
+    OffDayStatus,
+    OutboxStatus,
+)
+from app.services.employee_directory import employee_directory
+from app.services.notification_transport import (
+    SMTPConnectionManager,
+    SMTPSettings,
+    twilio_client,
+)
+from app.services.outbox_service import Claimed, enqueue
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+ADMIN_DIGEST_KIND = "admin.digest"
+# Stored until the digest is rendered at dispatch time
+_DIGEST_PLACEHOLDER = "(rendered when due)"
+
 
 def _admin_email_link_footer() -> tuple[str, str]:
     """
@@ -82,6 +116,92 @@ def _wrap_notification_html(core_plain: str, footer_html: str) -> str:
 </html>"""
 
 
+class NotConfiguredError(RuntimeError):
+    """Credentials for a notification channel are missing."""
+
+
+def build_email_message(
+    to_email: str,
+    subject: str,
+    body: str,
+    body_html: str | None = None,
+) -> MIMEMultipart:
+    msg: MIMEMultipart
+    if body_html:
+        msg = MIMEMultipart("alternative")
+        msg.attach(MIMEText(body, "plain", "utf-8"))
+        msg.attach(MIMEText(body_html, "html", "utf-8"))
+    else:
+        msg = MIMEMultipart()
+        msg.attach(MIMEText(body, "plain", "utf-8"))
+
+    msg["From"] = EMAIL_FROM or EMAIL_USER
+    msg["To"] = to_email
+    msg["Subject"] = subject
+    return msg
+
+
+def _smtp_settings() -> SMTPSettings:
+    """Current SMTP settings (read per send, so a changed setting reconnects)."""
+    return SMTPSettings(
+        host=EMAIL_HOST,
+        port=EMAIL_PORT,
+        user=EMAIL_USER,
+        password=EMAIL_PASSWORD,
+        use_ssl=SMTP_USE_SSL,
+        use_tls=SMTP_USE_TLS,
+        timeout=SMTP_TIMEOUT_SECONDS,
+    )
+
+
+# Process-wide SMTP session shared by every email sender
+smtp_connections = SMTPConnectionManager(
+    _smtp_settings,
+    keepalive=SMTP_KEEPALIVE_SECONDS,
+    max_messages=SMTP_MAX_MESSAGES_PER_CONNECTION,
+)
+
+
+def _require_email_credentials() -> None:
+    if not EMAIL_USER or not EMAIL_PASSWORD:
+        raise NotConfiguredError("Email credentials not configured")
+
+
+def deliver_email(
+    to_email: str,
+    subject: str,
+    body: str,
+    body_html: str | None = None,
+) -> None:
+    """
+    Send one email via SMTP (STARTTLS on port 587 by default, or SMTP_SSL on 465
+    when configured), over the shared session.
+
+    Raises:
+        NotConfiguredError: if SMTP credentials are not set
+        smtplib.SMTPException / OSError: if the server rejects or cannot be reached
+    """
+    _require_email_credentials()
+    smtp_connections.send(build_email_message(to_email, subject, body, body_html))
+
+
+def deliver_email_batch(
+    emails: Sequence[tuple[str, str, str, Optional[str]]],
+) -> list[Optional[Exception]]:
+    """
+    Send ``(to_email, subject, body, body_html)`` emails back to back over the
+    shared session.
+
+    Returns:
+        None for each email sent, or the exception it failed with
+    """
+    try:
+        _require_email_credentials()
+    except NotConfiguredError as e:
+        return [e] * len(emails)
+    return smtp_connections.send_many(build_email_message(*email) for email in emails)
+
+
 def send_email_notification(
     to_email: str,
     subject: str,
@@ -101,33 +221,7 @@ def send_email_notification(
         True if sent successfully, False otherwise
     """
     try:
-        if not EMAIL_USER or not EMAIL_PASSWORD:
-            print("Email credentials not configured")
-            return False
-
-        msg: MIMEMultipart
-        if body_html:
-            msg = MIMEMultipart("alternative")
-            msg.attach(MIMEText(body, "plain", "utf-8"))
-            msg.attach(MIMEText(body_html, "html", "utf-8"))
-        else:
-            msg = MIMEMultipart()
-            msg.attach(MIMEText(body, "plain", "utf-8"))
-
-        msg["From"] = EMAIL_FROM or EMAIL_USER
-        msg["To"] = to_email
-        msg["Subject"] = subject
-
-        if SMTP_USE_SSL:
-            server = smtplib.SMTP_SSL(EMAIL_HOST, EMAIL_PORT)
-        else:
-            server = smtplib.SMTP(EMAIL_HOST, EMAIL_PORT)
-            if SMTP_USE_TLS:
-                server.starttls()
-        server.login(EMAIL_USER, EMAIL_PASSWORD)
-        server.send_message(msg)
-        server.quit()
-
+        deliver_email(to_email, subject, body, body_html)
         print(f"Email sent successfully to {to_email}")
         return True
     except Exception as e:
@@ -135,17 +229,15 @@ def send_email_notification(
         return False
 
 
-def notify_admin_new_advance(session: Session, advance_id: int) -> bool:
-    """
-    Email the configured admin when a new advance request is created (pending).
-    """
-    if not ENABLE_ADMIN_EMAIL_NOTIFICATIONS or not ADMIN_NOTIFICATION_EMAIL:
-        return False
-    advance = session.query(Advance).filter(Advance.id == advance_id).first()
-    if not advance:
-        return False
-    employee = session.query(Employee).filter(Employee.id == advance.employee_id).first()
-    name = f"{employee.first_name} {employee.last_name}" if employee else f"ID {advance.employee_id}"
+def _admin_alerts_enabled() -> bool:
+    return bool(ENABLE_ADMIN_EMAIL_NOTIFICATIONS and ADMIN_NOTIFICATION_EMAIL)
+
+
+def _advance_alert(session: Session, advance: Advance) -> tuple[str, str, str]:
+    """(subject, plain body, HTML body) of the admin alert for a new advance request."""
+    advance_id = advance.id
+    employee = employee_directory.get(session, advance.employee_id)
+    name = employee.full_name if employee else f"ID {advance.employee_id}"
     st = advance.status.value if hasattr(advance.status, "value") else str(advance.status)
     reason = (advance.reason or "").strip() or "(none)"
     subject = f"[Salary] New advance request #{advance_id} ({st})"
@@ -166,28 +258,14 @@ def notify_admin_new_advance(session: Session, advance_id: int) -> bool:
     )
 
     footer_plain, footer_html = _admin_email_link_footer()
-    body_plain = core_plain + footer_plain
-    body_html = _wrap_notification_html(core_plain, footer_html)
-
-    return send_email_notification(
-        ADMIN_NOTIFICATION_EMAIL,
-        subject,
-        body_plain,
-        body_html,
-    )
+    return subject, core_plain + footer_plain, _wrap_notification_html(core_plain, footer_html)
 
 
-def notify_admin_new_off_day(session: Session, off_day_id: int) -> bool:
-    """
-    Email the configured admin when a new off-day request is created (pending).
-    """
-    if not ENABLE_ADMIN_EMAIL_NOTIFICATIONS or not ADMIN_NOTIFICATION_EMAIL:
-        return False
-    off = session.query(OffDay).filter(OffDay.id == off_day_id).first()
-    if not off:
-        return False
-    employee = session.query(Employee).filter(Employee.id == off.employee_id).first()
-    name = f"{employee.first_name} {employee.last_name}" if employee else f"ID {off.employee_id}"
+def _off_day_alert(session: Session, off: OffDay) -> tuple[str, str, str]:
+    """(subject, plain body, HTML body) of the admin alert for a new off-day request."""
+    off_day_id = off.id
+    employee = employee_directory.get(session, off.employee_id)
+    name = employee.full_name if employee else f"ID {off.employee_id}"
     st = off.status.value if hasattr(off.status, "value") else str(off.status)
     reason = (off.reason or "").strip() or "(none)"
     subject = f"[Salary] New off-day request #{off_day_id} ({st})"
@@ -210,14 +288,257 @@ def notify_admin_new_off_day(session: Session, off_day_id: int) -> bool:
     )
 
     footer_plain, footer_html = _admin_email_link_footer()
-    body_plain = core_plain + footer_plain
-    body_html = _wrap_notification_html(core_plain, footer_html)
-
-    return send_email_notification(
-        ADMIN_NOTIFICATION_EMAIL,
-        subject,
-        body_plain,
-        body_html,
+    return subject, core_plain + footer_plain, _wrap_notification_html(core_plain, footer_html)
+
+
+def notify_admin_new_advance(session: Session, advance_id: int) -> bool:
+    """
+    Email the configured admin now about a new advance request (pending).
+    Request handlers use :func:`queue_admin_new_advance` instead.
+    """
+    if not _admin_alerts_enabled():
+        return False
+    advance = session.query(Advance).filter(Advance.id == advance_id).first()
+    if not advance:
+        return False
+    subject, body_plain, body_html = _advance_alert(session, advance)
+    return send_email_notification(ADMIN_NOTIFICATION_EMAIL, subject, body_plain, body_html)
+
+
+def notify_admin_new_off_day(session: Session, off_day_id: int) -> bool:
+    """
+    Email the configured admin now about a new off-day request (pending).
+    Request handlers use :func:`queue_admin_new_off_day` instead.
+    """
+    if not _admin_alerts_enabled():
+        return False
+    off = session.query(OffDay).filter(OffDay.id == off_day_id).first()
+    if not off:
+        return False
+    subject, body_plain, body_html = _off_day_alert(session, off)
+    return send_email_notification(ADMIN_NOTIFICATION_EMAIL, subject, body_plain, body_html)
+
+
+def _digest_recipients() -> list[tuple[str, str]]:
+    recipients = []
+    if _admin_alerts_enabled():
+        recipients.append(("email", ADMIN_NOTIFICATION_EMAIL))
+    if ADMIN_NOTIFICATION_WHATSAPP:
+        recipients.append(("whatsapp", ADMIN_NOTIFICATION_WHATSAPP))
+    return recipients
+
+
+def _queue_admin_digest(session: Session) -> bool:
+    """
+    Make sure a digest is queued for the current window on each admin channel.
+
+    Joins the digest created less than a window ago (not yet due, so no
+    dispatcher has claimed it) or starts a new one, due a window from now.
+    """
+    recipients = _digest_recipients()
+    now = datetime.utcnow()
+    window = timedelta(minutes=ADMIN_ALERT_DIGEST_MINUTES)
+    open_digests = set(
+        session.execute(
+            select(NotificationOutbox.channel, NotificationOutbox.recipient).where(
+                NotificationOutbox.kind == ADMIN_DIGEST_KIND,
+                NotificationOutbox.status == OutboxStatus.PENDING,
+                NotificationOutbox.created_at > now - window,
+            )
+        ).all()
+    )
+    for channel, recipient in recipients:
+        if (channel, recipient) not in open_digests:
+            enqueue(session, ADMIN_DIGEST_KIND, channel, recipient, _DIGEST_PLACEHOLDER,
+                    send_at=now + window)
+    return bool(recipients)
+
+
+def queue_admin_new_advance(session: Session, advance: Advance) -> bool:
+    """
+    Queue the admin alert for a new (flushed) advance in the outbox, in the
+    caller's transaction; nothing is sent until it commits. In digest mode the
+    request joins the window's digest instead. Returns False when admin alerts
+    are disabled.
+    """
+    if ADMIN_ALERT_DIGEST_MINUTES > 0:
+        return _queue_admin_digest(session)
+    if not _admin_alerts_enabled():
+        return False
+    subject, body_plain, body_html = _advance_alert(session, advance)
+    enqueue(
+        session, "advance.created", "email", ADMIN_NOTIFICATION_EMAIL, body_plain,
+        subject=subject, body_html=body_html, record_id=advance.id,
+    )
+    return True
+
+
+def queue_admin_new_off_day(session: Session, off: OffDay) -> bool:
+    """Outbox counterpart of :func:`notify_admin_new_off_day` (see :func:`queue_admin_new_advance`)."""
+    if ADMIN_ALERT_DIGEST_MINUTES > 0:
+        return _queue_admin_digest(session)
+    if not _admin_alerts_enabled():
+        return False
+    subject, body_plain, body_html = _off_day_alert(session, off)
+    enqueue(
+        session, "off_day.created", "email", ADMIN_NOTIFICATION_EMAIL, body_plain,
+        subject=subject, body_html=body_html, record_id=off.id,
+    )
+    return True
+
+
+def pending_advance_summary_rows(session: Session) -> list:
+    """Pending advances with the requester's name, oldest first (one joined query)."""
+    return session.execute(
+        select(
+            Advance.id,
+            Advance.employee_id,
+            Advance.amount_for_advance,
+            Advance.reason,
+            Advance.created_at,
+            Employee.first_name,
+            Employee.last_name,
+        )
+        .join(Employee, Advance.employee_id == Employee.id)
+        .where(Advance.status == AdvanceStatus.PENDING)
+        .order_by(Advance.created_at, Advance.id)
+    ).all()
+
+
+def pending_off_day_summary_rows(session: Session) -> list:
+    """Pending off-day requests with the requester's name, oldest first (one joined query)."""
+    return session.execute(
+        select(
+            OffDay.id,
+            OffDay.employee_id,
+            OffDay.date,
+            OffDay.day_count,
+            OffDay.off_type,
+            OffDay.reason,
+            Employee.first_name,
+            Employee.last_name,
+        )
+        .join(Employee, OffDay.employee_id == Employee.id)
+        .where(OffDay.status == OffDayStatus.PENDING)
+        .order_by(OffDay.created_at, OffDay.id)
+    ).all()
+
+
+def _advance_summary_lines(advances: list) -> list[str]:
+    lines = []
+    for advance in advances:
+        lines.append(
+            f"- ID: {advance.id} | "
+            f"Employee: {advance.first_name} {advance.last_name} | "
+            f"Amount: ${advance.amount_for_advance:.2f} | "
+            f"Date: {advance.created_at.strftime('%Y-%m-%d')}"
+        )
+        if advance.reason:
+            lines.append(f"  Reason: {advance.reason}")
+    return lines
+
+
+def _off_day_summary_lines(off_days: list) -> list[str]:
+    lines = []
+    for off in off_days:
+        lines.append(
+            f"- ID: {off.id} | "
+            f"Employee: {off.first_name} {off.last_name} | "
+            f"From: {off.date} | "
+            f"Days: {off.day_count} ({off.off_type})"
+        )
+        if off.reason:
+            lines.append(f"  Reason: {off.reason}")
+    return lines
+
+
+def _digest_subject(total: int) -> str:
+    return f"[Salary] {total} pending request{'s' if total != 1 else ''} awaiting review"
+
+
+def build_admin_digest(session: Session) -> Optional[tuple[str, str, str]]:
+    """(subject, plain body, HTML body) summarising all pending requests, or None if none."""
+    advances = pending_advance_summary_rows(session)
+    off_days = pending_off_day_summary_rows(session)
+    total = len(advances) + len(off_days)
+    if not total:
+        return None
+
+    subject = _digest_subject(total)
+    lines = ["Salary Management System - Pending Requests", "=" * 50]
+    if advances:
+        total_amount = sum(a.amount_for_advance for a in advances)
+        lines += ["", f"Advances: {len(advances)} (total ${total_amount:.2f})"]
+        lines += _advance_summary_lines(advances)
+    if off_days:
+        lines += ["", f"Off days: {len(off_days)}"]
+        lines += _off_day_summary_lines(off_days)
+    lines += ["", "Please review and approve/deny these requests."]
+    core_plain = "\n".join(lines)
+
+    footer_plain, footer_html = _admin_email_link_footer()
+    return subject, core_plain + footer_plain, _wrap_notification_html(core_plain, footer_html)
+
+
+def build_admin_digest_short(session: Session) -> Optional[tuple[str, str]]:
+    """
+    (subject, body) of the digest for WhatsApp, or None if nothing is pending:
+    counts, the advance total and the dashboard link, so it stays within
+    Twilio's 1600-character WhatsApp limit however many requests are pending.
+    """
+    advances = pending_advance_summary_rows(session)
+    off_days = pending_off_day_summary_rows(session)
+    total = len(advances) + len(off_days)
+    if not total:
+        return None
+
+    subject = _digest_subject(total)
+    lines = [subject]
+    if advances:
+        total_amount = sum(a.amount_for_advance for a in advances)
+        lines.append(f"Advances: {len(advances)} (total ${total_amount:.2f})")
+    if off_days:
+        days = sum(off.day_count or 0 for off in off_days)
+        lines.append(f"Off days: {len(off_days)} ({days:g} day{'s' if days != 1 else ''})")
+    if APP_PUBLIC_URL:
+        lines.append(f"Review: {APP_PUBLIC_URL.rstrip('/')}/admin-dashboard")
+    else:
+        lines.append("Review them in the admin dashboard.")
+    return subject, "\n".join(lines)
+
+
+def render_outbox_row(session: Session, row: Claimed) -> Optional[Claimed]:
+    """Fill in a due admin digest (None when nothing is pending); other rows pass through."""
+    if row.kind != ADMIN_DIGEST_KIND:
+        return row
+    if row.channel != "email":
+        short = build_admin_digest_short(session)
+        if short is None:
+            return None
+        subject, body = short
+        return row._replace(subject=subject, body=body, body_html=None)
+    digest = build_admin_digest(session)
+    if digest is None:
+        return None
+    subject, body_plain, body_html = digest
+    return row._replace(subject=subject, body=body_plain, body_html=body_html)
+
+
+def deliver_whatsapp(to_number: str, message: str) -> None:
+    """
+    Send one WhatsApp message via Twilio (shared client, pooled HTTPS connections).
+
+    Raises:
+        NotConfiguredError: if Twilio credentials are not set
+        TwilioException: if the API call fails
+    """
+    if not WHATSAPP_ACCOUNT_SID or not WHATSAPP_AUTH_TOKEN:
+        raise NotConfiguredError("WhatsApp credentials not configured")
+
+    twilio_client(WHATSAPP_ACCOUNT_SID, WHATSAPP_AUTH_TOKEN).messages.create(
+        body=message,
+        from_=WHATSAPP_FROM_NUMBER,
+        to=to_number,
     )
 
 
@@ -233,18 +554,7 @@ def send_whatsapp_notification(to_number: str, message: str) -> bool:
         True if sent successfully, False otherwise
     """
     try:
-        if not WHATSAPP_ACCOUNT_SID or not WHATSAPP_AUTH_TOKEN:
-            print("WhatsApp credentials not configured")
-            return False
-
-        client = Client(WHATSAPP_ACCOUNT_SID, WHATSAPP_AUTH_TOKEN)
-
-        message = client.messages.create(
-            body=message,
-            from_=WHATSAPP_FROM_NUMBER,
-            to=to_number,
-        )
-
+        deliver_whatsapp(to_number, message)
         print(f"WhatsApp message sent successfully to {to_number}")
         return True
     except Exception as e:
@@ -268,10 +578,8 @@ def send_pending_advances_summary(session: Session, admin_id: int) -> bool:
     if not admin:
         return False
 
-    # Get pending advances
-    from app.services.advance_service import get_pending_advances
-
-    pending_advances = get_pending_advances(session)
+    # Pending advances with requester names, in one joined query
+    pending_advances = pending_advance_summary_rows(session)
 
     if not pending_advances:
         return True  # No pending advances, nothing to notify
@@ -284,19 +592,8 @@ def send_pending_advances_summary(session: Session, admin_id: int) -> bool:
         "",
         "Details:",
     ]
-
-    total_amount = 0
-    for advance in pending_advances:
-        employee = advance.employee
-        summary_lines.append(
-            f"- ID: {advance.id} | "
-            f"Employee: {employee.first_name} {employee.last_name} | "
-            f"Amount: ${advance.amount_for_advance:.2f} | "
-            f"Date: {advance.created_at.strftime('%Y-%m-%d')}"
-        )
-        if advance.reason:
-            summary_lines.append(f"  Reason: {advance.reason}")
-        total_amount += advance.amount_for_advance
+    summary_lines += _advance_summary_lines(pending_advances)
+    total_amount = sum(advance.amount_for_advance for advance in pending_advances)
 
     summary_lines.append("")
     summary_lines.append(f"Total Amount: ${total_amount:.2f}")
@@ -0,0 +1,190 @@
+"""
+Long-lived connections for outgoing notifications.
+
+:class:`SMTPConnectionManager` keeps one authenticated SMTP session per
+process and sends every message over it, instead of a connect + STARTTLS +
+login + quit round per email:
+
+- a session idle for more than ``healthcheck_after`` seconds is checked with
+  ``NOOP`` before reuse; one idle longer than ``keepalive`` (servers drop idle
+  clients after a few minutes) or that has carried ``max_messages`` (a common
+  per-connection server limit) is replaced;
+- a send that finds the connection dropped reconnects and retries once;
+  per-message rejections (refused recipient, 4xx/5xx on DATA) leave the
+  session usable for the rest of a batch;
+- settings are read on every use, so a changed host or credential reconnects.
+
+:func:`twilio_client` returns one cached Twilio ``Client`` per account, whose
+HTTP client keeps a pooled ``requests`` session (keep-alive TLS) instead of a
+new client and connection per WhatsApp message.
+"""
+from __future__ import annotations
+
+import smtplib
+import threading
+import time
+from dataclasses import dataclass
+from email.message import Message
+from typing import Callable, Iterable, Optional
+
+from twilio.http.http_client import TwilioHttpClient
+from twilio.rest import Client
+
+
+def _connection_lost(error: Exception) -> bool:
+    """True when the session is gone, as opposed to the message being refused."""
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    # SMTPException subclasses OSError: refusals are not connection failures
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+@dataclass(frozen=True)
+class SMTPSettings:
+    host: str
+    port: int
+    user: str
+    password: str
+    use_ssl: bool = False
+    use_tls: bool = True
+    timeout: float = 30.0
+
+
+class SMTPConnectionManager:
+    """One reusable, authenticated SMTP session shared by all senders in the process."""
+
+    def __init__(
+        self,
+        settings: Callable[[], SMTPSettings],
+        keepalive: float = 240.0,
+        healthcheck_after: float = 15.0,
+        max_messages: int = 100,
+    ):
+        self._settings = settings
+        self.keepalive = keepalive
+        self.healthcheck_after = healthcheck_after
+        self.max_messages = max_messages
+        self._lock = threading.Lock()
+        self._server: Optional[smtplib.SMTP] = None
+        self._connected_with: Optional[SMTPSettings] = None
+        self._last_used = 0.0
+        self._sent_on_connection = 0
+        self.connects = 0
+
+    def send(self, message: Message) -> None:
+        """Send one message; raises on failure."""
+        error = self.send_many([message])[0]
+        if error is not None:
+            raise error
+
+    def send_many(self, messages: Iterable[Message]) -> list[Optional[Exception]]:
+        """Send messages over the shared session; returns None or the error per message."""
+        results: list[Optional[Exception]] = []
+        with self._lock:
+            for message in messages:
+                try:
+                    self._send_one(message)
+                    results.append(None)
+                except Exception as e:
+                    results.append(e)
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            self._discard()
+
+    def close_idle(self) -> None:
+        """Drop the session if it has been idle past ``keepalive`` (called between batches)."""
+        with self._lock:
+            if self._server is not None and self._idle_for() > self.keepalive:
+                self._discard()
+
+    def _idle_for(self) -> float:
+        return time.monotonic() - self._last_used
+
+    def _send_one(self, message: Message) -> None:
+        for attempt in (1, 2):
+            server = self._ensure_connected()
+            try:
+                server.send_message(message)
+            except Exception as e:
+                if _connection_lost(e):
+                    self._discard()
+                    if attempt == 1:
+                        continue
+                elif server.sock is None:
+                    # Refused with 421: smtplib closed the session (otherwise it sent RSET)
+                    self._discard()
+                raise
+            self._sent_on_connection += 1
+            self._last_used = time.monotonic()
+            return
+
+    def _ensure_connected(self) -> smtplib.SMTP:
+        settings = self._settings()
+        if self._server is not None:
+            if (
+                settings != self._connected_with
+                or self._sent_on_connection >= self.max_messages
+                or self._idle_for() > self.keepalive
+            ):
+                self._discard()
+            elif self._idle_for() > self.healthcheck_after and not self._healthy():
+                self._discard()
+        if self._server is None:
+            self._server = self._connect(settings)
+            self._connected_with = settings
+            self._sent_on_connection = 0
+            self._last_used = time.monotonic()
+            self.connects += 1
+        return self._server
+
+    def _healthy(self) -> bool:
+        try:
+            return self._server.noop()[0] == 250
+        except OSError:  # includes SMTPException
+            return False
+
+    @staticmethod
+    def _connect(settings: SMTPSettings) -> smtplib.SMTP:
+        if settings.use_ssl:
+            server = smtplib.SMTP_SSL(settings.host, settings.port, timeout=settings.timeout)
+        else:
+            server = smtplib.SMTP(settings.host, settings.port, timeout=settings.timeout)
+        try:
+            if settings.use_tls and not settings.use_ssl:
+                server.starttls()
+            server.login(settings.user, settings.password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _discard(self) -> None:
+        server, self._server = self._server, None
+        self._connected_with = None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+
+_twilio_clients: dict[tuple[str, str], Client] = {}
+_twilio_lock = threading.Lock()
+
+
+def twilio_client(account_sid: str, auth_token: str) -> Client:
+    """Shared Twilio client for these credentials (pooled HTTP connections)."""
+    key = (account_sid, auth_token)
+    with _twilio_lock:
+        client = _twilio_clients.get(key)
+        if client is None:
+            client = Client(
+                account_sid,
+                auth_token,
+                http_client=TwilioHttpClient(pool_connections=True, timeout=30),
+            )
+            _twilio_clients[key] = client
+        return client
@@ -0,0 +1,318 @@
+"""
+Transactional outbox for notifications.
+
+Handlers call :func:`enqueue` inside the transaction that makes the change, so
+an alert exists if and only if the change committed, and the request returns
+without waiting on SMTP or Twilio. :func:`dispatch_pending` delivers due rows:
+
+- rows are claimed with a short lease (``next_attempt_at`` pushed forward,
+  ``FOR UPDATE SKIP LOCKED`` on Postgres) and committed before sending, so
+  concurrent dispatchers (worker threads, overlapping cron runs) do not pick
+  the same row and no lock is held across network calls;
+- rows whose content depends on the state when they fall due (the admin
+  digest) are rendered right after the claim;
+- a claimed batch is sent in groups of ``SEND_GROUP_SIZE`` (emails back to
+  back over the pooled SMTP session). Each group's results are committed as
+  soon as it is done, together with a renewed lease on the rows still to
+  send, so a slow batch never outlives its lease and has its sent rows
+  re-claimed. A failure is retried with exponential backoff and marked
+  ``failed`` after ``OUTBOX_MAX_ATTEMPTS``. A dispatcher that dies mid-group
+  leaves the lease to expire, so delivery is at-least-once.
+
+:class:`OutboxWorker` runs the dispatcher on a thread for long-running servers,
+woken right after a commit that queued something; on Vercel the cron route
+``/api/internal/cron/notifications`` drains it instead.
+"""
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, NamedTuple, Optional
+
+from sqlalchemy import delete, event, select, update
+from sqlalchemy.orm import Session
+
+from app.config.config import (
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_POLL_SECONDS,
+    OUTBOX_RETRY_BASE_SECONDS,
+    SMTP_TIMEOUT_SECONDS,
+)
+from app.models.schema import NotificationOutbox, OutboxStatus
+
+# Seconds a claimed row is reserved for the dispatcher that claimed it
+CLAIM_LEASE_SECONDS = 300
+MAX_RETRY_DELAY_SECONDS = 3600
+DISPATCH_BATCH_SIZE = 50
+# Messages sent between commits; a group that times out on every message must
+# still finish well inside the lease
+SEND_GROUP_SIZE = max(1, CLAIM_LEASE_SECONDS // (2 * max(1, SMTP_TIMEOUT_SECONDS)))
+
+_ENQUEUED_KEY = "outbox_enqueued"
+_wakeup = threading.Event()
+
+
+class Claimed(NamedTuple):
+    """A claimed outbox row, as handed to renderers and senders."""
+    id: int
+    kind: str
+    record_id: Optional[int]
+    channel: str
+    recipient: str
+    subject: Optional[str]
+    body: str
+    body_html: Optional[str]
+    attempts: int
+
+
+# Receives claimed rows and returns, per row, None if it was sent or the
+# exception it failed with
+Sender = Callable[[list[Claimed]], list[Optional[Exception]]]
+
+
+def enqueue(
+    session: Session,
+    kind: str,
+    channel: str,
+    recipient: str,
+    body: str,
+    subject: Optional[str] = None,
+    body_html: Optional[str] = None,
+    record_id: Optional[int] = None,
+    send_at: Optional[datetime] = None,
+) -> NotificationOutbox:
+    """Add a message to the outbox in the caller's transaction (no commit)."""
+    now = datetime.utcnow()
+    row = NotificationOutbox(
+        kind=kind,
+        record_id=record_id,
+        channel=channel,
+        recipient=recipient,
+        subject=subject,
+        body=body,
+        body_html=body_html,
+        status=OutboxStatus.PENDING,
+        attempts=0,
+        next_attempt_at=send_at or now,
+        created_at=now,
+    )
+    session.add(row)
+    session.info[_ENQUEUED_KEY] = True
+    return row
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff after the ``attempts``-th failure: base, 2x base, 4x base, ... capped."""
+    seconds = OUTBOX_RETRY_BASE_SECONDS * (2 ** max(0, attempts - 1))
+    return timedelta(seconds=min(seconds, MAX_RETRY_DELAY_SECONDS))
+
+
+def send_outbox_batch(rows: list[Claimed]) -> list[Optional[Exception]]:
+    """Deliver rows on their channels: emails as one SMTP batch, WhatsApp one by one."""
+    from app.services.notification_service import deliver_email_batch, deliver_whatsapp
+
+    results: list[Optional[Exception]] = [None] * len(rows)
+    emails = [i for i, row in enumerate(rows) if row.channel == "email"]
+    sent = deliver_email_batch(
+        [(rows[i].recipient, rows[i].subject or "", rows[i].body, rows[i].body_html) for i in emails]
+    ) if emails else []
+    for i, error in zip(emails, sent):
+        results[i] = error
+    for i, row in enumerate(rows):
+        if row.channel == "email":
+            continue
+        try:
+            if row.channel == "whatsapp":
+                deliver_whatsapp(row.recipient, row.body)
+            else:
+                raise ValueError(f"Unknown notification channel: {row.channel}")
+        except Exception as e:
+            results[i] = e
+    return results
+
+
+def _release_idle_connections() -> None:
+    from app.services.notification_service import smtp_connections
+
+    smtp_connections.close_idle()
+
+
+def _render(session: Session, rows: list[Claimed]) -> list[Optional[Claimed]]:
+    """Fill in rows whose content is built when due (digests); None drops a row."""
+    from app.services.notification_service import render_outbox_row
+
+    return [render_outbox_row(session, row) for row in rows]
+
+
+def _claim(session: Session, now: datetime, limit: int) -> list[Claimed]:
+    rows = session.execute(
+        select(*(getattr(NotificationOutbox, name) for name in Claimed._fields))
+        .where(
+            NotificationOutbox.status == OutboxStatus.PENDING,
+            NotificationOutbox.next_attempt_at <= now,
+        )
+        .order_by(NotificationOutbox.next_attempt_at, NotificationOutbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if rows:
+        session.execute(
+            update(NotificationOutbox)
+            .where(NotificationOutbox.id.in_([r.id for r in rows]))
+            .values(next_attempt_at=now + timedelta(seconds=CLAIM_LEASE_SECONDS))
+        )
+    session.commit()
+    return [Claimed(*r) for r in rows]
+
+
+def dispatch_pending(
+    session: Session,
+    limit: int = DISPATCH_BATCH_SIZE,
+    now: Optional[datetime] = None,
+    send: Sender = send_outbox_batch,
+) -> dict[str, int]:
+    """
+    Deliver up to ``limit`` due messages.
+
+    Returns:
+        Counts of ``sent``, ``retrying`` and ``failed`` messages
+    """
+    now = now or datetime.utcnow()
+    result = {"sent": 0, "retrying": 0, "failed": 0}
+    claimed = _claim(session, now, limit)
+    if not claimed:
+        return result
+    claimed_at = datetime.utcnow()
+    rows = []
+    for row, out in zip(claimed, _render(session, claimed)):
+        if out is None:
+            # A digest with nothing left to report is dropped, not sent
+            session.execute(delete(NotificationOutbox).where(NotificationOutbox.id == row.id))
+        else:
+            rows.append(out)
+    originals = {row.id: row for row in claimed}
+    for start in range(0, len(rows), SEND_GROUP_SIZE):
+        group = rows[start:start + SEND_GROUP_SIZE]
+        errors = send(group)
+        sent_at = datetime.utcnow()
+        for row, e in zip(group, errors):
+            _record_result(session, row, e, originals[row.id], now, sent_at, result)
+        waiting = [row.id for row in rows[start + SEND_GROUP_SIZE:]]
+        if waiting:
+            # The lease runs from the claim; push it on for the rows still to send
+            elapsed = datetime.utcnow() - claimed_at
+            session.execute(
+                update(NotificationOutbox)
+                .where(NotificationOutbox.id.in_(waiting))
+                .values(next_attempt_at=now + elapsed + timedelta(seconds=CLAIM_LEASE_SECONDS))
+            )
+        session.commit()
+    if not rows:
+        session.commit()  # dropped digests
+    return result
+
+
+def _record_result(
+    session: Session,
+    row: Claimed,
+    error: Optional[Exception],
+    original: Claimed,
+    now: datetime,
+    sent_at: datetime,
+    result: dict[str, int],
+) -> None:
+    attempts = row.attempts + 1
+    if error is not None:
+        values = {"attempts": attempts, "last_error": f"{type(error).__name__}: {error}"[:2000]}
+        if attempts >= OUTBOX_MAX_ATTEMPTS:
+            values["status"] = OutboxStatus.FAILED
+            result["failed"] += 1
+        else:
+            values["next_attempt_at"] = now + retry_delay(attempts)
+            result["retrying"] += 1
+    else:
+        values = {
+            "attempts": attempts,
+            "status": OutboxStatus.SENT,
+            "sent_at": sent_at,
+            "last_error": None,
+        }
+        result["sent"] += 1
+    if row != original:
+        # Keep what was actually sent for rows rendered at dispatch time
+        values.update(subject=row.subject, body=row.body, body_html=row.body_html)
+    session.execute(
+        update(NotificationOutbox).where(NotificationOutbox.id == row.id).values(**values)
+    )
+
+
+def drain(
+    session: Session,
+    now: Optional[datetime] = None,
+    send: Sender = send_outbox_batch,
+    max_batches: int = 20,
+) -> dict[str, int]:
+    """Dispatch batches until nothing is due (bounded, for cron invocations)."""
+    totals = {"sent": 0, "retrying": 0, "failed": 0}
+    for _ in range(max_batches):
+        result = dispatch_pending(session, now=now, send=send)
+        for key, value in result.items():
+            totals[key] += value
+        if sum(result.values()) < DISPATCH_BATCH_SIZE:
+            break
+    return totals
+
+
+class OutboxWorker:
+    """Background thread that drains the outbox when woken, and every poll interval."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        poll_seconds: float = OUTBOX_POLL_SECONDS,
+        send: Sender = send_outbox_batch,
+    ):
+        self.session_factory = session_factory
+        self.poll_seconds = poll_seconds
+        self.send = send
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="outbox-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        _wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            _wakeup.clear()
+            session = self.session_factory()
+            try:
+                drain(session, send=self.send)
+            except Exception as e:
+                print(f"Outbox dispatch error: {e}")
+                session.rollback()
+            finally:
+                session.close()
+            _release_idle_connections()
+            _wakeup.wait(self.poll_seconds)
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session: Session) -> None:
+    if session.info.pop(_ENQUEUED_KEY, False):
+        _wakeup.set()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session) -> None:
+    session.info.pop(_ENQUEUED_KEY, None)
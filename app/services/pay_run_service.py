@@ -0,0 +1,177 @@
+"""
+Company-wide salary pay run for a payroll month.
+
+Instead of one ``POST /api/salary-payments`` per employee (each recomputing
+net pay remaining), a pay run:
+
+- computes net remaining for every selected employee with one batched payroll
+  pass (:func:`get_payroll_breakdowns`), less payments already tagged to the
+  month;
+- inserts all ``SalaryPayment`` rows, tagged with ``payroll_year`` /
+  ``payroll_month``, with one batched ``INSERT ... RETURNING``, plus one
+  ``PayRunEntry`` per employee, and commits once.
+
+A dry run returns the same result set without writing. Runs are idempotent
+per period: ``PayRunEntry`` is unique per (employee, year, month), so an
+employee already paid by a run for the month is skipped (and a concurrent
+run for the same employees fails on the constraint instead of paying twice).
+Employees whose month is already closed are skipped too, as their unpaid net
+now sits in ``salary_arrears``.
+"""
+from __future__ import annotations
+
+from calendar import monthrange
+from datetime import date, datetime
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.schema import Employee, PayrollPeriodClose, PayRunEntry, Role, SalaryPayment
+from app.services.auth_service import TokenClaims, resolve_role
+from app.services.event_hub import make_event, queue_events
+from app.services.payroll_service import get_payroll_breakdowns
+
+
+def pay_run_as_of(year: int, month: int, today: Optional[date] = None) -> date:
+    """
+    Date net pay is computed at: the month's last day, or today for the
+    current month.
+
+    Raises:
+        ValueError: for a month that has not started
+    """
+    today = today or date.today()
+    if date(year, month, 1) > today:
+        raise ValueError("Cannot run payroll for a month that has not started.")
+    return min(date(year, month, monthrange(year, month)[1]), today)
+
+
+def _period_ids(db: Session, model, employee_column, year: int, month: int, ids) -> set[int]:
+    stmt = select(employee_column).where(model.year == year, model.month == month)
+    if ids is not None:
+        stmt = stmt.where(employee_column.in_(ids))
+    return set(db.execute(stmt).scalars())
+
+
+def _tagged_payments(db: Session, year: int, month: int, ids) -> dict[int, float]:
+    stmt = (
+        select(SalaryPayment.employee_id, func.sum(SalaryPayment.amount_paid))
+        .where(SalaryPayment.payroll_year == year, SalaryPayment.payroll_month == month)
+        .group_by(SalaryPayment.employee_id)
+    )
+    if ids is not None:
+        stmt = stmt.where(SalaryPayment.employee_id.in_(ids))
+    return {employee_id: float(total or 0) for employee_id, total in db.execute(stmt)}
+
+
+def run_pay_run(
+    db: Session,
+    admin_id: int,
+    year: int,
+    month: int,
+    employee_ids: Optional[Iterable[int]] = None,
+    dry_run: bool = False,
+    payment_date: Optional[date] = None,
+    notes: Optional[str] = None,
+    claims: Optional[TokenClaims] = None,
+) -> dict[str, Any]:
+    """
+    Pay net remaining for a month to all employees (or ``employee_ids``).
+
+    Returns:
+        Period, totals and one result per employee (ascending id), with
+        ``status`` ``paid`` (``would_pay`` in a dry run), ``already_paid``,
+        ``period_closed``, ``nothing_due`` or ``not_found``
+
+    Raises:
+        ValueError: if the admin is not found or the month has not started
+        PermissionError: if ``admin_id`` is not an admin
+        sqlalchemy.exc.IntegrityError: if a concurrent run paid one of the
+            employees first (nothing is written; re-running pays the rest)
+    """
+    admin_role = resolve_role(db, admin_id, claims)
+    if admin_role is None:
+        raise ValueError("Admin not found")
+    if admin_role != Role.ADMIN:
+        raise PermissionError("Only admins can run payroll")
+    as_of = pay_run_as_of(year, month)
+
+    ids = None if employee_ids is None else sorted(set(employee_ids))
+    breakdowns = get_payroll_breakdowns(db, as_of, ids)
+    already_paid = _period_ids(db, PayRunEntry, PayRunEntry.employee_id, year, month, ids)
+    closed = _period_ids(db, PayrollPeriodClose, PayrollPeriodClose.employee_id, year, month, ids)
+    tagged = _tagged_payments(db, year, month, ids)
+
+    results: dict[int, dict[str, Any]] = {}
+    due: dict[int, float] = {}
+    for employee_id in ids if ids is not None else sorted(breakdowns):
+        breakdown = breakdowns.get(employee_id)
+        result = {"employee_id": employee_id, "amount": 0.0, "status": "nothing_due"}
+        results[employee_id] = result
+        if breakdown is None:
+            result["status"] = "not_found"
+            continue
+        if employee_id in already_paid:
+            result["status"] = "already_paid"
+            continue
+        if employee_id in closed:
+            result["status"] = "period_closed"
+            continue
+        amount = round(breakdown["remaining_salary"] - tagged.get(employee_id, 0.0), 2)
+        if amount > 0:
+            due[employee_id] = amount
+            result.update(amount=amount, status="would_pay" if dry_run else "paid")
+
+    if due and not dry_run:
+        paid_on = payment_date or date.today()
+        inserted = db.execute(
+            insert(SalaryPayment).returning(SalaryPayment.id, SalaryPayment.employee_id),
+            [
+                {
+                    "employee_id": employee_id,
+                    "paid_by_id": admin_id,
+                    "amount_paid": amount,
+                    "payment_date": paid_on,
+                    "notes": notes or f"Pay run {year}-{month:02d}",
+                    "payroll_year": year,
+                    "payroll_month": month,
+                }
+                for employee_id, amount in due.items()
+            ],
+        ).all()
+        db.execute(
+            insert(PayRunEntry),
+            [
+                {
+                    "employee_id": r.employee_id,
+                    "year": year,
+                    "month": month,
+                    "salary_payment_id": r.id,
+                    "amount_paid": due[r.employee_id],
+                }
+                for r in inserted
+            ],
+        )
+        # As record_salary_payment does for one employee
+        db.execute(
+            update(Employee).where(Employee.id.in_(due)).values(updated_at=datetime.utcnow())
+        )
+        queue_events(db, [
+            make_event("salary_payment", "created", r.id, r.employee_id, amount=due[r.employee_id])
+            for r in inserted
+        ])
+        db.commit()
+        for r in inserted:
+            results[r.employee_id]["salary_payment_id"] = r.id
+
+    return {
+        "year": year,
+        "month": month,
+        "as_of": as_of.isoformat(),
+        "dry_run": dry_run,
+        "employees": len(results),
+        "payments": len(due),
+        "total_amount": round(sum(due.values()), 2),
+        "results": list(results.values()),
+    }
@@ -0,0 +1,197 @@
+"""
+Month-end payroll register: one row per employee with base, eligible days,
+off days, earned gross, bills, advances, payments tagged to the month,
+arrears brought forward and the resulting balance.
+
+All rows come from one batched pass (:func:`get_payroll_breakdowns` at month
+end plus two grouped queries), and are written as CSV or NDJSON with the
+export encoders, one chunk per batch of rows.
+
+Arrears brought forward are the current ``salary_arrears`` less what closing
+this month and later ones rolled in, so a past month's register does not
+drift as later months are closed.
+
+Registers of closed months (every employee employed by month end has a
+``PayrollPeriodClose`` row for it) rarely change, so their encoded files are
+kept in :data:`register_cache`, keyed on the version of the tables they are
+built from (:func:`register_data_version`): a backdated bill, a payment
+tagged to the month or a backdated hire gives a new key and a fresh build,
+and a repeat download costs one version query. Open months are computed and
+streamed on every request.
+"""
+from __future__ import annotations
+
+from calendar import monthrange
+from datetime import date
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.config.config import PAYROLL_REGISTER_CACHE_TTL_SECONDS
+from app.models.schema import Advance, Bill, Employee, OffDay, PayrollPeriodClose, SalaryPayment
+from app.services.employee_directory import employee_directory
+from app.services.export_service import encode_table
+from app.services.payroll_service import get_payroll_breakdowns
+from app.utils.etag import compute_etag
+from app.utils.ttl_cache import TTLCache
+
+# Rows per encoded chunk
+REGISTER_CHUNK_ROWS = 500
+
+REGISTER_COLUMNS = (
+    "employee_id",
+    "employee_name",
+    "role",
+    "base_monthly",
+    "eligible_days",
+    "off_days",
+    "off_day_deduction",
+    "earned_gross",
+    "bills",
+    "advances",
+    "net_for_month",
+    "payments",
+    "arrears_brought_forward",
+    "balance",
+    "closed",
+)
+
+# Tables whose rows feed a register; closing a period also updates the employee
+REGISTER_SOURCES = (Employee, Bill, Advance, OffDay, SalaryPayment)
+
+register_cache = TTLCache(ttl_seconds=PAYROLL_REGISTER_CACHE_TTL_SECONDS, max_entries=48)
+
+
+def _month_end(year: int, month: int) -> date:
+    return date(year, month, monthrange(year, month)[1])
+
+
+def _money(value: float) -> float:
+    return round(float(value or 0), 2)
+
+
+def register_data_version(db: Session) -> str:
+    """Version of everything a register is built from, in one query; part of the cache keys."""
+    return compute_etag(db, *REGISTER_SOURCES)
+
+
+def month_is_closed(db: Session, year: int, month: int) -> bool:
+    """True once the month has ended and every employee employed by then has closed it."""
+    end = _month_end(year, month)
+    if end >= date.today():
+        return False
+    employees, closes = db.execute(
+        select(func.count(Employee.id), func.count(PayrollPeriodClose.id))
+        .select_from(Employee)
+        .outerjoin(
+            PayrollPeriodClose,
+            and_(
+                PayrollPeriodClose.employee_id == Employee.id,
+                PayrollPeriodClose.year == year,
+                PayrollPeriodClose.month == month,
+            ),
+        )
+        .where(Employee.employment_start_date <= end)
+    ).one()
+    return employees > 0 and closes == employees
+
+
+def register_rows(db: Session, year: int, month: int) -> list[dict[str, Any]]:
+    """Register rows for employees employed by the end of the month, by id."""
+    end = _month_end(year, month)
+    breakdowns = get_payroll_breakdowns(db, min(end, date.today()))
+
+    # Per employee: what this month's close and later ones rolled into arrears,
+    # and whether this month is closed
+    this_month = and_(PayrollPeriodClose.year == year, PayrollPeriodClose.month == month)
+    closes = {
+        row.employee_id: row
+        for row in db.execute(
+            select(
+                PayrollPeriodClose.employee_id,
+                func.sum(PayrollPeriodClose.rolled_unpaid).label("rolled_since"),
+                func.max(case((this_month, 1), else_=0)).label("closed"),
+            )
+            .where(
+                or_(
+                    PayrollPeriodClose.year > year,
+                    and_(PayrollPeriodClose.year == year, PayrollPeriodClose.month >= month),
+                )
+            )
+            .group_by(PayrollPeriodClose.employee_id)
+        )
+    }
+    payments = dict(
+        db.execute(
+            select(SalaryPayment.employee_id, func.sum(SalaryPayment.amount_paid))
+            .where(SalaryPayment.payroll_year == year, SalaryPayment.payroll_month == month)
+            .group_by(SalaryPayment.employee_id)
+        ).all()
+    )
+    names = employee_directory.get_many(db, breakdowns)
+
+    rows = []
+    for employee_id in sorted(breakdowns):
+        b = breakdowns[employee_id]
+        if b["eligible_days"] <= 0:
+            continue  # not employed yet that month
+        close = closes.get(employee_id)
+        rolled_since = float(close.rolled_since or 0) if close else 0.0
+        arrears = float(b["salary_arrears"]) - rolled_since
+        net = float(b["earned_gross_month_to_date"]) - b["bills_this_month"] - b["advances_this_month"]
+        paid = float(payments.get(employee_id) or 0)
+        record = names.get(employee_id)
+        rows.append({
+            "employee_id": employee_id,
+            "employee_name": record.full_name if record else None,
+            "role": record.role_value if record else None,
+            "base_monthly": _money(b["base_monthly"]),
+            "eligible_days": b["eligible_days"],
+            "off_days": b["off_days"],
+            "off_day_deduction": _money(b["off_day_deduction"]),
+            "earned_gross": _money(b["earned_gross_month_to_date"]),
+            "bills": _money(b["bills_this_month"]),
+            "advances": _money(b["advances_this_month"]),
+            "net_for_month": _money(net),
+            "payments": _money(paid),
+            "arrears_brought_forward": _money(arrears),
+            "balance": _money(arrears + net - paid),
+            "closed": bool(close and close.closed),
+        })
+    return rows
+
+
+def encode_register(
+    rows: list[dict[str, Any]], fmt: str, chunk_rows: int = REGISTER_CHUNK_ROWS
+) -> Iterator[bytes]:
+    columns = list(REGISTER_COLUMNS)
+    return encode_table(
+        fmt,
+        columns,
+        (
+            [tuple(row[c] for c in columns) for row in rows[i:i + chunk_rows]]
+            for i in range(0, len(rows), chunk_rows)
+        ),
+    )
+
+
+def stream_register(db: Session, year: int, month: int, fmt: str) -> Iterator[bytes]:
+    """Compute the register and yield it encoded, one chunk per batch of rows."""
+    yield from encode_register(register_rows(db, year, month), fmt)
+
+
+def cached_register(db: Session, year: int, month: int, fmt: str) -> Optional[bytes]:
+    """
+    The encoded register of a closed month (built once, then served from
+    :data:`register_cache`), or None for a month that is still open.
+    """
+    key = (year, month, fmt, register_data_version(db))
+    hit = register_cache.get(key)
+    if hit is not None:
+        return hit
+    if not month_is_closed(db, year, month):
+        return None
+    return register_cache.get_or_set(
+        key, lambda: b"".join(encode_register(register_rows(db, year, month), fmt))
+    )
@@ -0,0 +1,134 @@
+"""
+Monthly payslips for every employee, delivered as one ZIP.
+
+The figures come from one batched payroll pass (the payroll register rows,
+built on :func:`get_payroll_breakdowns`); each employee gets a plain-text and
+an HTML payslip rendered from templates parsed once at import
+(:mod:`app.utils.payslip_render`).
+
+Rendering and deflating (the two costs, roughly equal) happen together per
+employee. Batches of at least ``PAYSLIP_POOL_MIN_BATCH`` payslips go to a
+shared process pool (``PAYSLIP_RENDER_WORKERS`` processes, started once from
+a fork server so request threads are never forked); smaller ones are done
+in-process, where pool round trips would cost more than they save. So is
+whatever the pool cannot take: everything when no pool can be started, the
+rest of the batch when a worker dies part way, so a streamed ZIP is never cut
+short. The compressed entries are appended to the ZIP (:class:`ZipStream`)
+in employee order as they come back and streamed out as they are written.
+
+Closed months rarely change, so their ZIPs are served from
+:data:`payslip_cache`, keyed like the cached registers on the version of the
+tables the figures come from, so a backdated write gives a fresh build.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from calendar import monthrange
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from functools import partial
+from typing import Any, Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config.config import (
+    PAYROLL_REGISTER_CACHE_TTL_SECONDS,
+    PAYSLIP_POOL_MIN_BATCH,
+    PAYSLIP_RENDER_WORKERS,
+)
+from app.services.payroll_register_service import (
+    month_is_closed,
+    register_data_version,
+    register_rows,
+)
+from app.utils.payslip_render import payslip_entries
+from app.utils.ttl_cache import TTLCache
+from app.utils.zip_stream import DeflatedEntry, ZipStream
+
+payslip_cache = TTLCache(ttl_seconds=PAYROLL_REGISTER_CACHE_TTL_SECONDS, max_entries=12)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _render_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    if PAYSLIP_RENDER_WORKERS < 2:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _pool = ProcessPoolExecutor(max_workers=PAYSLIP_RENDER_WORKERS, mp_context=context)
+        return _pool
+
+
+def shutdown_render_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+def render_payslips(
+    rows: list[dict[str, Any]], year: int, month: int
+) -> Iterator[list[DeflatedEntry]]:
+    """
+    Deflated ZIP entries per row, in order; on the process pool for large
+    batches. If the pool cannot be started, or a worker dies part way, the
+    remaining rows are rendered in-process, so the output is always complete.
+    """
+    render = partial(payslip_entries, year=year, month=month)
+    results = None
+    if len(rows) >= PAYSLIP_POOL_MIN_BATCH:
+        try:
+            pool = _render_pool()
+            if pool is not None:
+                chunksize = max(1, len(rows) // (PAYSLIP_RENDER_WORKERS * 4))
+                results = pool.map(render, rows, chunksize=chunksize)
+        except (BrokenProcessPool, OSError, ImportError, NotImplementedError) as e:
+            # No usable process pool here (e.g. no semaphores in a serverless runtime)
+            print(f"Payslip render pool unavailable, rendering in-process: {e}")
+            shutdown_render_pool()
+    if results is None:
+        yield from map(render, rows)
+        return
+    done = 0
+    try:
+        for entries in results:
+            yield entries
+            done += 1
+    except BrokenProcessPool as e:
+        print(f"Payslip render pool failed, rendering the rest in-process: {e}")
+        shutdown_render_pool()
+        yield from map(render, rows[done:])
+
+
+def stream_payslip_zip(db: Session, year: int, month: int) -> Iterator[bytes]:
+    """
+    ZIP of ``<stem>.txt`` and ``<stem>.html`` per employee employed that month,
+    yielded employee by employee. Entries are stamped with the month's last
+    day, so the same figures always produce the same bytes.
+    """
+    rows = register_rows(db, year, month)
+    archive = ZipStream(datetime(year, month, monthrange(year, month)[1]))
+    for entries in render_payslips(rows, year, month):
+        yield b"".join(archive.add(entry) for entry in entries)
+    yield archive.finish()
+
+
+def cached_payslip_zip(db: Session, year: int, month: int) -> Optional[bytes]:
+    """
+    The payslip ZIP of a closed month (built once, then served from
+    :data:`payslip_cache`), or None for a month that is still open.
+    """
+    key = (year, month, register_data_version(db))
+    hit = payslip_cache.get(key)
+    if hit is not None:
+        return hit
+    if not month_is_closed(db, year, month):
+        return None
+    return payslip_cache.get_or_set(key, lambda: b"".join(stream_payslip_zip(db, year, month)))
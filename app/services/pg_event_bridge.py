@@ -0,0 +1,84 @@
+"""
+Postgres LISTEN/NOTIFY bridge for the event hub (multi-instance deployments).
+
+While running, writes send their events with ``pg_notify`` inside the writing
+transaction (see ``event_hub``) and a background thread on every instance
+LISTENs on the channel and publishes what arrives to its local hub, so each
+instance's SSE clients see every instance's writes exactly once.
+
+Uses a dedicated psycopg2 connection (not one borrowed from the pool) and
+reconnects with a short backoff if it drops; events sent while disconnected
+are not replayed, and clients resync on the next ``resync``/reconnect.
+"""
+from __future__ import annotations
+
+import json
+import select
+import threading
+from typing import Optional
+
+from sqlalchemy.engine import Engine
+
+from app.services.event_hub import PG_CHANNEL, EventHub, event_hub, use_pg_notify
+
+RECONNECT_DELAY_SECONDS = 2.0
+
+
+class PgEventBridge:
+    def __init__(self, engine: Engine, hub: EventHub = event_hub, channel: str = PG_CHANNEL):
+        self.engine = engine
+        self.hub = hub
+        self.channel = channel
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        use_pg_notify(True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pg-event-bridge", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        use_pg_notify(False)
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _connect(self):
+        import psycopg2
+        import psycopg2.extensions
+
+        cargs, cparams = self.engine.dialect.create_connect_args(self.engine.url)
+        conn = psycopg2.connect(*cargs, **cparams)
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cur:
+            cur.execute(f'LISTEN "{self.channel}"')
+        return conn
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                while not self._stop.is_set():
+                    if not select.select([conn], [], [], 1.0)[0]:
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        try:
+                            self.hub.publish(json.loads(notify.payload))
+                        except ValueError:
+                            print(f"Warning: ignoring malformed event payload: {notify.payload!r}")
+            except Exception as e:
+                print(f"Warning: event bridge connection failed: {e}")
+                self._stop.wait(RECONNECT_DELAY_SECONDS)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
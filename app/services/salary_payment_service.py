@@ -5,6 +5,7 @@ Records salary payments; optional payroll period tags for month close.
 from datetime import date, datetime
 from sqlalchemy.orm import Session
 from app.models.schema import Employee, SalaryPayment, Role
+from app.services.auth_service import TokenClaims, resolve_role
 from app.services.payroll_service import get_net_pay_remaining
 
 
@@ -17,22 +18,26 @@ def record_salary_payment(
     notes: str = None,
     payroll_year: int | None = None,
     payroll_month: int | None = None,
+    claims: TokenClaims | None = None,
 ) -> SalaryPayment:
     """
     Record a salary payment for an employee.
 
     If amount_paid is omitted, uses current net pay remaining (arrears + earned MTD
     minus bills and advances in the current calendar month).
+
+    ``claims`` (verified session token) supply the admin's role without a lookup
+    when they identify ``admin_id``.
     """
     employee = db.query(Employee).filter(Employee.id == employee_id).first()
     if not employee:
         raise ValueError("Employee not found")
 
-    admin = db.query(Employee).filter(Employee.id == admin_id).first()
-    if not admin:
+    admin_role = resolve_role(db, admin_id, claims)
+    if admin_role is None:
         raise ValueError("Admin not found")
 
-    if admin.role != Role.ADMIN:
+    if admin_role != Role.ADMIN:
         raise PermissionError("Only admins can record salary payments")
 
     if payment_date is None:
@@ -53,13 +58,13 @@ def record_salary_payment(
     )
 
     db.add(salary_payment)
-    employee.updated_at = datetime.now()
+    employee.updated_at = datetime.utcnow()
 
     try:
-        db.flush()
+        # INSERT ... RETURNING fills in the id; no reload unless the session expires on commit
         db.commit()
-        db.refresh(salary_payment)
-        db.refresh(employee)
+        if db.expire_on_commit:
+            db.refresh(salary_payment)
         return salary_payment
     except Exception as e:
         db.rollback()
@@ -57,7 +57,7 @@ def update_employee_used_salary(db: Session, employee_id: int) -> float:
     
     used_salary = calculate_used_salary_from_transactions(db, employee_id)
     employee.used_salary = used_salary
-    employee.updated_at = datetime.now()
+    employee.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(employee)
     
@@ -0,0 +1,201 @@
+"""
+Delta sync for offline-capable clients (the PWA).
+
+A client keeps a local copy of employees, bills, advances, off days and salary
+payments and calls ``GET /api/sync?since=<cursor>`` to receive only what
+changed: rows whose ``updated_at`` moved past its position (upserts) and ids
+recorded in ``sync_tombstone`` (deletes). Rows are the stored columns of each
+table, so clients join names locally from the synced employees.
+
+The cursor holds one keyset position ``(updated_at, id)`` per table plus the
+last tombstone id. Each table is read with an indexed range scan on
+``updated_at``, at most ``limit`` rows per call (``has_more`` says to call
+again). Rows stamped within the last ``SYNC_SETTLE_SECONDS`` are held back
+until the next call, so a transaction that commits a moment after stamping
+its rows is not skipped. Upserts are idempotent; clients may see a row twice.
+
+A sync can be scoped to one employee (their own employee row, the bills
+charged to them, their advances, off days and salary payments). The cursor
+records that scope and is rejected under any other.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from sqlalchemy import and_, event, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.config.config import SYNC_SETTLE_SECONDS
+from app.models.schema import Advance, Bill, Employee, OffDay, SalaryPayment, SyncTombstone
+
+SYNC_ENTITIES = {
+    "employees": Employee,
+    "bills": Bill,
+    "advances": Advance,
+    "off_days": OffDay,
+    "salary_payments": SalaryPayment,
+}
+_ENTITY_BY_TABLE = {model.__tablename__: name for name, model in SYNC_ENTITIES.items()}
+
+SYNC_DEFAULT_LIMIT = 500
+SYNC_MAX_LIMIT = 5000
+
+# Columns clients do not get (internal bookkeeping)
+_EXCLUDED_COLUMNS = {"employees": {"used_salary"}}
+
+# The employee each row belongs to, for syncs scoped to one employee
+_OWNER_COLUMNS = {
+    "employees": Employee.__table__.c.id,
+    "bills": Bill.__table__.c.billed_employee_id,
+    "advances": Advance.__table__.c.employee_id,
+    "off_days": OffDay.__table__.c.employee_id,
+    "salary_payments": SalaryPayment.__table__.c.employee_id,
+}
+
+Position = tuple[Optional[datetime], int]
+
+
+def encode_cursor(
+    positions: dict[str, Position], tombstone_id: int, employee_id: Optional[int] = None
+) -> str:
+    raw = {
+        "p": {
+            name: [ts.isoformat() if ts else None, row_id]
+            for name, (ts, row_id) in positions.items()
+        },
+        "t": tombstone_id,
+        "e": employee_id,
+    }
+    data = json.dumps(raw, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def decode_cursor(
+    cursor: Optional[str], employee_id: Optional[int] = None
+) -> tuple[dict[str, Position], int]:
+    """
+    Raises:
+        ValueError: if the cursor was not produced by :func:`encode_cursor`, or
+            for a sync with a different ``employee_id`` scope
+    """
+    if not cursor:
+        return {name: (None, 0) for name in SYNC_ENTITIES}, 0
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        positions = {}
+        for name in SYNC_ENTITIES:
+            ts, row_id = raw["p"].get(name, (None, 0))
+            positions[name] = (datetime.fromisoformat(ts) if ts else None, int(row_id))
+        tombstone_id, scope = int(raw["t"]), raw.get("e")
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise ValueError("Invalid sync cursor.") from e
+    if scope != employee_id:
+        raise ValueError("Sync cursor belongs to another user. Start a full sync.")
+    return positions, tombstone_id
+
+
+def _plain(value: Any) -> Any:
+    return value.value if hasattr(value, "value") else value
+
+
+def _changed_rows(
+    db: Session,
+    name: str,
+    position: Position,
+    horizon: datetime,
+    limit: int,
+    employee_id: Optional[int] = None,
+):
+    model = SYNC_ENTITIES[name]
+    excluded = _EXCLUDED_COLUMNS.get(name, set())
+    columns = [c for c in model.__table__.columns if c.name not in excluded]
+    updated_at, row_id = model.__table__.c.updated_at, model.__table__.c.id
+    stmt = (
+        select(*columns)
+        .where(updated_at.is_not(None), updated_at <= horizon)
+        .order_by(updated_at, row_id)
+        .limit(limit + 1)
+    )
+    if employee_id is not None:
+        stmt = stmt.where(_OWNER_COLUMNS[name] == employee_id)
+    ts, last_id = position
+    if ts is not None:
+        stmt = stmt.where(
+            or_(updated_at > ts, and_(updated_at == ts, row_id > last_id))
+        )
+    rows = db.execute(stmt).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    out = [{k: _plain(v) for k, v in row._mapping.items()} for row in rows]
+    new_position = (rows[-1].updated_at, rows[-1].id) if rows else position
+    return out, new_position, has_more
+
+
+def get_changes(
+    db: Session,
+    since: Optional[str] = None,
+    limit: int = SYNC_DEFAULT_LIMIT,
+    now: Optional[datetime] = None,
+    employee_id: Optional[int] = None,
+) -> dict[str, Any]:
+    """
+    Changes since ``since`` (everything when None), at most ``limit`` upserts
+    per table; only ``employee_id``'s own rows when given. Raises ValueError
+    for a malformed cursor or one from a sync with another scope.
+    """
+    limit = max(1, min(int(limit), SYNC_MAX_LIMIT))
+    positions, tombstone_id = decode_cursor(since, employee_id)
+    horizon = (now or datetime.utcnow()) - timedelta(seconds=SYNC_SETTLE_SECONDS)
+
+    changes: dict[str, dict[str, list]] = {}
+    has_more = False
+    for name in SYNC_ENTITIES:
+        rows, positions[name], more = _changed_rows(
+            db, name, positions[name], horizon, limit, employee_id
+        )
+        changes[name] = {"upserted": rows, "deleted": []}
+        has_more = has_more or more
+
+    if since:  # a first sync has nothing to delete
+        tombstones = db.execute(
+            select(SyncTombstone.id, SyncTombstone.table_name, SyncTombstone.row_id)
+            .where(SyncTombstone.id > tombstone_id)
+            .order_by(SyncTombstone.id)
+        ).all()
+    else:
+        tombstones = []
+        tombstone_id = db.execute(
+            select(SyncTombstone.id).order_by(SyncTombstone.id.desc()).limit(1)
+        ).scalar() or 0
+    for t in tombstones:
+        name = _ENTITY_BY_TABLE.get(t.table_name)
+        if name is not None:
+            changes[name]["deleted"].append(t.row_id)
+        tombstone_id = t.id
+
+    return {
+        "cursor": encode_cursor(positions, tombstone_id, employee_id),
+        "has_more": has_more,
+        "changes": changes,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Tombstones for ORM deletes (same transaction as the delete)
+# ---------------------------------------------------------------------------
+
+def _record_tombstone(mapper, connection, target) -> None:
+    connection.execute(
+        insert(SyncTombstone).values(
+            table_name=mapper.local_table.name,
+            row_id=target.id,
+            deleted_at=datetime.utcnow(),
+        )
+    )
+
+
+for _model in SYNC_ENTITIES.values():
+    event.listen(_model, "after_delete", _record_tombstone)
@@ -0,0 +1,145 @@
+"""
+Employee activity timeline: advances, off days, bills and salary payments.
+
+One ``UNION ALL`` of the four tables, filtered to the employee, with a single
+``ORDER BY ... LIMIT`` in the database. Paging is keyset-based: the cursor is
+the ``(occurred_at, kind, id)`` of the last item returned, so every page is
+the same cheap query however deep the history goes.
+
+Off days and salary payments carry a calendar date, advances and bills a
+timestamp. All four are normalised to one timestamp expression per dialect
+(``datetime()`` text on SQLite, a ``TIMESTAMP`` cast elsewhere) so they sort
+and compare against the cursor consistently.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import DateTime, Float, String, cast, func, literal, select, tuple_, type_coerce, union_all
+from sqlalchemy.orm import Session
+
+from app.models.schema import Advance, Bill, OffDay, SalaryPayment
+
+TIMELINE_MAX_LIMIT = 100
+TIMELINE_KINDS = ("advance", "off_day", "bill", "salary_payment")
+
+Item = dict[str, Any]
+
+
+def _timestamp(expr, dialect: str):
+    if dialect == "sqlite":
+        return type_coerce(func.datetime(expr), DateTime)
+    return cast(expr, DateTime)
+
+
+def _status(column):
+    # Enum columns store the member name (PENDING); the API uses the value (pending)
+    return func.lower(cast(column, String))
+
+
+def _branches(employee_id: int, dialect: str) -> dict:
+    ts = lambda expr: _timestamp(expr, dialect)  # noqa: E731
+    selects = [
+        select(
+            literal("advance", String).label("kind"),
+            Advance.id.label("id"),
+            _status(Advance.status).label("status"),
+            cast(Advance.amount_for_advance, Float).label("amount"),
+            Advance.reason.label("reason"),
+            ts(Advance.created_at).label("occurred_at"),
+        ).where(Advance.employee_id == employee_id),
+        select(
+            literal("off_day", String),
+            OffDay.id,
+            _status(OffDay.status),
+            literal(0.0, Float),
+            OffDay.reason,
+            ts(OffDay.date),
+        ).where(OffDay.employee_id == employee_id),
+        select(
+            literal("bill", String),
+            Bill.id,
+            literal("recorded", String),
+            cast(Bill.amount_billed, Float),
+            Bill.reason,
+            ts(Bill.date),
+        ).where(Bill.billed_employee_id == employee_id),
+        select(
+            literal("salary_payment", String),
+            SalaryPayment.id,
+            literal("paid", String),
+            cast(SalaryPayment.amount_paid, Float),
+            SalaryPayment.notes,
+            ts(SalaryPayment.payment_date),
+        ).where(SalaryPayment.employee_id == employee_id),
+    ]
+    return dict(zip(TIMELINE_KINDS, selects))
+
+
+def encode_cursor(item: Item) -> str:
+    raw = json.dumps([item["date"].isoformat(), item["kind"], item["id"]])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str, int]:
+    """
+    Raises:
+        ValueError: if the cursor was not produced by :func:`encode_cursor`
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        occurred_at, kind, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(occurred_at), str(kind), int(item_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid timeline cursor.") from e
+
+
+def get_timeline(
+    db: Session,
+    employee_id: int,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    kinds: Iterable[str] = TIMELINE_KINDS,
+) -> tuple[list[Item], Optional[str]]:
+    """
+    Newest-first activity for one employee, restricted to ``kinds``.
+
+    Returns:
+        (items, next_cursor); ``next_cursor`` is None on the last page
+    """
+    limit = max(1, min(int(limit), TIMELINE_MAX_LIMIT))
+    dialect = db.get_bind().dialect.name
+    branches = _branches(employee_id, dialect)
+    selects = [branches[k] for k in TIMELINE_KINDS if k in set(kinds)]
+    if not selects:
+        return [], None
+    timeline = (selects[0] if len(selects) == 1 else union_all(*selects)).subquery("timeline")
+
+    stmt = select(timeline).order_by(
+        timeline.c.occurred_at.desc(), timeline.c.kind.desc(), timeline.c.id.desc()
+    )
+    if cursor:
+        after_ts, after_kind, after_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(timeline.c.occurred_at, timeline.c.kind, timeline.c.id)
+            < tuple_(_timestamp(literal(after_ts, DateTime), dialect), literal(after_kind), literal(after_id))
+        )
+    # One extra row tells us whether another page exists
+    rows = db.execute(stmt.limit(limit + 1)).all()
+
+    items = [
+        {
+            "id": r.id,
+            "kind": r.kind,
+            "status": r.status,
+            "amount": float(r.amount or 0),
+            "reason": r.reason,
+            "date": r.occurred_at,
+        }
+        for r in rows[:limit]
+    ]
+    next_cursor = encode_cursor(items[-1]) if len(rows) > limit else None
+    return items, next_cursor
@@ -7,10 +7,12 @@ from .attendance import (
     update_employee_attendance,
     calculate_off_days_in_range,
 )
+from .name_map import EmployeeNameMap
 
 __all__ = [
     'calculate_days_worked_this_month',
     'calculate_total_days_worked',
     'update_employee_attendance',
     'calculate_off_days_in_range',
+    'EmployeeNameMap',
 ]
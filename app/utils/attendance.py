@@ -1,12 +1,35 @@
 """
 Utility functions for calculating employee attendance and days worked.
 """
-from datetime import date, datetime
-from typing import List
+from datetime import date, datetime, timedelta
+from typing import Iterable, List
 from sqlalchemy.orm import Session
 from app.models.schema import Employee, OffDay, OffDayStatus
 
 
+def off_day_overlap(
+    off_date: date,
+    day_count: int,
+    off_type: str,
+    start_date: date,
+    end_date: date
+) -> float:
+    """
+    Days of one off day request (``off_date`` .. ``off_date + day_count - 1``)
+    that fall within ``start_date`` .. ``end_date`` inclusive.
+    Half days count as 0.5, full days count as 1.0.
+    """
+    off_day_end = off_date + timedelta(days=day_count - 1)
+
+    # Overlap exists if: off_date <= end_date AND off_day_end >= start_date
+    if off_date > end_date or off_day_end < start_date:
+        return 0.0
+
+    overlap_days = (min(off_day_end, end_date) - max(off_date, start_date)).days + 1
+    day_value = 0.5 if off_type == "half" else 1.0
+    return day_value * overlap_days
+
+
 def calculate_off_days_in_range(
     db: Session,
     employee_id: int,
@@ -28,8 +51,6 @@ def calculate_off_days_in_range(
     Returns:
         Total off days as float (handles half days)
     """
-    from datetime import timedelta
-    
     # Get all approved off days for this employee that might overlap with the range
     # An off day request spans from off_day.date to off_day.date + day_count - 1
     # We need to find off days where the range overlaps with our target range
@@ -40,25 +61,9 @@ def calculate_off_days_in_range(
     
     total_off_days = 0.0
     for off_day in off_days:
-        # Calculate the end date of this off day request
-        off_day_start = off_day.date
-        off_day_end = off_day_start + timedelta(days=off_day.day_count - 1)
-        
-        # Check if this off day request overlaps with our target range
-        # Overlap exists if: off_day_start <= end_date AND off_day_end >= start_date
-        if off_day_start <= end_date and off_day_end >= start_date:
-            # Calculate the overlapping range
-            overlap_start = max(off_day_start, start_date)
-            overlap_end = min(off_day_end, end_date)
-            
-            # Count days in the overlap (inclusive)
-            overlap_days = (overlap_end - overlap_start).days + 1
-            
-            # Calculate days for this off day request
-            # If it's a half day, count as 0.5 per day, otherwise 1.0 per day
-            day_value = 0.5 if off_day.off_type == "half" else 1.0
-            total_off_days += day_value * overlap_days
-    
+        total_off_days += off_day_overlap(
+            off_day.date, off_day.day_count, off_day.off_type, start_date, end_date
+        )
     return total_off_days
 
 
@@ -151,6 +156,63 @@ def calculate_total_days_worked(
     return max(0, days_worked)  # Ensure non-negative
 
 
+def calculate_attendance_many(
+    db: Session,
+    employees: Iterable,
+    reference_date: date = None
+) -> dict:
+    """
+    Batch form of :func:`calculate_days_worked_this_month` and
+    :func:`calculate_total_days_worked` for many employees, with one off-day
+    query in total and nothing written back.
+
+    Args:
+        db: Database session
+        employees: Employees or rows with ``id`` and ``employment_start_date``
+        reference_date: Date to calculate up to (defaults to today)
+
+    Returns:
+        ``{employee_id: {"days_worked_this_month": int, "total_days_worked": int}}``
+    """
+    if reference_date is None:
+        reference_date = date.today()
+    month_start = date(reference_date.year, reference_date.month, 1)
+    end_date = min(reference_date, date.today())
+    employees = list(employees)
+
+    off_days_by_employee = {}
+    if employees:
+        rows = db.query(
+            OffDay.employee_id, OffDay.date, OffDay.day_count, OffDay.off_type
+        ).filter(
+            OffDay.employee_id.in_({e.id for e in employees}),
+            OffDay.status == OffDayStatus.APPROVED,
+            OffDay.date <= end_date,
+        )
+        for row in rows:
+            off_days_by_employee.setdefault(row.employee_id, []).append(row)
+
+    def days_worked(start_date, off_days):
+        if start_date > end_date:
+            return 0
+        total_days = (end_date - start_date).days + 1
+        off = sum(
+            off_day_overlap(o.date, o.day_count, o.off_type, start_date, end_date)
+            for o in off_days
+        )
+        return max(0, int(round(total_days - off)))
+
+    result = {}
+    for employee in employees:
+        off_days = off_days_by_employee.get(employee.id, ())
+        start_date = employee.employment_start_date
+        result[employee.id] = {
+            "days_worked_this_month": days_worked(max(month_start, start_date), off_days),
+            "total_days_worked": days_worked(start_date, off_days),
+        }
+    return result
+
+
 def recompute_all_employees_attendance(
     db: Session,
     reference_date: date = None,
@@ -160,12 +222,18 @@ def recompute_all_employees_attendance(
     using the same calendar-days-minus-approved-off-days rules as
     :func:`update_employee_attendance`. Use this from the daily batch job so stored
     counters stay consistent with API refresh / off-day approval paths.
+
+    One off-day query for everyone (:func:`calculate_attendance_many`) and one
+    commit for the whole run.
     """
     if reference_date is None:
         reference_date = date.today()
     employees = db.query(Employee).all()
+    attendance = calculate_attendance_many(db, employees, reference_date)
     for employee in employees:
-        update_employee_attendance(db, employee, reference_date)
+        employee.days_worked_this_month = attendance[employee.id]["days_worked_this_month"]
+        employee.total_days_worked = attendance[employee.id]["total_days_worked"]
+    db.commit()
     return {
         "total_employees": len(employees),
         "recomputed": len(employees),
@@ -175,7 +243,8 @@ def recompute_all_employees_attendance(
 def update_employee_attendance(
     db: Session,
     employee: Employee,
-    reference_date: date = None
+    reference_date: date = None,
+    commit: bool = True,
 ) -> Employee:
     """
     Update the days_worked_this_month and total_days_worked fields for an employee.
@@ -184,16 +253,17 @@ def update_employee_attendance(
         db: Database session
         employee: Employee object
         reference_date: Date to calculate from (defaults to today)
+        commit: False to leave the commit to the caller's transaction
     
     Returns:
         Updated employee object
     """
-    employee.days_worked_this_month = calculate_days_worked_this_month(
-        db, employee, reference_date
-    )
-    employee.total_days_worked = calculate_total_days_worked(
-        db, employee, reference_date
-    )
-    db.commit()
-    db.refresh(employee)
+    # Both counters from one off-day query
+    attendance = calculate_attendance_many(db, [employee], reference_date)[employee.id]
+    employee.days_worked_this_month = attendance["days_worked_this_month"]
+    employee.total_days_worked = attendance["total_days_worked"]
+    if commit:
+        db.commit()
+        if db.expire_on_commit:
+            db.refresh(employee)
     return employee
@@ -0,0 +1,268 @@
+"""
+Response compression and precompressed static assets.
+
+:class:`CompressionMiddleware` negotiates ``br`` (when the optional ``brotli``
+package is installed) or ``gzip`` from ``Accept-Encoding`` and compresses
+text-like responses (JSON listings, CSV/NDJSON exports, HTML) once they reach
+``minimum_size`` bytes. Streamed bodies are compressed chunk by chunk; server-
+sent events and responses that already carry a ``Content-Encoding`` pass
+through untouched. ETags are left as they are: they are derived from data
+versions, and ``Vary: Accept-Encoding`` keeps cached encodings apart.
+
+:class:`PrecompressedStaticFiles` serves the ``.br`` / ``.gz`` siblings that
+``scripts/precompress_static.py`` writes next to the hashed dashboard bundles,
+so those are compressed once at build time instead of on every request.
+Hashed bundles never change under the same name and are cached as
+``immutable`` for a year; every other static file is revalidated.
+"""
+from __future__ import annotations
+
+import os
+import re
+import zlib
+from mimetypes import guess_type
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional speed-up
+    brotli = None
+
+# Vite output: assets/<name>-<8 char content hash>.<ext>. Keep in sync with
+# scripts/precompress_static.py (which runs without the app's dependencies).
+HASHED_ASSET_PATTERN = r"(^|/)assets/[^/]+-[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$"
+_HASHED_ASSET_RE = re.compile(HASHED_ASSET_PATTERN)
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+COMPRESSIBLE_TYPES = frozenset({
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/manifest+json",
+    "application/xml",
+    "image/svg+xml",
+    "text/css",
+    "text/csv",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+    "text/xml",
+})
+
+# Server preference when the client weighs encodings equally
+_PREFERENCE = ("br", "gzip")
+# Precompressed sibling suffix per encoding
+_SUFFIX = {"br": ".br", "gzip": ".gz"}
+
+
+def available_encodings() -> tuple[str, ...]:
+    return _PREFERENCE if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: Optional[str], offered) -> Optional[str]:
+    """Best of ``offered`` for an ``Accept-Encoding`` header (q-values honoured), or None."""
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            weights[name] = q
+    best, best_q = None, 0.0
+    for encoding in offered:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_hashed_asset(path: str) -> bool:
+    return _HASHED_ASSET_RE.search(path.replace(os.sep, "/")) is not None
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._impl = brotli.Compressor(quality=brotli_quality)
+            self.compress, self._finish = self._impl.process, self._impl.finish
+        else:
+            # wbits 31: gzip container
+            self._impl = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self.compress, self._finish = self._impl.compress, self._impl.flush
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware, so streamed bodies are compressed as they go (not buffered)."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(
+            Headers(scope=scope).get("accept-encoding"), available_encodings()
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressingResponder(self, encoding, send).run(scope, receive)
+
+
+class _CompressingResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+        # Leading chunks held back until minimum_size is reached (or the body ends)
+        self.buffered: list[bytes] = []
+        self.buffered_size = 0
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.send_wrapper)
+
+    def _compressible(self, headers: MutableHeaders) -> bool:
+        if self.start["status"] in (204, 206, 304) or "content-encoding" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", ""):
+            return False
+        media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return media_type in COMPRESSIBLE_TYPES
+
+    def _mark_encoded(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if "content-length" in headers:
+            del headers["content-length"]
+
+    async def _pass_through(self, headers: MutableHeaders, message: Message) -> None:
+        self.passthrough = True
+        if headers.get("content-type", "").split(";")[0].strip() in COMPRESSIBLE_TYPES:
+            headers.add_vary_header("Accept-Encoding")
+        if self.buffered:
+            message = {**message, "body": b"".join(self.buffered) + message.get("body", b"")}
+            self.buffered = []
+        await self.send(self.start)
+        await self.send(message)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if self.passthrough:
+            await self.send(message)
+            return
+        if self.compressor is not None:
+            more_body = message.get("more_body", False)
+            data = self.compressor.compress(message.get("body", b""))
+            if not more_body:
+                data += self.compressor.finish()
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        # Until decided: buffer small leading chunks (wrapping middlewares re-chunk bodies)
+        headers = MutableHeaders(raw=self.start["headers"])
+        minimum_size = self.middleware.minimum_size
+        declared = headers.get("content-length")
+        if (
+            message["type"] != "http.response.body"
+            or not self._compressible(headers)
+            or (declared is not None and declared.isdigit() and int(declared) < minimum_size)
+        ):
+            await self._pass_through(headers, message)
+            return
+
+        more_body = message.get("more_body", False)
+        self.buffered.append(message.get("body", b""))
+        self.buffered_size += len(self.buffered[-1])
+        if more_body and self.buffered_size < minimum_size:
+            return
+        body = b"".join(self.buffered)
+        self.buffered = []
+        if not more_body and len(body) < minimum_size:
+            await self._pass_through(
+                headers, {"type": "http.response.body", "body": body, "more_body": False}
+            )
+            return
+
+        self.compressor = _Compressor(
+            self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+        )
+        self._mark_encoded(headers)
+        data = self.compressor.compress(body)
+        if not more_body:
+            data += self.compressor.finish()
+            headers["Content-Length"] = str(len(data))
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that prefers a ``.br`` / ``.gz`` sibling the client accepts."""
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = os.fspath(full_path)
+        hashed = is_hashed_asset(full_path)
+        headers = {
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL if hashed else REVALIDATE_CACHE_CONTROL
+        }
+
+        served_path, served_stat = full_path, stat_result
+        if hashed:
+            offered = [e for e in _PREFERENCE if os.path.exists(full_path + _SUFFIX[e])]
+            encoding = negotiate(request_headers.get("accept-encoding"), offered)
+            if offered:
+                headers["Vary"] = "Accept-Encoding"
+            if encoding is not None:
+                served_path = full_path + _SUFFIX[encoding]
+                served_stat = os.stat(served_path)
+                headers["Content-Encoding"] = encoding
+
+        response = FileResponse(
+            served_path,
+            status_code=status_code,
+            stat_result=served_stat,
+            media_type=guess_type(full_path)[0] or "text/plain",
+            headers=headers,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,49 @@
+"""
+Strong ETags for dashboard read endpoints, derived from per-table change versions.
+
+A table's version is ``(row count, max(updated_at))``: every ORM insert or
+update moves ``updated_at`` and deletes move the count. All versions a
+response depends on are read in one ``UNION ALL`` round trip, which is far
+cheaper than re-running the payroll or listing computation, so an
+``If-None-Match`` hit can answer ``304`` before any of that work starts.
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Iterable
+
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+
+def table_versions(db: Session, *models) -> list[tuple[str, int, str]]:
+    """``(table, row_count, max_updated_at)`` for each model, in one query."""
+    selects = [
+        select(
+            literal(model.__tablename__).label("table_name"),
+            func.count().label("row_count"),
+            func.max(model.updated_at).label("last_updated"),
+        ).select_from(model)
+        for model in models
+    ]
+    stmt = selects[0] if len(selects) == 1 else union_all(*selects)
+    rows = db.execute(stmt).all()
+    return sorted((name, int(count or 0), str(last)) for name, count, last in rows)
+
+
+def compute_etag(db: Session, *models, extra: Iterable[str] = ()) -> str:
+    """Strong ETag over the table versions plus any request-specific parts."""
+    parts = [f"{name}:{count}:{last}" for name, count, last in table_versions(db, *models)]
+    parts.extend(str(x) for x in extra)
+    digest = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """``If-None-Match`` comparison (weak comparison, as RFC 9110 requires for it)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (c.strip() for c in if_none_match.split(","))
+    return any(c.removeprefix("W/") == etag for c in candidates)
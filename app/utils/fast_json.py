@@ -0,0 +1,48 @@
+"""
+Fast JSON responses for large list payloads.
+
+Listing and reporting endpoints build plain dict rows straight from Core
+queries (their keys match the documented ``*Out`` models) and hand them to
+:class:`FastJSONResponse`. Returning a Response skips FastAPI's second
+``response_model`` validation pass, and rows are encoded once with orjson
+when it is installed (stdlib ``json`` otherwise).
+"""
+from __future__ import annotations
+
+import enum
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that serializes rows once with the fastest available encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
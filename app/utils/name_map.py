@@ -0,0 +1,44 @@
+"""
+Request-scoped employee id → display name lookups.
+
+Listing endpoints collect the employee ids they need (employee, paid_by,
+recorded_by, ...) and resolve them in bulk instead of one
+``query(Employee).get()`` per row. Lookups read through the process-wide
+employee directory, so a warm directory answers without any query.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+
+class EmployeeNameMap:
+    """Caches "First Last" per employee id for the lifetime of one request."""
+
+    def __init__(self, db: Session):
+        self._db = db
+        self._names: dict[int, Optional[str]] = {}
+
+    def load(self, employee_ids: Iterable[int | None]) -> None:
+        """Resolve every id not seen yet; only directory misses reach the database."""
+        from app.services.employee_directory import employee_directory
+
+        missing = {i for i in employee_ids if i is not None and i not in self._names}
+        if not missing:
+            return
+        records = employee_directory.get_many(self._db, missing)
+        for emp_id in missing:
+            # Remember misses too, so a dangling id is not re-queried
+            rec = records.get(emp_id)
+            self._names[emp_id] = rec.full_name if rec else None
+
+    def exists(self, employee_id: int) -> bool:
+        self.load([employee_id])
+        return self._names.get(employee_id) is not None
+
+    def name(self, employee_id: int | None, default: str = "Unknown") -> str:
+        if employee_id is None:
+            return default
+        self.load([employee_id])
+        return self._names.get(employee_id) or default
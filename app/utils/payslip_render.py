@@ -0,0 +1,105 @@
+"""
+Payslip templates (plain text and HTML).
+
+Templates are parsed once at import; :func:`render_payslip` only substitutes
+fields. :func:`payslip_entries` also deflates the result into ZIP entries.
+Both are pure functions of a payroll register row, so they can run in
+process-pool workers.
+"""
+from __future__ import annotations
+
+import html
+import re
+from calendar import month_name
+from string import Template
+from typing import Any
+
+from app.utils.zip_stream import DeflatedEntry, deflate_entry
+
+_TEXT = Template("""\
+PAYSLIP - $period
+$name (employee #$employee_id, $role)
+
+Base monthly salary          KSH $base_monthly
+Eligible days                $eligible_days
+Off days                     $off_days
+Off-day deduction            KSH $off_day_deduction
+Earned gross                 KSH $earned_gross
+Bills                      - KSH $bills
+Advances                   - KSH $advances
+Net for the month            KSH $net_for_month
+Payments received          - KSH $payments
+Arrears brought forward      KSH $arrears_brought_forward
+Balance                      KSH $balance
+""")
+
+_HTML = Template("""\
+<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>Payslip $period - $name</title></head>
+<body style="font-family:system-ui,sans-serif;color:#0f172a;max-width:560px;margin:24px auto">
+<h1 style="font-size:20px;margin:0">Payslip &middot; $period</h1>
+<p style="margin:4px 0 16px;color:#475569">$name &middot; employee #$employee_id &middot; $role</p>
+<table style="width:100%;border-collapse:collapse">
+<tr><td>Base monthly salary</td><td style="text-align:right">KSH $base_monthly</td></tr>
+<tr><td>Eligible days</td><td style="text-align:right">$eligible_days</td></tr>
+<tr><td>Off days</td><td style="text-align:right">$off_days</td></tr>
+<tr><td>Off-day deduction</td><td style="text-align:right">KSH $off_day_deduction</td></tr>
+<tr><td>Earned gross</td><td style="text-align:right">KSH $earned_gross</td></tr>
+<tr><td>Bills</td><td style="text-align:right">&minus; KSH $bills</td></tr>
+<tr><td>Advances</td><td style="text-align:right">&minus; KSH $advances</td></tr>
+<tr style="border-top:1px solid #cbd5e1"><td><b>Net for the month</b></td><td style="text-align:right"><b>KSH $net_for_month</b></td></tr>
+<tr><td>Payments received</td><td style="text-align:right">&minus; KSH $payments</td></tr>
+<tr><td>Arrears brought forward</td><td style="text-align:right">KSH $arrears_brought_forward</td></tr>
+<tr style="border-top:1px solid #cbd5e1"><td><b>Balance</b></td><td style="text-align:right"><b>KSH $balance</b></td></tr>
+</table>
+</body>
+</html>
+""")
+
+_MONEY_FIELDS = (
+    "base_monthly",
+    "off_day_deduction",
+    "earned_gross",
+    "bills",
+    "advances",
+    "net_for_month",
+    "payments",
+    "arrears_brought_forward",
+    "balance",
+)
+
+
+def payslip_stem(row: dict[str, Any], year: int, month: int) -> str:
+    """File name (without extension) for an employee's payslip."""
+    slug = re.sub(r"[^a-z0-9]+", "-", (row.get("employee_name") or "").lower()).strip("-")
+    return f"payslip-{year}-{month:02d}-{row['employee_id']:05d}" + (f"-{slug}" if slug else "")
+
+
+def render_payslip(row: dict[str, Any], year: int, month: int) -> tuple[str, str, str]:
+    """
+    Render one payslip from a payroll register row.
+
+    Returns:
+        ``(file stem, plain text, HTML)``
+    """
+    fields = {
+        "period": f"{month_name[month]} {year}",
+        "name": row.get("employee_name") or f"Employee {row['employee_id']}",
+        "employee_id": row["employee_id"],
+        "role": row.get("role") or "",
+        "eligible_days": row["eligible_days"],
+        "off_days": f"{row['off_days']:g}",
+    }
+    fields.update({key: f"{row[key]:,.2f}" for key in _MONEY_FIELDS})
+    escaped = {key: html.escape(str(value)) for key, value in fields.items()}
+    return payslip_stem(row, year, month), _TEXT.substitute(fields), _HTML.substitute(escaped)
+
+
+def payslip_entries(row: dict[str, Any], year: int, month: int) -> list[DeflatedEntry]:
+    """The ``.txt`` and ``.html`` payslip of one employee, deflated for a ZIP."""
+    stem, text, html_body = render_payslip(row, year, month)
+    return [
+        deflate_entry(f"{stem}.txt", text.encode("utf-8")),
+        deflate_entry(f"{stem}.html", html_body.encode("utf-8")),
+    ]
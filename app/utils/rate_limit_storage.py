@@ -0,0 +1,232 @@
+"""
+SQLite-backed storage for the ``limits`` / slowapi rate limiter.
+
+Importing this module registers the ``sqlite://`` scheme, so the limiter can be
+configured with ``RATE_LIMIT_STORAGE_URI=sqlite:////var/run/app/limits.db`` and
+every uvicorn worker on the host shares one set of counters (the default
+``memory://`` store is per process). Use ``redis://`` when instances do not
+share a filesystem.
+
+Counters back both the fixed-window and the sliding-window-counter strategies.
+A sliding-window check is a single ``BEGIN IMMEDIATE`` transaction: read the
+previous and current window counters, and bump the current one only when the
+weighted count still fits. Holding the write lock across the read makes the
+check exact across processes, so no optimistic increment/rollback is needed.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from math import floor
+from urllib.parse import urlparse
+
+from limits.storage.base import (
+    SlidingWindowCounterSupport,
+    Storage,
+    TimestampedSlidingWindow,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limit_counter (
+    key TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+# Expired counters are swept every this many writes (per process)
+PURGE_EVERY = 1000
+
+
+def _path_from_uri(uri: str) -> str:
+    """
+    ``sqlite:///rel.db`` → ``rel.db``; ``sqlite:////abs.db`` → ``/abs.db``; ``sqlite://`` → memory.
+
+    Raises:
+        ValueError: for a host part (``sqlite://rel/limits.db``), which is not a path
+    """
+    parsed = urlparse(uri)
+    if parsed.netloc:
+        raise ValueError(
+            f"Invalid rate-limit storage URI {uri!r}: use sqlite:///relative.db or sqlite:////absolute.db"
+        )
+    return parsed.path[1:] or ":memory:"
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """Rate-limit counters in a local SQLite file shared by every process on the host."""
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: str = "sqlite://", wrap_exceptions: bool = False, **options):
+        self.path = _path_from_uri(uri)
+        self.timeout = float(options.get("timeout", 5.0))
+        self._local = threading.local()
+        self._writes = 0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        if self.path == ":memory:":
+            # One connection for all threads, or each would see its own empty database
+            self._shared = self._connect(check_same_thread=False)
+            self._shared_lock = threading.Lock()
+        else:
+            self._shared = None
+            with self._transaction() as conn:
+                conn.execute(_SCHEMA)
+
+    @property
+    def base_exceptions(self) -> type[Exception] | tuple[type[Exception], ...]:
+        return sqlite3.Error
+
+    # -- connections -----------------------------------------------------------
+
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            isolation_level=None,  # explicit BEGIN/COMMIT below
+            check_same_thread=check_same_thread,
+        )
+        if self.path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(_SCHEMA)
+        return conn
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    class _Transaction:
+        def __init__(self, storage: "SQLiteStorage"):
+            self.storage = storage
+
+        def __enter__(self) -> sqlite3.Connection:
+            storage = self.storage
+            if storage._shared is not None:
+                storage._shared_lock.acquire()
+                self.conn = storage._shared
+            else:
+                self.conn = storage._conn()
+            self.conn.execute("BEGIN IMMEDIATE")
+            return self.conn
+
+        def __exit__(self, exc_type, exc, tb):
+            try:
+                self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+            finally:
+                if self.storage._shared is not None:
+                    self.storage._shared_lock.release()
+
+    def _transaction(self) -> "SQLiteStorage._Transaction":
+        return SQLiteStorage._Transaction(self)
+
+    # -- counters --------------------------------------------------------------
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection, key: str, now: float) -> int:
+        row = conn.execute(
+            "SELECT count FROM rate_limit_counter WHERE key = ? AND expires_at > ?",
+            (key, now),
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _incr(self, conn: sqlite3.Connection, key: str, expiry: float, amount: int, now: float) -> int:
+        # An expired counter restarts (count and expiry), a live one keeps its expiry
+        (count,) = conn.execute(
+            """
+            INSERT INTO rate_limit_counter (key, count, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT (key) DO UPDATE SET
+                count = CASE WHEN expires_at <= ? THEN excluded.count
+                             ELSE count + excluded.count END,
+                expires_at = CASE WHEN expires_at <= ? THEN excluded.expires_at
+                                  ELSE expires_at END
+            RETURNING count
+            """,
+            (key, amount, now + expiry, now, now),
+        ).fetchone()
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            conn.execute("DELETE FROM rate_limit_counter WHERE expires_at <= ?", (now,))
+        return count
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        with self._transaction() as conn:
+            return self._incr(conn, key, expiry, amount, time.time())
+
+    def get(self, key: str) -> int:
+        with self._transaction() as conn:
+            return self._count(conn, key, time.time())
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT expires_at FROM rate_limit_counter WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+        return row[0] if row else now
+
+    def check(self) -> bool:
+        try:
+            with self._transaction() as conn:
+                conn.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int | None:
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM rate_limit_counter").rowcount
+
+    def clear(self, key: str) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM rate_limit_counter WHERE key = ?", (key,))
+
+    # -- sliding window counter -----------------------------------------------
+
+    def _window(
+        self, conn: sqlite3.Connection, key: str, expiry: int, now: float
+    ) -> tuple[int, float, int, float]:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous_count = self._count(conn, previous_key, now)
+        current_count = self._count(conn, current_key, now)
+        if previous_count == 0:
+            previous_ttl = 0.0
+        else:
+            previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
+
+    def acquire_sliding_window_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        with self._transaction() as conn:
+            previous_count, previous_ttl, current_count, _ = self._window(conn, key, expiry, now)
+            weighted = previous_count * previous_ttl / expiry + current_count
+            if floor(weighted) + amount > limit:
+                return False
+            _, current_key = self.sliding_window_keys(key, expiry, now)
+            # The current window's counter must outlive the next window, where it is "previous"
+            self._incr(conn, current_key, 2 * expiry, amount, now)
+            return True
+
+    def get_sliding_window(self, key: str, expiry: int) -> tuple[int, float, int, float]:
+        with self._transaction() as conn:
+            return self._window(conn, key, expiry, time.time())
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM rate_limit_counter WHERE key IN (?, ?)",
+                (previous_key, current_key),
+            )
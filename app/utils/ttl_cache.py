@@ -0,0 +1,62 @@
+"""
+Small process-wide TTL cache for computed read models (dashboards, reports).
+
+Values are recomputed at most once per ``ttl_seconds`` per key; concurrent
+misses on the same key wait for the first computation instead of repeating it.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+
+class TTLCache:
+    def __init__(self, ttl_seconds: float, max_entries: int = 128):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._key_locks: dict[Hashable, threading.Lock] = {}
+
+    def _fresh(self, key: Hashable) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return True, entry[1]
+        return False, None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        hit, value = self._fresh(key)
+        return value if hit else default
+
+    def get_or_set(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        hit, value = self._fresh(key)
+        if hit:
+            return value
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            hit, value = self._fresh(key)
+            if hit:
+                return value
+            value = compute()
+            with self._lock:
+                if len(self._entries) >= self.max_entries:
+                    self._evict()
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            return value
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for k in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[k]
+        while len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+        for k in [k for k in self._key_locks if k not in self._entries]:
+            if not self._key_locks[k].locked():
+                del self._key_locks[k]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._key_locks.clear()
@@ -0,0 +1,92 @@
+"""
+Minimal streaming ZIP writer for entries compressed elsewhere.
+
+``zipfile`` compresses entries itself, in the writing thread; this writer
+takes entries already deflated (for example by worker processes) and emits
+the archive as bytes chunks: one local header + data per entry, then the
+central directory. CRC and sizes are known up front, so no data descriptors
+or seeking are needed. Archives are limited to what plain ZIP (no ZIP64)
+allows: under 65535 entries and 4 GiB.
+"""
+from __future__ import annotations
+
+import struct
+import zlib
+from datetime import datetime
+from typing import NamedTuple
+
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+_CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")
+_END_OF_CENTRAL_DIR = struct.Struct("<4s4H2LH")
+
+_VERSION = 20  # 2.0: deflate
+_UTF8_NAMES = 0x0800
+_DEFLATED = 8
+_MAX_ENTRIES = 0xFFFF
+_MAX_OFFSET = 0xFFFFFFFF
+
+
+class DeflatedEntry(NamedTuple):
+    name: str
+    crc: int
+    size: int
+    data: bytes  # raw DEFLATE stream
+
+
+def deflate_entry(name: str, payload: bytes, level: int = 6) -> DeflatedEntry:
+    """Compress ``payload`` as a ZIP entry body (raw DEFLATE, no zlib header)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    data = compressor.compress(payload) + compressor.flush()
+    return DeflatedEntry(name, zlib.crc32(payload), len(payload), data)
+
+
+# Range of MS-DOS timestamps; others are clamped, as zipfile does without strict_timestamps
+_DOS_EARLIEST = datetime(1980, 1, 1)
+_DOS_LATEST = datetime(2107, 12, 31, 23, 59, 58)
+
+
+def _dos_timestamp(stamp: datetime) -> tuple[int, int]:
+    stamp = min(max(stamp, _DOS_EARLIEST), _DOS_LATEST)
+    time = (stamp.hour << 11) | (stamp.minute << 5) | (stamp.second // 2)
+    date = ((stamp.year - 1980) << 9) | (stamp.month << 5) | stamp.day
+    return time, date
+
+
+class ZipStream:
+    """Write :class:`DeflatedEntry` items with :meth:`add`, then :meth:`finish`."""
+
+    def __init__(self, modified: datetime):
+        self._time, self._date = _dos_timestamp(modified)
+        self._central: list[bytes] = []
+        self._offset = 0
+
+    def add(self, entry: DeflatedEntry) -> bytes:
+        """Bytes of one entry (local header + data)."""
+        if len(self._central) >= _MAX_ENTRIES - 1:
+            raise ValueError("Too many entries for a ZIP archive without ZIP64.")
+        name = entry.name.encode("utf-8")
+        sizes = (entry.crc, len(entry.data), entry.size)
+        header = _LOCAL_HEADER.pack(
+            b"PK\x03\x04", _VERSION, _UTF8_NAMES, _DEFLATED, self._time, self._date,
+            *sizes, len(name), 0,
+        )
+        self._central.append(
+            _CENTRAL_HEADER.pack(
+                b"PK\x01\x02", _VERSION, _VERSION, _UTF8_NAMES, _DEFLATED, self._time, self._date,
+                *sizes, len(name), 0, 0, 0, 0, 0o100644 << 16, self._offset,
+            )
+            + name
+        )
+        chunk = header + name + entry.data
+        self._offset += len(chunk)
+        if self._offset > _MAX_OFFSET:
+            raise ValueError("ZIP archive too large without ZIP64.")
+        return chunk
+
+    def finish(self) -> bytes:
+        """Central directory and end record."""
+        directory = b"".join(self._central)
+        count = len(self._central)
+        return directory + _END_OF_CENTRAL_DIR.pack(
+            b"PK\x05\x06", 0, 0, count, count, len(directory), self._offset, 0
+        )
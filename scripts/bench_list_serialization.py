@@ -0,0 +1,85 @@
+"""
+Micro-benchmark: list response serialization, old path vs fast path.
+
+Old path (what FastAPI did for List[BillOut] listings):
+    build BillOut per row -> validate again against response_model
+    -> dump to JSON-able python -> stdlib json.dumps
+Fast path (app.utils.fast_json):
+    plain dict rows -> FastJSONResponse (orjson when installed)
+
+Usage:
+    python scripts/bench_list_serialization.py [rows ...]   # default: 10000 100000
+"""
+import sys
+import json
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+# Add parent directory to path to allow imports
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from pydantic import TypeAdapter
+
+from main import BillOut
+from app.utils import fast_json
+from app.utils.fast_json import FastJSONResponse
+
+
+def make_rows(n: int) -> list[dict]:
+    start = datetime(2026, 1, 1, 8, 0, 0)
+    return [
+        {
+            "id": i,
+            "date": start + timedelta(minutes=i),
+            "employee_id": i % 250,
+            "employee_name": f"Employee {i % 250} Surname",
+            "role": "staff",
+            "amount": 150.0 + (i % 97),
+            "reason": "Meal at canteen" if i % 3 else None,
+            "record_type": "bill",
+            "recorded_by_name": "Manager Person",
+        }
+        for i in range(n)
+    ]
+
+
+def old_path(rows: list[dict], adapter: TypeAdapter) -> bytes:
+    models = [BillOut(**r) for r in rows]
+    validated = adapter.validate_python(models)
+    content = adapter.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(rows: list[dict]) -> bytes:
+    return FastJSONResponse(rows).body
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000]
+    adapter = TypeAdapter(List[BillOut])
+    encoder = "orjson" if fast_json.orjson is not None else "stdlib json"
+    print(f"Fast path encoder: {encoder}")
+    print(f"{'rows':>8}  {'old (ms)':>10}  {'fast (ms)':>10}  {'speed-up':>8}")
+    for n in sizes:
+        rows = make_rows(n)
+        old = best_of(lambda: old_path(rows, adapter))
+        fast = best_of(lambda: fast_path(rows))
+        print(f"{n:>8}  {old * 1000:>10.1f}  {fast * 1000:>10.1f}  {old / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Benchmark: PIN login latency with many users, under the 5/minute limiter.
+
+Builds a temporary SQLite file database with N employees and PINs, then:
+
+1. Lookup only - the old two-query path (user_auth by (first_name, pin) and
+   employee by first_name, neither indexed) vs the new single join on the
+   indexed user_auth (first_name, pin) -> employee primary key.
+2. End to end - POST /api/login through the real app with the limiter on.
+   Each simulated user logs in from its own client address, so every call is
+   admitted; one extra client then hammers the endpoint to confirm the
+   limiter still answers 429 after 5 attempts.
+
+Usage:
+    python scripts/bench_login.py [users]   # default: 5000
+"""
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path to allow imports
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, select, text
+
+import main
+from app.models.schema import Base, Employee, Role, UserAuth
+from app.services.employee_directory import employee_directory
+
+FIRST_NAMES = 400  # first names repeat, as they do in practice
+
+
+def seed(engine, users: int) -> list[tuple[str, int]]:
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Employee),
+            [
+                {
+                    "id": i,
+                    "first_name": f"Name{i % FIRST_NAMES}",
+                    "last_name": f"Surname{i}",
+                    "role": Role.STAFF,
+                    "salary": 30000.0,
+                    "phone_no": f"07{i:08d}",
+                }
+                for i in range(1, users + 1)
+            ],
+        )
+        conn.execute(
+            insert(UserAuth),
+            [
+                {"employee_id": i, "first_name": f"Name{i % FIRST_NAMES}", "pin": i % 10000}
+                for i in range(1, users + 1)
+            ],
+        )
+    return [(f"Name{i % FIRST_NAMES}", i % 10000) for i in range(1, users + 1)]
+
+
+def old_lookup(conn, first_name: str, pin: int):
+    auth = conn.execute(
+        select(UserAuth.id).where(UserAuth.first_name == first_name, UserAuth.pin == pin).limit(1)
+    ).first()
+    if auth is None:
+        return None
+    return conn.execute(
+        select(Employee.id, Employee.role).where(Employee.first_name == first_name).limit(1)
+    ).first()
+
+
+def new_lookup(conn, first_name: str, pin: int):
+    return conn.execute(
+        select(Employee.id, Employee.role)
+        .join(UserAuth, UserAuth.employee_id == Employee.id)
+        .where(UserAuth.first_name == first_name, UserAuth.pin == pin)
+        .limit(1)
+    ).first()
+
+
+def timed(fn, credentials) -> list[float]:
+    samples = []
+    for first_name, pin in credentials:
+        t0 = time.perf_counter()
+        fn(first_name, pin)
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def summary(label: str, samples: list[float]) -> None:
+    ms = sorted(s * 1000 for s in samples)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(f"  {label:<28} p50 {statistics.median(ms):7.3f} ms   p95 {p95:7.3f} ms")
+
+
+def per_client(app):
+    """ASGI wrapper: take the client address from X-Bench-Client (limiter key)."""
+
+    async def wrapped(scope, receive, send):
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"x-bench-client":
+                    scope = dict(scope, client=(value.decode(), 50000))
+                    break
+        await app(scope, receive, send)
+
+    return wrapped
+
+
+def main_bench():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/login.db")
+        credentials = seed(engine, users)
+        sample = credentials[:: max(1, users // 1000)]
+
+        print(f"{users} users, {len(sample)} logins per measurement")
+        print("Lookup only:")
+        with engine.connect() as conn:
+            summary("new: indexed join", timed(lambda f, p: new_lookup(conn, f, p), sample))
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_user_auth_first_name_pin"))
+        with engine.connect() as conn:
+            summary("old: two unindexed queries", timed(lambda f, p: old_lookup(conn, f, p), sample))
+        with engine.begin() as conn:
+            for index in UserAuth.__table__.indexes:
+                index.create(conn, checkfirst=True)
+
+        main.engine = engine
+        main.SessionLocal = main.request_session_factory(engine)
+        employee_directory.clear()
+        main.limiter.reset()
+        client = TestClient(per_client(main.app))
+
+        print("POST /api/login (limiter on, one client address per user):")
+        samples = []
+        for n, (first_name, pin) in enumerate(sample):
+            t0 = time.perf_counter()
+            resp = client.post(
+                "/api/login",
+                json={"first_name": first_name, "pin": pin},
+                headers={"X-Bench-Client": f"10.{n // 65536}.{n // 256 % 256}.{n % 256}"},
+            )
+            samples.append(time.perf_counter() - t0)
+            assert resp.status_code == 200, resp.text
+        summary("end to end", samples)
+
+        first_name, pin = sample[0]
+        codes = [
+            client.post(
+                "/api/login",
+                json={"first_name": first_name, "pin": pin},
+                headers={"X-Bench-Client": "192.0.2.1"},
+            ).status_code
+            for _ in range(7)
+        ]
+        print(f"  one client, 7 attempts -> {codes}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,87 @@
+"""
+Benchmark: email delivery over a new SMTP connection per message vs one
+reused, authenticated session sending the batch back to back.
+
+Runs against the local SMTP stand-in from the test suite (tests/smtp_sink.py)
+with a per-reply delay that mimics a remote server, so the cost of each
+connect + EHLO + AUTH + QUIT round is visible. Both paths build the same
+messages; only the connection handling differs.
+
+Usage:
+    python scripts/bench_notifications.py [messages] [latency_ms]   # default: 200 5
+"""
+import smtplib
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to allow imports
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.notification_service import build_email_message
+from app.services.notification_transport import SMTPConnectionManager, SMTPSettings
+from tests.smtp_sink import SMTPSink
+
+
+def messages(count: int) -> list:
+    batch = []
+    for n in range(count):
+        msg = build_email_message(
+            "admin@example.com",
+            f"[Salary] New advance request #{n}",
+            f"Request ID: {n}\nAmount: 100.00",
+            f"<pre>Request ID: {n}</pre>",
+        )
+        msg.replace_header("From", "alerts@example.com")
+        batch.append(msg)
+    return batch
+
+
+def connection_per_message(settings: SMTPSettings, batch: list) -> None:
+    """The previous path: connect, log in, send and quit for every message."""
+    for msg in batch:
+        server = smtplib.SMTP(settings.host, settings.port, timeout=settings.timeout)
+        try:
+            server.login(settings.user, settings.password)
+            server.send_message(msg)
+        finally:
+            server.quit()
+
+
+def pooled(settings: SMTPSettings, batch: list) -> None:
+    manager = SMTPConnectionManager(lambda: settings)
+    try:
+        errors = manager.send_many(batch)
+        assert not any(errors), errors
+    finally:
+        manager.close()
+
+
+def run(label: str, fn, count: int, latency: float) -> None:
+    with SMTPSink(latency=latency) as sink:
+        settings = SMTPSettings(sink.host, sink.port, "alerts@example.com", "secret",
+                                use_tls=False, timeout=10)
+        batch = messages(count)
+        t0 = time.perf_counter()
+        fn(settings, batch)
+        elapsed = time.perf_counter() - t0
+        assert len(sink.messages) == count
+        print(
+            f"  {label:<26} {elapsed:7.3f} s   {count / elapsed:8.1f} msg/s   "
+            f"connections {sink.connections:4d}   logins {sink.logins:4d}"
+        )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 5.0) / 1000
+    print(f"{count} messages, {latency * 1000:.1f} ms per server reply")
+    run("connection per message", connection_per_message, count, latency)
+    run("reused session, batched", pooled, count, latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: building the monthly payslip ZIP for N employees, with payslips
+rendered and deflated in-process vs on the shared process pool.
+
+Payroll figures are computed once up front (one batched register pass) so
+only rendering, compression and ZIP writing are timed. The pool is started and warmed
+before timing, as it is reused across requests in the server.
+
+Usage:
+    python scripts/bench_payslips.py [employees] [workers]   # default: 2000 4
+"""
+import io
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+# Add parent directory to path to allow imports
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import app.services.payslip_service as payslip_service
+
+
+def register_rows(count: int) -> list:
+    return [
+        {
+            "employee_id": n,
+            "employee_name": f"Employee {n} Test",
+            "role": "staff",
+            "base_monthly": 30000.0 + n,
+            "eligible_days": 31,
+            "off_days": 1.5,
+            "off_day_deduction": 1451.61,
+            "earned_gross": 28548.39,
+            "bills": 120.0,
+            "advances": 400.0,
+            "net_for_month": 28028.39,
+            "payments": 1000.0,
+            "arrears_brought_forward": 250.0,
+            "balance": 27278.39,
+            "closed": True,
+        }
+        for n in range(1, count + 1)
+    ]
+
+
+def build(rows: list, min_batch: int) -> int:
+    payslip_service.PAYSLIP_POOL_MIN_BATCH = min_batch
+    payslip_service.register_rows = lambda db, year, month: rows
+    return sum(len(chunk) for chunk in payslip_service.stream_payslip_zip(None, 2026, 5))
+
+
+def run(label: str, rows: list, min_batch: int, repeats: int = 3) -> None:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        size = build(rows, min_batch)
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<12} {best * 1000:8.1f} ms  ({size / 1024:.0f} KiB zip)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    payslip_service.PAYSLIP_RENDER_WORKERS = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    rows = register_rows(count)
+    build(rows[:50], min_batch=1)  # start and warm the pool
+    print(f"{count} payslips, {payslip_service.PAYSLIP_RENDER_WORKERS} worker processes")
+    run("in-process", rows, min_batch=count + 1)
+    run("pool", rows, min_batch=1)
+    with zipfile.ZipFile(io.BytesIO(b"".join(payslip_service.stream_payslip_zip(None, 2026, 5)))) as zf:
+        assert len(zf.namelist()) == 2 * count
+    payslip_service.shutdown_render_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark: what checking a rate limit adds to request latency, per storage.
+
+For each storage backend:
+- "check": one sliding-window ``hit`` against the storage (what slowapi does
+  per request on a limited route);
+- "request": median latency of GET on a tiny FastAPI route with
+  ``@limiter.limit("1000000/minute")``, next to the same route without a limit
+  (requests go straight to the ASGI app, alternating between the two routes,
+  so the difference is the limiter's own cost).
+
+Backends: memory:// (per process), sqlite file (shared across workers on the
+host) and, when REDIS_URL is set, redis (shared across instances).
+
+Usage:
+    python scripts/bench_rate_limit.py [iterations]   # default: 2000
+    REDIS_URL=redis://localhost:6379/0 python scripts/bench_rate_limit.py
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path to allow imports
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi import FastAPI, Request
+import httpx
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import SlidingWindowCounterRateLimiter
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+import app.utils.rate_limit_storage  # noqa: F401  (registers sqlite://)
+
+
+def median_us(fn, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1e6
+
+
+def build_app(storage_uri: str) -> FastAPI:
+    limiter = Limiter(
+        key_func=get_remote_address, storage_uri=storage_uri, strategy="sliding-window-counter"
+    )
+    bench_app = FastAPI()
+    bench_app.state.limiter = limiter
+
+    @bench_app.get("/plain")
+    async def plain(request: Request):
+        return {"ok": True}
+
+    @bench_app.get("/limited")
+    @limiter.limit("1000000/minute")
+    async def limited(request: Request):
+        return {"ok": True}
+
+    limiter.reset()
+    return bench_app
+
+
+async def request_medians(bench_app: FastAPI, iterations: int) -> tuple[float, float]:
+    transport = httpx.ASGITransport(app=bench_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        timings = {"/plain": [], "/limited": []}
+        for n in range(iterations + 100):
+            for path in ("/plain", "/limited"):
+                t0 = time.perf_counter()
+                await client.get(path)
+                if n >= 100:  # warm-up
+                    timings[path].append(time.perf_counter() - t0)
+    return (
+        statistics.median(timings["/plain"]) * 1e6,
+        statistics.median(timings["/limited"]) * 1e6,
+    )
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = [("memory", "memory://"), ("sqlite file", f"sqlite:///{tmp}/limits.db")]
+        if os.getenv("REDIS_URL"):
+            backends.append(("redis", os.environ["REDIS_URL"]))
+
+        item = parse("1000000/minute")
+        print(f"{iterations} iterations, medians")
+        print(f"{'storage':<12}  {'check (us)':>10}  {'plain req (us)':>14}  {'limited req (us)':>16}  {'added (us)':>10}")
+        for label, uri in backends:
+            storage = storage_from_string(uri)
+            storage.reset()
+            strategy = SlidingWindowCounterRateLimiter(storage)
+            check = median_us(lambda: strategy.hit(item, "bench"), iterations)
+
+            plain, limited = asyncio.run(request_medians(build_app(uri), iterations))
+            print(f"{label:<12}  {check:>10.1f}  {plain:>14.1f}  {limited:>16.1f}  {limited - plain:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
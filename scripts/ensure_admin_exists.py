@@ -57,12 +57,13 @@ def ensure_admin_exists(
             
             # Check if UserAuth entry exists for this admin
             user_auth = session.query(UserAuth).filter(
-                UserAuth.first_name == existing_admin.first_name
+                UserAuth.employee_id == existing_admin.id
             ).first()
             
             if not user_auth:
                 print("\nUserAuth entry not found for admin. Creating one...")
                 user_auth = UserAuth(
+                    employee_id=existing_admin.id,
                     first_name=existing_admin.first_name,
                     pin=pin
                 )
@@ -106,6 +107,7 @@ def ensure_admin_exists(
         
         # Create UserAuth entry for login
         user_auth = UserAuth(
+            employee_id=admin_employee.id,
             first_name=first_name,
             pin=pin
         )
@@ -0,0 +1,71 @@
+"""
+Import bills in bulk from a CSV or JSON file.
+
+The CSV needs a header line with ``employee_id`` and ``amount`` and may add
+``date`` (YYYY-MM-DD), ``reason`` and ``manager_id``; a JSON file holds an
+array of objects with the same keys. Rows without ``manager_id`` are recorded
+by ``--manager-id``. The import is all-or-nothing, like POST /api/bills/import.
+
+Usage:
+    python scripts/import_bills.py bills.csv --manager-id 3
+    python scripts/import_bills.py bills.json
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path to allow imports
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.config.config import DATABASE_URL
+from app.models.schema import get_engine, get_session
+from app.services.bill_import_service import (
+    BillImportError,
+    import_bills,
+    parse_bill_csv,
+    parse_bill_json,
+)
+
+
+def read_rows(path: Path) -> list[dict]:
+    raw = path.read_bytes()
+    if path.suffix.lower() == ".json":
+        return parse_bill_json(raw)
+    return parse_bill_csv(raw.decode("utf-8-sig"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import bills from a CSV or JSON file.")
+    parser.add_argument("file", type=Path)
+    parser.add_argument("--manager-id", type=int, default=None,
+                        help="Recorder for rows without a manager_id column")
+    args = parser.parse_args()
+
+    try:
+        rows = read_rows(args.file)
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    session = get_session(get_engine(DATABASE_URL))
+    try:
+        result = import_bills(session, rows, recorded_by_id=args.manager_id)
+    except BillImportError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        for error in e.errors:
+            where = f"row {error['row']}" if error["row"] is not None else "import"
+            print(f"  {where}: {error['error']}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        session.close()
+
+    print(f"✓ Imported {result['imported']} bills")
+    for warning in result["warnings"]:
+        print(f"  {warning['message']}")
+
+
+if __name__ == "__main__":
+    main()
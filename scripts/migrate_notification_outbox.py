@@ -0,0 +1,34 @@
+"""
+Create the notification_outbox table (queued admin alerts, delivered by the
+outbox dispatcher) and its due-rows index.
+
+Safe to re-run.
+"""
+import sys
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.config.config import DATABASE_URL
+from app.models.schema import NotificationOutbox, get_engine
+
+
+def migrate(engine=None):
+    if engine is None:
+        print("Connecting to database...")
+        engine = get_engine(DATABASE_URL)
+
+    with engine.begin() as conn:
+        NotificationOutbox.__table__.create(conn, checkfirst=True)
+        for index in NotificationOutbox.__table__.indexes:
+            index.create(conn, checkfirst=True)
+        print("✓ notification_outbox table ready")
+
+    print("Migration complete.")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,32 @@
+"""
+Create the pay_run_entry table (one row per employee paid by a pay run for a
+payroll month; its unique constraint makes pay runs idempotent).
+
+Safe to re-run.
+"""
+import sys
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.config.config import DATABASE_URL
+from app.models.schema import PayRunEntry, get_engine
+
+
+def migrate(engine=None):
+    if engine is None:
+        print("Connecting to database...")
+        engine = get_engine(DATABASE_URL)
+
+    with engine.begin() as conn:
+        PayRunEntry.__table__.create(conn, checkfirst=True)
+        print("✓ pay_run_entry table ready")
+
+    print("Migration complete.")
+
+
+if __name__ == "__main__":
+    migrate()
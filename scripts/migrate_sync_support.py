@@ -0,0 +1,56 @@
+"""
+Prepare the database for delta sync (GET /api/sync): backfill NULL
+``updated_at`` values, index ``updated_at`` on every synced table and create
+the ``sync_tombstone`` table.
+
+Rows whose ``updated_at`` is NULL would never be picked up by an incremental
+sync, so they are stamped with ``created_at`` (or now when that is NULL too).
+
+Safe to re-run.
+"""
+import sys
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy import func, update
+
+from app.config.config import DATABASE_URL
+from app.models.schema import SyncTombstone, get_engine
+from app.services.sync_service import SYNC_ENTITIES
+
+
+def migrate(engine=None):
+    if engine is None:
+        print("Connecting to database...")
+        engine = get_engine(DATABASE_URL)
+
+    with engine.begin() as conn:
+        for model in SYNC_ENTITIES.values():
+            table = model.__table__
+            stamp = (
+                func.coalesce(table.c.created_at, func.current_timestamp())
+                if "created_at" in table.c
+                else func.current_timestamp()
+            )
+            filled = conn.execute(
+                update(table).where(table.c.updated_at.is_(None)).values(updated_at=stamp)
+            ).rowcount
+            print(f"✓ {table.name}: stamped {filled} row(s) without updated_at")
+
+            for index in table.indexes:
+                if "updated_at" in index.columns:
+                    index.create(conn, checkfirst=True)
+            print(f"✓ {table.name}.updated_at indexed")
+
+        SyncTombstone.__table__.create(conn, checkfirst=True)
+        print("✓ sync_tombstone table ready")
+
+    print("Migration complete.")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,115 @@
+"""
+Key user_auth by employee: add user_auth.employee_id (FK, unique), backfill it
+from first_name, and create the login indexes.
+
+Backfill rules:
+- each PIN row is matched to the employee with that first name (lowest id
+  when several share it, which is what the old first_name login resolved to);
+- if several PIN rows end up on one employee, the newest row is kept;
+- rows with no matching employee are left with employee_id NULL and reported
+  (they can no longer log in; reassign a PIN from the admin dashboard);
+- employees sharing a first name and a PIN are reported: login refuses the
+  ambiguous pair, so reset the PIN of all but one of them.
+
+Safe to re-run.
+"""
+import sys
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy import inspect, text
+
+from app.config.config import DATABASE_URL
+from app.models.schema import UserAuth, get_engine
+
+
+def find_login_collisions(conn) -> list:
+    """(first_name, employee ids) for each (first_name, pin) held by several employees."""
+    rows = conn.execute(
+        text(
+            """
+        SELECT first_name, pin, employee_id FROM user_auth
+        WHERE employee_id IS NOT NULL
+        ORDER BY first_name, pin, employee_id
+    """
+        )
+    ).all()
+    groups = {}
+    for first_name, pin, employee_id in rows:
+        groups.setdefault((first_name, pin), []).append(employee_id)
+    return [(name, ids) for (name, _), ids in groups.items() if len(ids) > 1]
+
+
+def migrate(engine=None):
+    if engine is None:
+        print("Connecting to database...")
+        engine = get_engine(DATABASE_URL)
+
+    with engine.begin() as conn:
+        columns = {c["name"] for c in inspect(conn).get_columns("user_auth")}
+        if "employee_id" not in columns:
+            print("Adding user_auth.employee_id ...")
+            conn.execute(
+                text(
+                    "ALTER TABLE user_auth ADD COLUMN employee_id INTEGER NULL "
+                    "REFERENCES employee (id) ON DELETE CASCADE"
+                )
+            )
+            print("✓ employee_id added")
+        else:
+            print("✓ user_auth.employee_id already exists")
+
+        filled = conn.execute(
+            text(
+                """
+            UPDATE user_auth SET employee_id = (
+                SELECT MIN(e.id) FROM employee e
+                WHERE e.first_name = user_auth.first_name
+            )
+            WHERE employee_id IS NULL
+        """
+            )
+        ).rowcount
+
+        removed = conn.execute(
+            text(
+                """
+            DELETE FROM user_auth
+            WHERE employee_id IS NOT NULL
+              AND id NOT IN (
+                SELECT keep_id FROM (
+                    SELECT MAX(id) AS keep_id FROM user_auth
+                    WHERE employee_id IS NOT NULL
+                    GROUP BY employee_id
+                ) AS newest
+              )
+        """
+            )
+        ).rowcount
+        if removed:
+            print(f"✓ removed {removed} superseded PIN row(s)")
+
+        orphans = conn.execute(
+            text("SELECT id, first_name FROM user_auth WHERE employee_id IS NULL")
+        ).all()
+        print(f"✓ backfilled {filled - len(orphans)} row(s)")
+        for row_id, first_name in orphans:
+            print(f"! user_auth {row_id} ({first_name}) matches no employee; left unlinked")
+
+        for first_name, employee_ids in find_login_collisions(conn):
+            ids = ", ".join(str(i) for i in employee_ids)
+            print(f"! employees {ids} ({first_name}) share a PIN; reset all but one of them")
+
+        print("Creating login indexes if missing ...")
+        for index in UserAuth.__table__.indexes:
+            index.create(conn, checkfirst=True)
+
+    print("Migration complete.")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,103 @@
+"""
+Precompress the hashed dashboard bundles under static/ (build step).
+
+Writes ``<file>.gz`` (gzip -9) and, when the ``brotli`` package is installed,
+``<file>.br`` (quality 11) next to every content-hashed asset, e.g.
+``static/paypal-dashboard/assets/index-DvsRJUWZ.js``. The app's
+PrecompressedStaticFiles serves them with ``Content-Encoding`` and an
+``immutable`` cache policy. Siblings that would not be smaller are skipped,
+up-to-date ones are kept, and ones whose source is gone are removed.
+
+Runs with the standard library only (brotli optional), so it works in the
+Vercel build step before the app's requirements are installed:
+
+    python scripts/precompress_static.py [static_dir]
+"""
+import gzip
+import os
+import re
+import sys
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Same as HASHED_ASSET_PATTERN in app/utils/compression.py
+HASHED_ASSET_PATTERN = r"(^|/)assets/[^/]+-[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$"
+COMPRESSIBLE_SUFFIXES = {".js", ".mjs", ".css", ".svg", ".json", ".html", ".txt", ".map", ".wasm"}
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+
+def _encoders():
+    # mtime=0 keeps .gz output byte-identical across builds
+    encoders = {".gz": lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoders[".br"] = lambda data: brotli.compress(data, quality=11)
+    return encoders
+
+
+def _is_candidate(path: Path, root: Path) -> bool:
+    rel = path.relative_to(root).as_posix()
+    return path.suffix in COMPRESSIBLE_SUFFIXES and re.search(HASHED_ASSET_PATTERN, rel) is not None
+
+
+def precompress(static_dir: Path) -> dict:
+    encoders = _encoders()
+    stats = {"written": 0, "up_to_date": 0, "skipped": 0, "removed": 0, "saved_bytes": 0}
+
+    for path in sorted(static_dir.rglob("*")):
+        if not path.is_file():
+            continue
+        if path.suffix in COMPRESSED_SUFFIXES:
+            source = path.with_suffix("")
+            if _is_candidate(source, static_dir) and not source.exists():
+                path.unlink()
+                stats["removed"] += 1
+            continue
+        if not _is_candidate(path, static_dir):
+            continue
+
+        data = None
+        for suffix, encode in encoders.items():
+            target = path.with_name(path.name + suffix)
+            if target.exists() and target.stat().st_mtime >= path.stat().st_mtime:
+                stats["up_to_date"] += 1
+                continue
+            if data is None:
+                data = path.read_bytes()
+            compressed = encode(data)
+            if len(compressed) >= len(data):
+                if target.exists():
+                    target.unlink()
+                stats["skipped"] += 1
+                continue
+            tmp = target.with_name(target.name + ".tmp")
+            tmp.write_bytes(compressed)
+            os.replace(tmp, target)
+            stats["written"] += 1
+            stats["saved_bytes"] += len(data) - len(compressed)
+            print(f"  {target.relative_to(static_dir)}: {len(data):,} -> {len(compressed):,} bytes")
+    return stats
+
+
+def main():
+    static_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else PROJECT_ROOT / "static"
+    if not static_dir.is_dir():
+        print(f"No static directory at {static_dir}; nothing to precompress.")
+        return
+    if brotli is None:
+        print("brotli is not installed; writing .gz only.")
+    stats = precompress(static_dir)
+    print(
+        f"Precompressed {stats['written']} file(s), {stats['up_to_date']} up to date, "
+        f"{stats['skipped']} not worth compressing, {stats['removed']} stale removed; "
+        f"saved {stats['saved_bytes']:,} bytes."
+    )
+
+
+if __name__ == "__main__":
+    main()
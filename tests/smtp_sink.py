@@ -0,0 +1,146 @@
+"""
+A local SMTP server stand-in for tests and benchmarks.
+
+Speaks just enough ESMTP for ``smtplib`` (EHLO, AUTH PLAIN/LOGIN, MAIL, RCPT,
+DATA, RSET, NOOP, QUIT; no TLS) and records what it receives, plus how many
+connections and logins it saw. ``fail_next(n)`` rejects the next ``n``
+messages with a transient 451, ``drop_connections()`` cuts every open session
+(as an idle-timeout would), and ``latency`` delays every reply to mimic a
+remote server.
+"""
+import email
+import socket
+import socketserver
+import threading
+import time
+from email import policy
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def reply(self, line: str) -> None:
+        if self.server.sink.latency:
+            time.sleep(self.server.sink.latency)
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        sink = self.server.sink
+        sink._count("connections")
+        with sink._lock:
+            sink._open.add(self.request)
+        try:
+            self.converse(sink)
+        finally:
+            with sink._lock:
+                sink._open.discard(self.request)
+
+    def converse(self, sink) -> None:
+        self.reply("220 sink ESMTP ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb, _, arg = line.decode("utf-8", "replace").rstrip("\r\n").partition(" ")
+            verb = verb.upper()
+            if verb == "EHLO":
+                self.wfile.write(b"250-sink\r\n250-8BITMIME\r\n")
+                self.reply("250 AUTH PLAIN LOGIN")
+            elif verb == "HELO":
+                self.reply("250 sink")
+            elif verb == "AUTH":
+                if arg.upper().startswith("LOGIN"):
+                    self.reply("334 VXNlcm5hbWU6")
+                    self.rfile.readline()
+                    self.reply("334 UGFzc3dvcmQ6")
+                    self.rfile.readline()
+                sink._count("logins")
+                self.reply("235 2.7.0 Authentication successful")
+            elif verb == "MAIL":
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while True:
+                    chunk = self.rfile.readline()
+                    if chunk in (b".\r\n", b".\n", b""):
+                        break
+                    data.append(chunk[1:] if chunk.startswith(b"..") else chunk)
+                if sink._take_failure():
+                    self.reply("451 4.3.0 Try again later")
+                else:
+                    sink._store(email.message_from_bytes(b"".join(data), policy=policy.default))
+                    self.reply("250 OK queued")
+            elif verb in ("RSET", "NOOP"):
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SMTPSink:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.messages = []
+        self.connections = 0
+        self.logins = 0
+        self._failures = 0
+        self._open = set()
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.sink = self
+        self.host, self.port = self._server.server_address
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def fail_next(self, n: int = 1) -> None:
+        with self._lock:
+            self._failures += n
+
+    def drop_connections(self) -> None:
+        with self._lock:
+            for sock in self._open:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    def wait_for(self, count: int, timeout: float = 5.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if len(self.messages) >= count:
+                return True
+            time.sleep(0.01)
+        return False
+
+    def _take_failure(self) -> bool:
+        with self._lock:
+            if self._failures:
+                self._failures -= 1
+                return True
+            return False
+
+    def _store(self, message) -> None:
+        with self._lock:
+            self.messages.append(message)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
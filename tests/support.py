@@ -0,0 +1,93 @@
+"""
+Shared helpers for API tests: an in-memory SQLite database wired into ``main``.
+"""
+import datetime as dt
+import itertools
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+import main
+from app.models.schema import Base, Employee, Role
+from app.services import auth_service
+from app.services.employee_directory import employee_directory
+from app.services.payroll_register_service import register_cache
+from app.services.payslip_service import payslip_cache
+
+_phone_seq = itertools.count(1)
+
+
+def memory_engine():
+    """One shared connection so every session (and the TestClient thread) sees the same data."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def api_client(engine) -> TestClient:
+    """Point ``main``'s session factory at ``engine`` and return a client."""
+    main.engine = engine
+    main.SessionLocal = main.request_session_factory(engine)
+    # Process-wide cache: ids repeat across per-test databases
+    employee_directory.clear()
+    # Rate-limit counters are in-process too (login allows 5/minute)
+    main.limiter.reset()
+    main.dashboard_cache.clear()
+    register_cache.clear()
+    payslip_cache.clear()
+    return TestClient(main.app)
+
+
+def token_headers(test, employee_id, role) -> dict:
+    """``Authorization`` header with a session token, signed with a test key for ``test``'s duration."""
+    if auth_service._signing_key is None:
+        key = patch.object(auth_service, "_signing_key", "test-signing-key")
+        key.start()
+        test.addCleanup(key.stop)
+    token, _ = auth_service.issue_access_token(employee_id, role)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def add_employee(db, first_name, role=Role.STAFF, salary=30000.0, **kw) -> Employee:
+    kw.setdefault("last_name", "Test")
+    kw.setdefault("phone_no", f"07{next(_phone_seq):08d}")
+    kw.setdefault("employment_start_date", dt.date(2026, 1, 1))
+    emp = Employee(first_name=first_name, role=role, salary=salary, **kw)
+    db.add(emp)
+    db.commit()
+    db.refresh(emp)
+    return emp
+
+
+class QueryCounter:
+    """Count statements (and commits) sent to ``engine`` inside a ``with`` block."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements: list[str] = []
+        self.commits = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def _on_commit(self, conn):
+        self.commits += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        event.listen(self.engine, "commit", self._on_commit)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+        event.remove(self.engine, "commit", self._on_commit)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
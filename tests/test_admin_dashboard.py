@@ -0,0 +1,150 @@
+"""
+Admin dashboard aggregate and the batched payroll breakdown behind it.
+"""
+import datetime as dt
+import unittest
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schema import (
+    Advance,
+    AdvanceStatus,
+    Bill,
+    OffDay,
+    OffDayStatus,
+    Role,
+    SalaryPayment,
+)
+from app.services.payroll_service import get_payroll_breakdown, get_payroll_breakdowns
+from tests.support import QueryCounter, add_employee, api_client, memory_engine, token_headers
+
+
+def seed(db, as_of, staff_count=3):
+    """Staff with bills, advances (this and last month), off days and payments."""
+    admin_id = add_employee(db, "Root", role=Role.ADMIN, salary=90000.0).id
+    month_start = as_of.replace(day=1)
+    last_month = month_start - dt.timedelta(days=3)
+    ids = []
+    for n in range(staff_count):
+        emp_id = add_employee(
+            db, f"Staff{n}", salary=30000.0 + 1000 * n,
+            employment_start_date=month_start + dt.timedelta(days=n % 3),
+            salary_arrears=250.0 * n,
+        ).id
+        ids.append(emp_id)
+        db.add_all([
+            Bill(employee_id=emp_id, billed_employee_id=emp_id, amount_billed=100 + n,
+                 date=dt.datetime.combine(month_start, dt.time(12)), recorded_by_id=admin_id),
+            Bill(employee_id=emp_id, billed_employee_id=emp_id, amount_billed=999,
+                 date=dt.datetime.combine(last_month, dt.time(12)), recorded_by_id=admin_id),
+            Advance(employee_id=emp_id, amount_for_advance=500, status=AdvanceStatus.APPROVED,
+                    created_at=dt.datetime.combine(last_month, dt.time(9)),
+                    approved_at=dt.datetime.combine(month_start, dt.time(10))),
+            Advance(employee_id=emp_id, amount_for_advance=700, status=AdvanceStatus.APPROVED,
+                    created_at=dt.datetime.combine(last_month, dt.time(9))),
+            Advance(employee_id=emp_id, amount_for_advance=300 * (n + 1)),
+            OffDay(employee_id=emp_id, date=month_start - dt.timedelta(days=1), day_count=3,
+                   status=OffDayStatus.APPROVED),
+            OffDay(employee_id=emp_id, date=month_start, off_type="half",
+                   status=OffDayStatus.APPROVED),
+            OffDay(employee_id=emp_id, date=as_of, day_count=2),
+            SalaryPayment(employee_id=emp_id, amount_paid=1000, payment_date=month_start,
+                          paid_by_id=admin_id),
+        ])
+    db.commit()
+    return admin_id, ids
+
+
+class BatchedPayrollTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.db = sessionmaker(bind=self.engine)()
+        self.as_of = dt.date(2026, 3, 20)
+        self.admin_id, self.ids = seed(self.db, self.as_of, staff_count=4)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_matches_per_employee_breakdown(self):
+        batched = get_payroll_breakdowns(self.db, self.as_of)
+        self.assertEqual(set(batched), {self.admin_id, *self.ids})
+        for emp_id, pb in batched.items():
+            single = get_payroll_breakdown(self.db, emp_id, self.as_of)
+            self.assertEqual(set(pb), set(single))
+            for key, value in single.items():
+                self.assertAlmostEqual(pb[key], value, places=6, msg=f"{emp_id} {key}")
+
+    def test_query_count_is_fixed(self):
+        with QueryCounter(self.engine) as q:
+            subset = get_payroll_breakdowns(self.db, self.as_of, employee_ids=self.ids[:2])
+        self.assertEqual(set(subset), set(self.ids[:2]))
+        self.assertEqual(q.count, 4)
+        self.assertEqual(get_payroll_breakdowns(self.db, self.as_of, employee_ids=[]), {})
+
+
+class AdminDashboardTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.db = sessionmaker(bind=self.engine)()
+        self.client = api_client(self.engine)
+
+    def tearDown(self):
+        self.db.close()
+
+    def fetch(self):
+        with QueryCounter(self.engine) as q:
+            resp = self.client.get("/api/admin/dashboard?latest=2&top=3")
+        self.assertEqual(resp.status_code, 200, resp.text)
+        return resp.json(), q.count
+
+    def test_figures(self):
+        _, ids = seed(self.db, dt.date.today(), staff_count=3)
+        body, _ = self.fetch()
+        self.assertEqual(body["pending"]["advances"], {"count": 3, "amount": 1800.0})
+        self.assertEqual(body["pending"]["off_days"], {"count": 3, "days": 6.0})
+        month = body["month"]
+        self.assertEqual(month["bills"], {"count": 3, "amount": 303.0})
+        self.assertEqual(month["advances"], {"count": 3, "amount": 1500.0})
+        self.assertEqual(month["salary_payments"], {"count": 3, "amount": 3000.0})
+        self.assertEqual(month["off_days"], {"count": 3, "days": 1.5})
+        self.assertEqual(body["employee_count"], 4)
+
+        balances = [b["remaining_salary"] for b in body["top_balances"]]
+        self.assertEqual(len(balances), 3)
+        self.assertEqual(balances, sorted(balances, reverse=True))
+        expected = get_payroll_breakdowns(self.db, dt.date.today())
+        self.assertAlmostEqual(
+            body["total_remaining_salary"],
+            sum(pb["remaining_salary"] for pb in expected.values()),
+            places=2,
+        )
+        for kind in ("advances", "bills", "off_days", "salary_payments"):
+            self.assertEqual(len(body["latest"][kind]), 2, kind)
+
+    def test_query_count_independent_of_head_count_and_cached(self):
+        seed(self.db, dt.date.today(), staff_count=2)
+        _, small = self.fetch()
+        self.engine.dispose()
+
+        self.engine = memory_engine()
+        self.db.close()
+        self.db = sessionmaker(bind=self.engine)()
+        self.client = api_client(self.engine)
+        seed(self.db, dt.date.today(), staff_count=25)
+        _, large = self.fetch()
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, 12)
+
+        _, cached = self.fetch()
+        self.assertEqual(cached, 0)
+
+    def test_admin_only(self):
+        _, ids = seed(self.db, dt.date.today(), staff_count=1)
+        r = self.client.get("/api/admin/dashboard", headers=token_headers(self, ids[0], Role.STAFF))
+        self.assertEqual(r.status_code, 403)
+        r = self.client.get("/api/admin/dashboard", headers=token_headers(self, None, Role.ADMIN))
+        self.assertEqual(r.status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+Admin alert digest: requests within a window produce one summary.
+"""
+import datetime as dt
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schema import Advance, AdvanceStatus, NotificationOutbox, OutboxStatus, Role
+from app.services import notification_service, outbox_service
+from tests.smtp_sink import SMTPSink
+from tests.support import QueryCounter, add_employee, api_client, memory_engine
+from tests.test_notification_outbox import smtp_settings
+
+WINDOW = dt.timedelta(minutes=15)
+
+
+class AdminDigestTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.client = api_client(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.ann = add_employee(self.db, "Ann", last_name="Kamau")
+        self.ben = add_employee(self.db, "Ben", last_name="Otieno")
+        self.sink = SMTPSink().__enter__()
+        self.patches = [
+            smtp_settings(self.sink),
+            patch.object(notification_service, "ADMIN_ALERT_DIGEST_MINUTES", 15),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+        notification_service.smtp_connections.close()
+        self.sink.__exit__(None, None, None)
+        self.db.close()
+
+    def _outbox(self):
+        self.db.expire_all()
+        return self.db.query(NotificationOutbox).order_by(NotificationOutbox.id).all()
+
+    def _request_advance(self, employee, amount):
+        r = self.client.post("/api/advances", json={"employee_id": employee.id, "amount": amount})
+        self.assertEqual(r.status_code, 201)
+        return r.json()["id"]
+
+    def test_requests_in_a_window_share_one_digest(self):
+        self._request_advance(self.ann, 100)
+        self._request_advance(self.ben, 250)
+        r = self.client.post("/api/off-days", json={
+            "employee_id": self.ben.id, "date": "2026-06-01", "day_count": 2, "off_type": "full"})
+        self.assertEqual(r.status_code, 201)
+
+        [row] = self._outbox()
+        self.assertEqual((row.kind, row.channel), (notification_service.ADMIN_DIGEST_KIND, "email"))
+        self.assertEqual(outbox_service.dispatch_pending(self.db)["sent"], 0)  # not due yet
+
+        due = row.created_at + WINDOW
+        self.assertEqual(outbox_service.dispatch_pending(self.db, now=due)["sent"], 1)
+        [msg] = self.sink.messages
+        self.assertIn("3 pending requests", msg["Subject"])
+        text = msg.get_body(("plain",)).get_content()
+        self.assertIn("Ann Kamau", text)
+        self.assertIn("Advances: 2 (total $350.00)", text)
+        self.assertIn("Days: 2 (full)", text)
+        [row] = self._outbox()
+        self.assertEqual(row.status, OutboxStatus.SENT)
+        self.assertIn("Ben Otieno", row.body)
+
+    def test_request_after_the_window_starts_a_new_digest(self):
+        self._request_advance(self.ann, 100)
+        [first] = self._outbox()
+        outbox_service.dispatch_pending(self.db, now=first.created_at + WINDOW)
+        self._request_advance(self.ben, 50)
+        self.assertEqual([row.status for row in self._outbox()],
+                         [OutboxStatus.SENT, OutboxStatus.PENDING])
+
+    def test_digest_with_nothing_pending_is_dropped(self):
+        advance_id = self._request_advance(self.ann, 100)
+        self.db.get(Advance, advance_id).status = AdvanceStatus.APPROVED
+        self.db.commit()
+        [row] = self._outbox()
+        result = outbox_service.dispatch_pending(self.db, now=row.created_at + WINDOW)
+        self.assertEqual(result, {"sent": 0, "retrying": 0, "failed": 0})
+        self.assertEqual(self._outbox(), [])
+        self.assertEqual(self.sink.connections, 0)
+
+    def test_whatsapp_digest_is_plain_text(self):
+        sent = []
+        with patch.object(notification_service, "ADMIN_NOTIFICATION_WHATSAPP", "whatsapp:+15550001"):
+            self._request_advance(self.ann, 100)
+            self._request_advance(self.ben, 100)
+        rows = self._outbox()
+        self.assertEqual([row.channel for row in rows], ["email", "whatsapp"])
+        outbox_service.dispatch_pending(
+            self.db, now=rows[0].created_at + WINDOW,
+            send=lambda batch: sent.extend(batch) or [None] * len(batch),
+        )
+        whatsapp = next(row for row in sent if row.channel == "whatsapp")
+        self.assertIsNone(whatsapp.body_html)
+        self.assertIn("Advances: 2", whatsapp.body)
+
+    def test_whatsapp_digest_stays_short_with_many_requests(self):
+        sent = []
+        with patch.object(notification_service, "ADMIN_NOTIFICATION_WHATSAPP", "whatsapp:+15550001"), \
+                patch.object(notification_service, "APP_PUBLIC_URL", "https://pay.example.com"):
+            for n in range(60):
+                employee = add_employee(self.db, f"Staff{n}", last_name="With A Long Surname")
+                self.db.add(Advance(employee_id=employee.id, amount_for_advance=10,
+                                    reason="School fees for the new term, due this week"))
+            self.db.commit()
+            self._request_advance(self.ann, 100)
+            rows = self._outbox()
+            outbox_service.dispatch_pending(
+                self.db, now=rows[0].created_at + WINDOW,
+                send=lambda batch: sent.extend(batch) or [None] * len(batch),
+            )
+        email = next(row for row in sent if row.channel == "email")
+        whatsapp = next(row for row in sent if row.channel == "whatsapp")
+        self.assertGreater(len(email.body), 1600)
+        self.assertLessEqual(len(whatsapp.body), 1600)
+        self.assertIn("Advances: 61 (total $700.00)", whatsapp.body)
+        self.assertIn("https://pay.example.com/admin-dashboard", whatsapp.body)
+        self.assertNotIn("Staff0", whatsapp.body)
+
+
+class PendingSummaryTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.db = sessionmaker(bind=self.engine)()
+        self.admin = add_employee(self.db, "Ada", role=Role.ADMIN)
+
+    def tearDown(self):
+        self.db.close()
+
+    def _summary_queries(self, pending: int) -> tuple[int, str]:
+        for n in range(pending):
+            employee = add_employee(self.db, f"Staff{n}")
+            self.db.add(Advance(employee_id=employee.id, amount_for_advance=10 + n))
+        self.db.commit()
+        admin_id = self.admin.id
+        self.db.expire_all()
+        texts = []
+        with patch.object(notification_service, "send_whatsapp_notification",
+                          lambda to, text: texts.append(text)), \
+                QueryCounter(self.engine) as counter:
+            self.assertTrue(notification_service.send_pending_advances_summary(self.db, admin_id))
+        return counter.count, texts[0]
+
+    def test_summary_uses_one_joined_query(self):
+        count, text = self._summary_queries(5)
+        self.assertEqual(count, 2)  # admin + pending advances with names
+        self.assertIn("Total Pending: 5", text)
+        self.assertIn("Employee: Staff4 Test | Amount: $14.00", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+Signed session tokens: issued at login, verified without a database lookup.
+"""
+import datetime as dt
+import unittest
+from unittest.mock import patch
+
+import jwt
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schema import Bill, Role, UserAuth
+from app.services import auth_service
+from app.services.auth_service import (
+    check_permission,
+    decode_access_token,
+    issue_access_token,
+)
+from tests.support import QueryCounter, add_employee, api_client, memory_engine
+
+
+def bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+class AuthTokenTests(unittest.TestCase):
+    def setUp(self):
+        key = patch.object(auth_service, "_signing_key", "test-signing-key")
+        key.start()
+        self.addCleanup(key.stop)
+        self.engine = memory_engine()
+        self.db = sessionmaker(bind=self.engine)()
+        self.client = api_client(self.engine)
+        self.staff_id = add_employee(self.db, "Ann").id
+        self.manager_id = add_employee(self.db, "Ben", role=Role.MANAGER).id
+        self.other_manager_id = add_employee(self.db, "Cleo", role=Role.MANAGER).id
+        self.db.add(UserAuth(employee_id=self.manager_id, first_name="Ben", pin=1234))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def login(self, first_name, pin):
+        return self.client.post("/api/login", json={"first_name": first_name, "pin": pin})
+
+    def bill(self, manager_id, headers=None):
+        return self.client.post(
+            "/api/bills",
+            json={
+                "employee_id": self.staff_id,
+                "manager_id": manager_id,
+                "amount": 100,
+                "date": "2026-10-01",
+            },
+            headers=headers or {},
+        )
+
+    def test_login_issues_token_with_role_claims(self):
+        body = self.login("Ben", 1234).json()
+        self.assertEqual(body["token_type"], "bearer")
+        self.assertGreater(body["expires_in"], 0)
+        claims = decode_access_token(body["access_token"])
+        self.assertEqual(claims.employee_id, self.manager_id)
+        self.assertEqual(claims.role, Role.MANAGER)
+
+    def test_admin_login_token(self):
+        body = self.client.post(
+            "/api/login", json={"username": "admin", "password": "4326"}
+        ).json()
+        claims = decode_access_token(body["access_token"])
+        self.assertIsNone(claims.employee_id)
+        self.assertEqual(claims.role, Role.ADMIN)
+
+    def test_manager_token_creates_bill(self):
+        token = self.login("Ben", 1234).json()["access_token"]
+        resp = self.bill(self.manager_id, bearer(token))
+        self.assertEqual(resp.status_code, 201, resp.text)
+        self.assertEqual(self.db.query(Bill).count(), 1)
+
+    def test_staff_token_is_forbidden(self):
+        token, _ = issue_access_token(self.staff_id, Role.STAFF)
+        self.assertEqual(self.bill(self.manager_id, bearer(token)).status_code, 403)
+
+    def test_token_cannot_record_as_someone_else(self):
+        token, _ = issue_access_token(self.manager_id, Role.MANAGER)
+        self.assertEqual(self.bill(self.other_manager_id, bearer(token)).status_code, 403)
+
+    def test_expired_and_tampered_tokens_are_rejected(self):
+        expired = jwt.encode(
+            {"employee_id": self.manager_id, "role": "manager",
+             "exp": dt.datetime.now(dt.timezone.utc) - dt.timedelta(minutes=1)},
+            auth_service._signing_key,
+            algorithm="HS256",
+        )
+        self.assertEqual(self.bill(self.manager_id, bearer(expired)).status_code, 401)
+        forged = jwt.encode(
+            {"employee_id": self.manager_id, "role": "admin",
+             "exp": dt.datetime.now(dt.timezone.utc) + dt.timedelta(minutes=5)},
+            "not-the-key",
+            algorithm="HS256",
+        )
+        self.assertEqual(self.bill(self.manager_id, bearer(forged)).status_code, 401)
+
+    def test_requests_without_token_still_work_unless_required(self):
+        self.assertEqual(self.bill(self.manager_id).status_code, 201)
+        with patch("main.AUTH_REQUIRE_TOKEN", True):
+            self.assertEqual(self.bill(self.manager_id).status_code, 401)
+
+    def test_no_tokens_without_configured_secret(self):
+        with patch.object(auth_service, "_signing_key", None):
+            body = self.login("Ben", 1234).json()
+            self.assertEqual(body["employee_id"], self.manager_id)
+            self.assertIsNone(body["access_token"])
+            self.assertIsNone(body["expires_in"])
+            with self.assertRaises(ValueError):
+                decode_access_token(issue_access_token(self.manager_id, Role.MANAGER)[0] or "x")
+        self.assertIsNone(auth_service._configured_signing_key("", require_token=False))
+        self.assertEqual(auth_service._configured_signing_key("s3cret", require_token=True), "s3cret")
+        with self.assertRaises(RuntimeError):
+            auth_service._configured_signing_key("", require_token=True)
+
+    def test_claims_answer_permission_checks_without_queries(self):
+        token, _ = issue_access_token(self.manager_id, Role.MANAGER)
+        claims = decode_access_token(token)
+        with QueryCounter(self.engine) as q:
+            self.assertTrue(check_permission(self.db, self.manager_id, Role.MANAGER, claims))
+            self.assertFalse(check_permission(self.db, self.manager_id, Role.ADMIN, claims))
+        self.assertEqual(q.count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
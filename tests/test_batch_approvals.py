@@ -0,0 +1,151 @@
+"""
+Batch approval endpoints for advances and off days.
+"""
+import datetime as dt
+import unittest
+
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.schema import Advance, AdvanceStatus, Employee, OffDay, OffDayStatus
+from app.services.payroll_service import get_payroll_breakdowns
+from tests.support import add_employee, api_client, memory_engine
+
+
+class BatchApprovalTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.client = api_client(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.ann = add_employee(self.db, "Ann", salary=31000.0)
+        self.ben = add_employee(self.db, "Ben", salary=31000.0)
+
+    def tearDown(self):
+        self.db.close()
+
+    def _advance(self, employee, amount, minutes_ago=0, status=AdvanceStatus.PENDING):
+        advance = Advance(
+            employee_id=employee.id, amount_for_advance=amount, status=status,
+            created_at=dt.datetime.utcnow() - dt.timedelta(minutes=minutes_ago),
+        )
+        self.db.add(advance)
+        self.db.commit()
+        return advance.id
+
+    def _remaining(self, employee) -> float:
+        return get_payroll_breakdowns(self.db, dt.date.today(), [employee.id])[employee.id]["remaining_salary"]
+
+    def test_approvals_add_up_per_employee_oldest_first(self):
+        share = round(self._remaining(self.ann) * 0.6, 2)
+        older = self._advance(self.ann, share, minutes_ago=10)
+        newer = self._advance(self.ann, share, minutes_ago=5)
+        bens = self._advance(self.ben, share)
+
+        r = self.client.post("/api/advances/approve-batch", json={"decisions": [
+            {"id": newer, "approved": True},
+            {"id": older, "approved": True, "notes": "ok"},
+            {"id": bens, "approved": True},
+        ]})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual([(x["id"], x["result"]) for x in r.json()],
+                         [(newer, "auto_denied"), (older, "approved"), (bens, "approved")])
+
+        self.db.expire_all()
+        self.assertEqual(self.db.get(Advance, older).status, AdvanceStatus.APPROVED)
+        self.assertEqual(self.db.get(Advance, older).approval_notes, "ok")
+        denied = self.db.get(Advance, newer)
+        self.assertEqual(denied.status, AdvanceStatus.DENIED)
+        self.assertIn("AUTO-REJECTED", denied.approval_notes)
+        self.assertAlmostEqual(r.json()[0]["remaining_salary"], self._remaining(self.ann), places=2)
+
+    def test_every_id_gets_a_result(self):
+        pending = self._advance(self.ann, 100)
+        done = self._advance(self.ann, 100, status=AdvanceStatus.APPROVED)
+        r = self.client.post("/api/advances/approve-batch", json={"decisions": [
+            {"id": pending, "approved": False, "notes": "No"},
+            {"id": done, "approved": True},
+            {"id": 9999, "approved": True},
+        ]})
+        self.assertEqual(
+            [(x["result"], x["status"]) for x in r.json()],
+            [("denied", "denied"), ("already_decided", "approved"), ("not_found", None)],
+        )
+
+    def test_duplicate_ids_are_rejected(self):
+        advance_id = self._advance(self.ann, 100)
+        r = self.client.post("/api/advances/approve-batch", json={"decisions": [
+            {"id": advance_id, "approved": True}, {"id": advance_id, "approved": False}]})
+        self.assertEqual(r.status_code, 400)
+        self.db.expire_all()
+        self.assertEqual(self.db.get(Advance, advance_id).status, AdvanceStatus.PENDING)
+
+    def _postgres_statements(self, call):
+        """Run ``call`` and return its ORM statements as PostgreSQL would receive them."""
+        seen = []
+
+        def record(state):
+            seen.append(str(state.statement.compile(dialect=postgresql.dialect())))
+
+        event.listen(Session, "do_orm_execute", record)
+        try:
+            self.assertEqual(call().status_code, 200)
+        finally:
+            event.remove(Session, "do_orm_execute", record)
+        return seen
+
+    def _assert_employee_locked_before_net_pay(self, statements):
+        lock = next(i for i, sql in enumerate(statements)
+                    if "FROM employee" in sql and sql.endswith("FOR UPDATE"))
+        advance_lock = next(i for i, sql in enumerate(statements)
+                            if "FROM advance" in sql and "FOR UPDATE" in sql)
+        net_pay = next(i for i, sql in enumerate(statements) if "FROM bill" in sql)
+        self.assertLess(advance_lock, lock)
+        self.assertLess(lock, net_pay)
+
+    def test_single_and_batch_approvals_lock_the_employee(self):
+        single = self._advance(self.ann, 100)
+        batch = self._advance(self.ann, 100)
+        self._assert_employee_locked_before_net_pay(self._postgres_statements(
+            lambda: self.client.put(f"/api/advances/{single}/approve", json={"approved": True})))
+        self._assert_employee_locked_before_net_pay(self._postgres_statements(
+            lambda: self.client.post("/api/advances/approve-batch",
+                                     json={"decisions": [{"id": batch, "approved": True}]})))
+
+    def test_approvals_add_up_across_transactions(self):
+        share = round(self._remaining(self.ann) * 0.6, 2)
+        first = self._advance(self.ann, share, minutes_ago=10)
+        second = self._advance(self.ann, share, minutes_ago=5)
+        third = self._advance(self.ann, share)
+        r = self.client.put(f"/api/advances/{first}/approve", json={"approved": True})
+        self.assertEqual(r.json()["status"], "approved")
+        r = self.client.post("/api/advances/approve-batch",
+                             json={"decisions": [{"id": second, "approved": True}]})
+        self.assertEqual(r.json()[0]["result"], "auto_denied")
+        r = self.client.put(f"/api/advances/{third}/approve", json={"approved": True})
+        self.assertEqual(r.json()["status"], "denied")
+        self.assertGreaterEqual(self._remaining(self.ann), 0)
+
+    def test_off_day_batch_updates_attendance(self):
+        today = dt.date.today()
+        offs = []
+        for employee in (self.ann, self.ann, self.ben):
+            off = OffDay(employee_id=employee.id, date=today.replace(day=1), day_count=1,
+                         off_type="full", status=OffDayStatus.PENDING)
+            self.db.add(off)
+            self.db.commit()
+            offs.append(off.id)
+
+        r = self.client.post("/api/off-days/approve-batch", json={"decisions": [
+            {"id": offs[0], "approved": True},
+            {"id": offs[1], "approved": True},
+            {"id": offs[2], "approved": False},
+        ]})
+        self.assertEqual([x["result"] for x in r.json()], ["approved", "approved", "denied"])
+        self.db.expire_all()
+        self.assertEqual(self.db.get(Employee, self.ann.id).days_worked_this_month, today.day - 2)
+        self.assertEqual(self.db.get(OffDay, offs[2]).status, OffDayStatus.DENIED)
+
+
+if __name__ == "__main__":
+    unittest.main()
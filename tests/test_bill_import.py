@@ -0,0 +1,106 @@
+"""
+Bulk bill import: CSV / JSON, all-or-nothing validation, batched warnings.
+"""
+import asyncio
+import unittest
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schema import Bill, Role
+from app.services.event_hub import event_hub
+from tests.support import QueryCounter, add_employee, api_client, memory_engine
+
+
+class BillImportTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.client = api_client(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.manager = add_employee(self.db, "Mia", role=Role.MANAGER)
+        self.admin = add_employee(self.db, "Ada", role=Role.ADMIN)
+        self.staff = [add_employee(self.db, f"Staff{n}", salary=3000.0) for n in range(4)]
+
+    def tearDown(self):
+        self.db.close()
+
+    def _bills(self):
+        self.db.expire_all()
+        return self.db.query(Bill).order_by(Bill.id).all()
+
+    def test_csv_import_inserts_every_row(self):
+        lines = ["employee_id,amount,date,reason"] + [
+            f"{e.id},{10 * (n + 1)},2026-05-0{n + 1},Meal {n}" for n, e in enumerate(self.staff)
+        ]
+        r = self.client.post(f"/api/bills/import?manager_id={self.manager.id}",
+                             content="\n".join(lines), headers={"Content-Type": "text/csv"})
+        self.assertEqual(r.status_code, 201, r.text)
+        bills = self._bills()
+        self.assertEqual(r.json()["ids"], [b.id for b in bills])
+        self.assertEqual([b.amount_billed for b in bills], [10, 20, 30, 40])
+        self.assertEqual({b.recorded_by_id for b in bills}, {self.manager.id})
+        self.assertEqual(bills[1].reason, "Meal 1")
+        self.assertEqual(r.json()["warnings"], [])
+
+    def test_insert_and_warnings_do_not_grow_with_rows(self):
+        def import_queries(count):
+            rows = [{"employee_id": self.staff[n % 4].id, "amount": 1} for n in range(count)]
+            with QueryCounter(self.engine) as counter:
+                r = self.client.post(f"/api/bills/import?manager_id={self.admin.id}", json=rows)
+            self.assertEqual(r.status_code, 201)
+            return counter.count
+
+        import_queries(1)  # warms the employee directory
+        self.assertEqual(import_queries(4), import_queries(40))
+
+    def test_any_invalid_row_rejects_the_import(self):
+        rows = [
+            {"employee_id": self.staff[0].id, "amount": 5},
+            {"employee_id": self.staff[1].id, "amount": -1},
+            {"employee_id": 9999, "amount": 5},
+            {"employee_id": self.admin.id, "amount": 5},
+            {"employee_id": self.manager.id, "amount": 5},
+            {"employee_id": self.staff[2].id, "amount": 5, "date": "May 1"},
+        ]
+        r = self.client.post(f"/api/bills/import?manager_id={self.manager.id}", json=rows)
+        self.assertEqual(r.status_code, 422)
+        self.assertEqual([e["row"] for e in r.json()["detail"]["errors"]], [2, 3, 4, 5, 6])
+        self.assertEqual(self._bills(), [])
+
+    def test_non_finite_amounts_are_row_errors(self):
+        lines = ["employee_id,amount"] + [f"{self.staff[0].id},{v}" for v in ("5", "inf", "-inf", "nan", "1e999")]
+        r = self.client.post(f"/api/bills/import?manager_id={self.manager.id}",
+                             content="\n".join(lines), headers={"Content-Type": "text/csv"})
+        self.assertEqual(r.status_code, 422)
+        errors = r.json()["detail"]["errors"]
+        self.assertEqual([e["row"] for e in errors], [2, 3, 4, 5])
+        self.assertIn("finite", errors[0]["error"])
+        self.assertEqual(self._bills(), [])
+
+    def test_negative_balances_are_reported(self):
+        rows = [{"employee_id": self.staff[0].id, "amount": 1_000_000, "manager_id": self.admin.id}]
+        r = self.client.post("/api/bills/import", json=rows)
+        [warning] = r.json()["warnings"]
+        self.assertEqual(warning["employee_id"], self.staff[0].id)
+        self.assertLess(warning["remaining_salary"], 0)
+
+    def test_unreadable_body_is_a_bad_request(self):
+        r = self.client.post(f"/api/bills/import?manager_id={self.admin.id}",
+                             content="amount\n5", headers={"Content-Type": "text/csv"})
+        self.assertEqual(r.status_code, 400)
+        self.assertIn("employee_id", r.json()["detail"])
+
+    def test_created_events_are_published(self):
+        async def collect():
+            with event_hub.subscribe({"bill.created"}) as sub:
+                rows = [{"employee_id": e.id, "amount": 5} for e in self.staff[:2]]
+                await asyncio.to_thread(
+                    self.client.post, f"/api/bills/import?manager_id={self.admin.id}", json=rows
+                )
+                return [await sub.get(1.0), await sub.get(1.0)]
+
+        events = asyncio.run(collect())
+        self.assertEqual([e["employee_id"] for e in events], [e.id for e in self.staff[:2]])
+
+
+if __name__ == "__main__":
+    unittest.main()
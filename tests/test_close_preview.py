@@ -0,0 +1,132 @@
+"""
+Period-close preview: same figures as closing for real, no writes, streamed tables.
+"""
+import csv
+import datetime as dt
+import io
+import json
+import unittest
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schema import (
+    Advance,
+    AdvanceStatus,
+    Bill,
+    Employee,
+    PayrollPeriodClose,
+    Role,
+    SalaryPayment,
+)
+from app.services.employee_directory import employee_directory
+from app.services.payroll_service import (
+    CLOSE_PREVIEW_COLUMNS,
+    close_employee_payroll_period,
+    iter_payroll_period_close_preview,
+)
+from tests.support import QueryCounter, add_employee, api_client, memory_engine, token_headers
+
+YEAR, MONTH = 2026, 5
+
+
+class ClosePreviewTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.client = api_client(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.admin = add_employee(self.db, "Ada", role=Role.ADMIN)
+        self.staff = [
+            add_employee(self.db, f"Staff{n}", salary=3100.0 * (n + 1), salary_arrears=50.0 * n)
+            for n in range(4)
+        ]
+        ann, ben = self.staff[:2]
+        self.db.add_all([
+            Bill(employee_id=ann.id, billed_employee_id=ann.id, amount_billed=120.0,
+                 date=dt.datetime(YEAR, MONTH, 3), recorded_by_id=self.admin.id),
+            Advance(employee_id=ben.id, amount_for_advance=400.0, status=AdvanceStatus.APPROVED,
+                    approved_at=dt.datetime(YEAR, MONTH, 10)),
+            SalaryPayment(employee_id=ben.id, paid_by_id=self.admin.id, amount_paid=1000.0,
+                          payment_date=dt.date(YEAR, MONTH, 28), payroll_year=YEAR, payroll_month=MONTH),
+        ])
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _preview(self, fmt="json"):
+        return self.client.get(
+            f"/api/admin/payroll/close-period/preview?year={YEAR}&month={MONTH}&format={fmt}"
+        )
+
+    def test_admin_only(self):
+        path = f"/api/admin/payroll/close-period/preview?year={YEAR}&month={MONTH}"
+        staff = self.client.get(path, headers=token_headers(self, self.staff[0].id, Role.STAFF))
+        self.assertEqual(staff.status_code, 403)
+        admin = self.client.get(path, headers=token_headers(self, self.admin.id, Role.ADMIN))
+        self.assertEqual(admin.status_code, 200)
+
+    def test_matches_closing_for_real_and_writes_nothing(self):
+        arrears = {e.id: e.salary_arrears for e in self.staff}
+        r = self._preview()
+        self.assertEqual(r.status_code, 200, r.text)
+        rows = {row["employee_id"]: row for row in r.json()}
+        self.assertEqual(self.db.query(PayrollPeriodClose).count(), 0)
+        self.db.expire_all()
+        self.assertEqual({e.id: e.salary_arrears for e in self.staff}, arrears)
+
+        for employee in [self.admin] + self.staff:
+            closed = close_employee_payroll_period(self.db, employee.id, YEAR, MONTH)
+            preview = rows[employee.id]
+            self.assertEqual(preview["employee_name"], f"{employee.first_name} Test")
+            for key, value in closed.items():
+                if isinstance(value, float):
+                    self.assertAlmostEqual(preview[key], value, places=6, msg=key)
+                else:
+                    self.assertEqual(preview[key], value, key)
+
+    def test_closed_employees_report_what_was_rolled(self):
+        first = self.staff[0].id
+        rolled = close_employee_payroll_period(self.db, first, YEAR, MONTH)["rolled_unpaid"]
+        row = next(x for x in self._preview().json() if x["employee_id"] == first)
+        self.assertTrue(row["already_closed"])
+        self.assertAlmostEqual(row["rolled_unpaid"], rolled, places=6)
+        self.assertIsNone(row["salary_arrears_after"])
+
+    def test_csv_and_ndjson_tables(self):
+        r = self._preview("csv")
+        self.assertTrue(r.headers["content-type"].startswith("text/csv"))
+        self.assertIn("payroll-close-preview-2026-05.csv", r.headers["content-disposition"])
+        table = list(csv.reader(io.StringIO(r.text)))
+        self.assertEqual(tuple(table[0]), CLOSE_PREVIEW_COLUMNS)
+        self.assertEqual(len(table), 6)
+
+        lines = [json.loads(line) for line in self._preview("ndjson").text.splitlines()]
+        self.assertEqual([x["employee_id"] for x in lines], [self.admin.id] + [e.id for e in self.staff])
+        self.assertEqual(set(lines[0]), set(CLOSE_PREVIEW_COLUMNS))
+
+    def test_out_of_range_year_is_rejected(self):
+        for path in ("close-period/preview", "register", "payslips"):
+            for year in (0, 10000):
+                r = self.client.get(f"/api/admin/payroll/{path}?year={year}&month=5")
+                self.assertEqual(r.status_code, 422, (path, year))
+
+    def test_queries_per_batch_do_not_grow_with_employees(self):
+        employee_directory.warm(self.db)
+        with QueryCounter(self.engine) as q:
+            batches = list(iter_payroll_period_close_preview(self.db, YEAR, MONTH, batch_size=2))
+        self.assertEqual([len(b) for b in batches], [2, 2, 1])
+        # Employee ids once, then per batch: employees, bills, advances,
+        # off days, tagged payments, closes
+        self.assertEqual(q.count, 1 + 6 * 3)
+
+        for n in range(6):
+            add_employee(self.db, f"Extra{n}")
+        employee_directory.warm(self.db)
+        ids = [e.id for e in self.db.query(Employee).all()]
+        with QueryCounter(self.engine) as q:
+            list(iter_payroll_period_close_preview(self.db, YEAR, MONTH, ids, batch_size=100))
+        self.assertEqual(q.count, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
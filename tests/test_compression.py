@@ -0,0 +1,152 @@
+"""
+gzip / brotli negotiation for API responses and precompressed static bundles.
+"""
+import gzip
+import tempfile
+import unittest
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.utils import compression
+from app.utils.compression import (
+    IMMUTABLE_CACHE_CONTROL,
+    CompressionMiddleware,
+    PrecompressedStaticFiles,
+    negotiate,
+)
+from scripts import precompress_static
+from tests.support import add_employee, api_client, memory_engine
+
+GZIP_ONLY = {"Accept-Encoding": "gzip"}
+
+
+class NegotiationTests(unittest.TestCase):
+    def test_q_values_and_preference(self):
+        self.assertEqual(negotiate("gzip, br", ("br", "gzip")), "br")
+        self.assertEqual(negotiate("br;q=0.5, gzip", ("br", "gzip")), "gzip")
+        self.assertEqual(negotiate("*", ("gzip",)), "gzip")
+        self.assertIsNone(negotiate("gzip;q=0", ("gzip",)))
+        self.assertIsNone(negotiate("identity", ("br", "gzip")))
+        self.assertIsNone(negotiate(None, ("gzip",)))
+
+
+class CompressionMiddlewareTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.client = api_client(self.engine)
+        db = sessionmaker(bind=self.engine)()
+        for i in range(40):
+            add_employee(db, f"Person{i:02d}")
+        db.close()
+
+    def test_large_listing_is_gzipped_and_still_revalidates(self):
+        r = self.client.get("/api/employees", headers=GZIP_ONLY)
+        self.assertEqual(r.headers["content-encoding"], "gzip")
+        self.assertIn("Accept-Encoding", r.headers["vary"])
+        self.assertEqual(len(r.json()), 40)  # the client decodes transparently
+        etag = r.headers["etag"]
+
+        again = self.client.get(
+            "/api/employees", headers={**GZIP_ONLY, "If-None-Match": etag}
+        )
+        self.assertEqual(again.status_code, 304)
+
+    def test_small_or_unaccepted_responses_pass_through(self):
+        tiny = self.client.get("/health", headers=GZIP_ONLY)
+        self.assertNotIn("content-encoding", tiny.headers)
+        plain = self.client.get("/api/employees", headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("content-encoding", plain.headers)
+
+
+class StreamingCompressionTests(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+        app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+        @app.get("/csv")
+        def csv_stream():
+            return StreamingResponse(
+                (f"{i},row {i}\n" for i in range(500)), media_type="text/csv"
+            )
+
+        @app.get("/events")
+        def events():
+            return StreamingResponse(
+                iter(["data: x\n\n"] * 50), media_type="text/event-stream"
+            )
+
+        @app.get("/bytes")
+        def raw():
+            return PlainTextResponse("a" * 5000, headers={"Cache-Control": "no-transform"})
+
+        self.client = TestClient(app)
+
+    def test_streams_are_compressed_incrementally(self):
+        r = self.client.get("/csv", headers=GZIP_ONLY)
+        self.assertEqual(r.headers["content-encoding"], "gzip")
+        self.assertNotIn("content-length", r.headers)
+        self.assertEqual(r.text.splitlines()[-1], "499,row 499")
+
+    def test_event_streams_and_no_transform_are_untouched(self):
+        self.assertNotIn("content-encoding", self.client.get("/events", headers=GZIP_ONLY).headers)
+        self.assertNotIn("content-encoding", self.client.get("/bytes", headers=GZIP_ONLY).headers)
+
+
+class PrecompressedStaticTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        assets = self.root / "dash" / "assets"
+        assets.mkdir(parents=True)
+        self.bundle = "console.log('hello');\n" * 400
+        (assets / "index-AbCd1234.js").write_text(self.bundle)
+        (self.root / "app.css").write_text("body { color: red; }\n" * 100)
+        (self.root / "backup.tar.gz").write_bytes(b"not ours")
+
+        app = FastAPI()
+        app.mount("/static", PrecompressedStaticFiles(directory=str(self.root)))
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_build_step_writes_gzip_siblings_for_hashed_assets_only(self):
+        stats = precompress_static.precompress(self.root)
+        gz = self.root / "dash" / "assets" / "index-AbCd1234.js.gz"
+        self.assertTrue(gz.exists())
+        self.assertEqual(gzip.decompress(gz.read_bytes()).decode(), self.bundle)
+        self.assertFalse((self.root / "app.css.gz").exists())
+        self.assertTrue((self.root / "backup.tar.gz").exists())
+        self.assertGreaterEqual(stats["written"], 1)
+        self.assertEqual(precompress_static.precompress(self.root)["written"], 0)
+
+    def test_serves_precompressed_sibling_with_immutable_caching(self):
+        precompress_static.precompress(self.root)
+        r = self.client.get("/static/dash/assets/index-AbCd1234.js", headers=GZIP_ONLY)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.headers["content-encoding"], "gzip")
+        self.assertEqual(r.headers["cache-control"], IMMUTABLE_CACHE_CONTROL)
+        self.assertIn("javascript", r.headers["content-type"])
+        self.assertEqual(r.text, self.bundle)
+
+        identity = self.client.get(
+            "/static/dash/assets/index-AbCd1234.js", headers={"Accept-Encoding": "identity"}
+        )
+        self.assertNotIn("content-encoding", identity.headers)
+        self.assertEqual(identity.text, self.bundle)
+
+        other = self.client.get("/static/app.css", headers=GZIP_ONLY)
+        self.assertEqual(other.headers["cache-control"], "no-cache")
+
+    def test_script_pattern_matches_the_app(self):
+        self.assertEqual(
+            precompress_static.HASHED_ASSET_PATTERN, compression.HASHED_ASSET_PATTERN
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+ETag / If-None-Match on dashboard read endpoints.
+"""
+import datetime as dt
+import unittest
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schema import Bill, Role
+from app.utils.etag import etag_matches
+from tests.support import QueryCounter, add_employee, api_client, memory_engine
+
+
+class ConditionalGetTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.client = api_client(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.staff_id = add_employee(self.db, "Ann").id
+        self.manager_id = add_employee(self.db, "Ben", role=Role.MANAGER).id
+
+    def tearDown(self):
+        self.db.close()
+
+    def _add_bill(self, amount):
+        self.db.add(
+            Bill(
+                employee_id=self.staff_id,
+                billed_employee_id=self.staff_id,
+                amount_billed=amount,
+                date=dt.datetime(2026, 5, 3),
+                recorded_by_id=self.manager_id,
+            )
+        )
+        self.db.commit()
+
+    def test_304_skips_the_computation(self):
+        first = self.client.get("/api/admin/salary-summary")
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers["etag"]
+        self.assertTrue(etag.startswith('"'))
+
+        with QueryCounter(self.engine) as q:
+            again = self.client.get(
+                "/api/admin/salary-summary", headers={"If-None-Match": etag}
+            )
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.headers["etag"], etag)
+        self.assertEqual(q.count, 1)  # the version probe only
+
+    def test_write_changes_etag(self):
+        self._add_bill(100)
+        etag = self.client.get("/api/admin/bills").headers["etag"]
+        self._add_bill(200)
+        r = self.client.get("/api/admin/bills", headers={"If-None-Match": etag})
+        self.assertEqual(r.status_code, 200)
+        self.assertNotEqual(r.headers["etag"], etag)
+        self.assertEqual(len(r.json()), 2)
+
+    def test_etag_differs_per_url(self):
+        a = self.client.get(f"/api/manager/{self.manager_id}/recent-bills?limit=5")
+        b = self.client.get(f"/api/manager/{self.manager_id}/recent-bills?limit=10")
+        self.assertNotEqual(a.headers["etag"], b.headers["etag"])
+
+    def test_employees_list(self):
+        etag = self.client.get("/api/employees").headers["etag"]
+        r = self.client.get("/api/employees", headers={"If-None-Match": f"W/{etag}"})
+        self.assertEqual(r.status_code, 304)
+
+    def test_etag_matches(self):
+        self.assertTrue(etag_matches('"a", "b"', '"b"'))
+        self.assertTrue(etag_matches("*", '"b"'))
+        self.assertFalse(etag_matches(None, '"b"'))
+        self.assertFalse(etag_matches('"a"', '"b"'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Process-wide employee directory: warm-up, TTL and write invalidation.
+"""
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schema import Employee, Role
+from app.services.employee_directory import EmployeeDirectory, employee_directory
+from tests.support import QueryCounter, add_employee, api_client, memory_engine
+
+
+class EmployeeDirectoryTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.db = sessionmaker(bind=self.engine)()
+        employee_directory.clear()
+        self.ann_id = add_employee(self.db, "Ann", last_name="Kamau").id
+        self.ben_id = add_employee(self.db, "Ben", role=Role.MANAGER).id
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_warm_then_lookups_are_free(self):
+        directory = EmployeeDirectory(ttl_seconds=60)
+        self.assertEqual(directory.warm(self.db), 2)
+        with QueryCounter(self.engine) as q:
+            rec = directory.get(self.db, self.ann_id)
+            many = directory.get_many(self.db, [self.ann_id, self.ben_id])
+        self.assertEqual(q.count, 0)
+        self.assertEqual(rec.full_name, "Ann Kamau")
+        self.assertEqual(many[self.ben_id].role, Role.MANAGER)
+        self.assertFalse(hasattr(rec, "__dict__"))
+
+    def test_ttl_expiry_reloads(self):
+        directory = EmployeeDirectory(ttl_seconds=10)
+        with patch("app.services.employee_directory.time.monotonic", return_value=100.0):
+            directory.warm(self.db)
+        with patch("app.services.employee_directory.time.monotonic", return_value=105.0):
+            with QueryCounter(self.engine) as fresh:
+                directory.get(self.db, self.ann_id)
+        with patch("app.services.employee_directory.time.monotonic", return_value=111.0):
+            with QueryCounter(self.engine) as stale:
+                directory.get(self.db, self.ann_id)
+        self.assertEqual(fresh.count, 0)
+        self.assertEqual(stale.count, 1)
+
+    def test_orm_update_invalidates(self):
+        employee_directory.warm(self.db)
+        ann = self.db.get(Employee, self.ann_id)
+        ann.last_name = "Wanjiru"
+        self.db.commit()
+        self.assertEqual(employee_directory.get(self.db, self.ann_id).full_name, "Ann Wanjiru")
+
+    def test_unknown_id(self):
+        employee_directory.warm(self.db)
+        self.assertIsNone(employee_directory.get(self.db, 999))
+
+    def test_create_bill_skips_employee_queries_when_warm(self):
+        client = api_client(self.engine)
+        employee_directory.warm(self.db)
+        with QueryCounter(self.engine) as q:
+            r = client.post(
+                "/api/bills",
+                json={
+                    "manager_id": self.ben_id,
+                    "employee_id": self.ann_id,
+                    "amount": 100,
+                    "date": "2026-05-03",
+                },
+            )
+        self.assertEqual(r.status_code, 201, r.text)
+        employee_reads = [s for s in q.statements if "FROM employee" in s]
+        # Only the net-pay computation (salary, arrears) still reads the row
+        self.assertEqual(len(employee_reads), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Bulk employee stats: same figures as GET /api/employees/{id}, fixed query count.
+"""
+import datetime as dt
+import unittest
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schema import Advance, AdvanceStatus, Bill, OffDay, OffDayStatus, Role
+from tests.support import QueryCounter, add_employee, api_client, memory_engine
+
+
+class BulkEmployeeStatsTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.client = api_client(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.manager = add_employee(self.db, "Mia", role=Role.MANAGER)
+        self.staff = []
+
+    def tearDown(self):
+        self.db.close()
+
+    def _add_staff(self, n):
+        today = dt.date.today()
+        for i in range(n):
+            emp = add_employee(
+                self.db, f"S{len(self.staff):02d}",
+                employment_start_date=today - dt.timedelta(days=40 + i),
+            )
+            self.staff.append(emp)
+            self.db.add_all([
+                OffDay(employee_id=emp.id, date=today, day_count=1,
+                       off_type="half" if i % 2 else "full", status=OffDayStatus.APPROVED),
+                OffDay(employee_id=emp.id, date=today - dt.timedelta(days=35), day_count=2,
+                       status=OffDayStatus.APPROVED),
+                Bill(employee_id=emp.id, billed_employee_id=emp.id, amount_billed=10 + i,
+                     date=dt.datetime.combine(today, dt.time()), recorded_by_id=self.manager.id),
+                Advance(employee_id=emp.id, amount_for_advance=100, status=AdvanceStatus.APPROVED,
+                        approved_at=dt.datetime.now()),
+            ])
+        self.db.commit()
+
+    def test_matches_single_employee_endpoint(self):
+        self._add_staff(4)
+        ids = ",".join(str(e.id) for e in self.staff)
+        bulk = self.client.get("/api/employees/stats", params={"ids": ids})
+        self.assertEqual(bulk.status_code, 200)
+        by_id = {row["employee_id"]: row for row in bulk.json()}
+        self.assertEqual(set(by_id), {e.id for e in self.staff})
+        for emp in self.staff:
+            single = self.client.get(f"/api/employees/{emp.id}").json()
+            self.assertEqual(by_id[emp.id], single)
+
+    def test_query_count_does_not_grow_with_team_size(self):
+        self._add_staff(2)
+        with QueryCounter(self.engine) as few:
+            self.client.get("/api/employees/stats", params={"role": "staff"})
+        self._add_staff(20)
+        with QueryCounter(self.engine) as many:
+            r = self.client.get("/api/employees/stats", params={"role": "staff"})
+        self.assertEqual(len(r.json()), 22)
+        self.assertEqual(many.count, few.count)
+        self.assertFalse(any(s.lstrip().startswith("UPDATE") for s in many.statements))
+
+    def test_filters_and_errors(self):
+        self._add_staff(1)
+        everyone = self.client.get("/api/employees/stats").json()
+        self.assertEqual(len(everyone), 2)
+        self.assertEqual(self.client.get("/api/employees/stats", params={"role": "boss"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/employees/stats", params={"ids": "1,x"}).status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Live admin events: ORM writes -> hub (after commit) -> SSE frames.
+"""
+import asyncio
+import json
+import unittest
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schema import Advance, Role
+from app.services.event_hub import event_hub, format_sse, sse_stream
+from tests.support import add_employee, api_client, memory_engine
+
+
+async def collect(subscription, count, timeout=2.0):
+    events = []
+    for _ in range(count):
+        evt = await subscription.get(timeout)
+        if evt is None:
+            break
+        events.append(evt)
+    return events
+
+
+class FakeRequest:
+    def __init__(self, polls_before_disconnect):
+        self.polls = polls_before_disconnect
+
+    async def is_disconnected(self):
+        self.polls -= 1
+        return self.polls < 0
+
+
+class EventStreamTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.db = sessionmaker(bind=self.engine)()
+        self.client = api_client(self.engine)
+        self.staff_id = add_employee(self.db, "Ann").id
+        self.admin_id = add_employee(self.db, "Root", role=Role.ADMIN).id
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_writes_publish_after_commit(self):
+        async def scenario():
+            with event_hub.subscribe() as sub:
+                resp = await asyncio.to_thread(
+                    self.client.post,
+                    "/api/advances",
+                    json={"employee_id": self.staff_id, "amount": 50, "reason": "Fare"},
+                )
+                advance_id = resp.json()["id"]
+                await asyncio.to_thread(
+                    self.client.put,
+                    f"/api/advances/{advance_id}/approve",
+                    json={"approved": False},
+                )
+                return advance_id, await collect(sub, 2)
+
+        advance_id, events = asyncio.run(scenario())
+        self.assertEqual([e["type"] for e in events], ["advance.created", "advance.denied"])
+        self.assertEqual(events[0]["id"], advance_id)
+        self.assertEqual(events[0]["employee_id"], self.staff_id)
+        self.assertEqual(events[0]["amount"], 50.0)
+        self.assertLess(events[0]["seq"], events[1]["seq"])
+
+    def test_rollback_publishes_nothing_and_types_filter(self):
+        async def scenario():
+            with event_hub.subscribe({"bill.created"}) as bills, event_hub.subscribe() as everything:
+                def write():
+                    db = sessionmaker(bind=self.engine)()
+                    db.add(Advance(employee_id=self.staff_id, amount_for_advance=10))
+                    db.flush()
+                    db.rollback()
+                    db.add(Advance(employee_id=self.staff_id, amount_for_advance=20))
+                    db.commit()
+                    db.close()
+
+                await asyncio.to_thread(write)
+                return await collect(bills, 1, timeout=0.2), await collect(everything, 2, timeout=0.2)
+
+        bills, everything = asyncio.run(scenario())
+        self.assertEqual(bills, [])
+        self.assertEqual([e["amount"] for e in everything], [20.0])
+
+    def test_sse_frames(self):
+        async def scenario():
+            frames = []
+            stream = sse_stream(FakeRequest(polls_before_disconnect=2), heartbeat=0.05)
+            frames.append(await stream.__anext__())  # retry hint; subscribed now
+            event_hub.publish({"type": "bill.created", "id": 7})
+            async for frame in stream:
+                frames.append(frame)
+            return frames
+
+        frames = asyncio.run(scenario())
+        self.assertEqual(frames[0], "retry: 5000\n\n")
+        self.assertTrue(frames[1].startswith("id: "))
+        self.assertIn("event: bill.created\n", frames[1])
+        self.assertEqual(frames[2], ": keep-alive\n\n")
+        self.assertEqual(event_hub.subscriber_count, 0)
+
+    def test_format_sse(self):
+        frame = format_sse({"type": "advance.created", "id": 3, "seq": 9})
+        head, data = frame.rstrip("\n").rsplit("\n", 1)
+        self.assertEqual(head, "id: 9\nevent: advance.created")
+        self.assertEqual(json.loads(data.removeprefix("data: "))["id"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
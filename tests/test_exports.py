@@ -0,0 +1,91 @@
+"""
+Streaming CSV / NDJSON exports (in-memory SQLite through the API).
+"""
+import csv
+import datetime as dt
+import io
+import json
+import unittest
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schema import Advance, AdvanceStatus, Bill, Role
+from app.services.export_service import stream_csv
+from tests.support import add_employee, api_client, memory_engine, token_headers
+
+
+class ExportTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.client = api_client(self.engine)
+        db = sessionmaker(bind=self.engine)()
+        self.staff = add_employee(db, "Ann", last_name="Kamau")
+        self.manager = add_employee(db, "Ben", role=Role.MANAGER, last_name="Otieno")
+        self.staff_id, self.manager_id = self.staff.id, self.manager.id
+        for i in range(5):
+            db.add(
+                Bill(
+                    employee_id=self.staff.id,
+                    billed_employee_id=self.staff.id,
+                    amount_billed=100.0 + i,
+                    date=dt.datetime(2026, 5, 1 + i),
+                    reason="lunch, extra" if i == 0 else None,
+                    recorded_by_id=self.manager.id,
+                )
+            )
+        db.add(
+            Advance(
+                employee_id=self.staff.id,
+                amount_for_advance=500.0,
+                status=AdvanceStatus.APPROVED,
+            )
+        )
+        db.commit()
+        db.close()
+
+    def test_bills_csv(self):
+        r = self.client.get("/api/admin/export/bills?format=csv")
+        self.assertEqual(r.status_code, 200)
+        self.assertTrue(r.headers["content-type"].startswith("text/csv"))
+        self.assertIn("attachment;", r.headers["content-disposition"])
+        rows = list(csv.DictReader(io.StringIO(r.text)))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["employee_name"], "Ann Kamau")
+        self.assertEqual(rows[0]["recorded_by_name"], "Ben Otieno")
+        self.assertEqual(rows[0]["reason"], "lunch, extra")
+        self.assertEqual(rows[1]["reason"], "")
+
+    def test_advances_ndjson(self):
+        r = self.client.get("/api/admin/export/advances?format=ndjson")
+        self.assertEqual(r.status_code, 200)
+        lines = [json.loads(line) for line in r.text.splitlines() if line]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["status"], "approved")
+        self.assertEqual(lines[0]["amount_for_advance"], 500.0)
+
+    def test_small_batches_cover_all_rows(self):
+        db = sessionmaker(bind=self.engine)()
+        chunks = list(stream_csv(db, "bills", batch_size=2))
+        db.close()
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(b"".join(chunks).decode().count("\n"), 6)
+
+    def test_empty_table_still_has_header(self):
+        r = self.client.get("/api/admin/export/off-days")
+        self.assertEqual(r.status_code, 200)
+        self.assertTrue(r.text.startswith("id,employee_id,employee_name"))
+
+    def test_unknown_entity(self):
+        r = self.client.get("/api/admin/export/payroll")
+        self.assertEqual(r.status_code, 404)
+
+    def test_admin_only(self):
+        for employee_id, role in ((self.staff_id, Role.STAFF), (self.manager_id, Role.MANAGER)):
+            r = self.client.get("/api/admin/export/bills", headers=token_headers(self, employee_id, role))
+            self.assertEqual(r.status_code, 403)
+        r = self.client.get("/api/admin/export/bills", headers=token_headers(self, None, Role.ADMIN))
+        self.assertEqual(r.status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
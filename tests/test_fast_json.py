@@ -0,0 +1,91 @@
+"""
+Fast list responses match what the Pydantic response models would produce.
+"""
+import datetime as dt
+import json
+import unittest
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import sessionmaker
+
+import main
+from app.models.schema import (
+    Advance,
+    AdvanceStatus,
+    Bill,
+    OffDay,
+    Role,
+    SalaryPayment,
+)
+from app.utils.fast_json import FastJSONResponse
+from tests.support import add_employee, api_client, memory_engine
+
+
+class FastJSONTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.client = api_client(self.engine)
+        db = sessionmaker(bind=self.engine)()
+        staff = add_employee(db, "Ann")
+        manager = add_employee(db, "Ben", role=Role.MANAGER)
+        admin = add_employee(db, "Ada", role=Role.ADMIN)
+        db.add_all(
+            [
+                Bill(
+                    employee_id=staff.id,
+                    billed_employee_id=staff.id,
+                    amount_billed=120.5,
+                    date=dt.datetime(2026, 5, 3, 10, 30, 15, 123456),
+                    reason="Café",
+                    recorded_by_id=manager.id,
+                ),
+                Advance(
+                    employee_id=staff.id,
+                    amount_for_advance=900.0,
+                    status=AdvanceStatus.PENDING,
+                ),
+                OffDay(employee_id=staff.id, date=dt.date(2026, 5, 4), day_count=1),
+                SalaryPayment(
+                    employee_id=staff.id,
+                    paid_by_id=admin.id,
+                    amount_paid=5000.0,
+                    payment_date=dt.date(2026, 5, 31),
+                    payroll_year=2026,
+                    payroll_month=5,
+                ),
+            ]
+        )
+        db.commit()
+        self.manager_id = manager.id
+        db.close()
+
+    def _assert_same_as_model(self, url, model):
+        r = self.client.get(url)
+        self.assertEqual(r.status_code, 200, r.text)
+        self.assertEqual(r.headers["content-type"], "application/json")
+        body = r.json()
+        self.assertTrue(body)
+        adapter = TypeAdapter(List[model])
+        expected = json.loads(adapter.dump_json(adapter.validate_python(body)))
+        self.assertEqual(body, expected)
+
+    def test_listings_match_response_models(self):
+        self._assert_same_as_model("/api/employees", main.EmployeeOut)
+        self._assert_same_as_model("/api/admin/advances", main.AdvanceOut)
+        self._assert_same_as_model("/api/admin/bills", main.BillOut)
+        self._assert_same_as_model("/api/admin/off-days", main.OffDayOut)
+        self._assert_same_as_model("/api/salary-payments", main.SalaryPaymentOut)
+        self._assert_same_as_model("/api/admin/salary-summary", main.SalarySummaryItem)
+        self._assert_same_as_model(
+            f"/api/manager/{self.manager_id}/recent-bills", main.BillOut
+        )
+
+    def test_datetime_encoding_matches_pydantic(self):
+        when = dt.datetime(2026, 5, 3, 10, 30, 15, 123456)
+        fast = json.loads(FastJSONResponse({"d": when, "day": when.date()}).body)
+        self.assertEqual(fast, {"d": "2026-05-03T10:30:15.123456", "day": "2026-05-03"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+PIN login keyed by employee_id, and the user_auth backfill migration.
+"""
+import unittest
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.schema import Role, UserAuth
+from scripts.migrate_user_auth_employee_id import find_login_collisions, migrate
+from tests.support import QueryCounter, add_employee, api_client, memory_engine
+
+
+class LoginLookupTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.db = sessionmaker(bind=self.engine)()
+        self.client = api_client(self.engine)
+        # Same first name, different people and PINs
+        self.staff_id = add_employee(self.db, "Grace", last_name="Otieno").id
+        self.manager_id = add_employee(self.db, "Grace", last_name="Njeri", role=Role.MANAGER).id
+        for emp_id, pin in ((self.staff_id, 1111), (self.manager_id, 2222)):
+            self.client.post("/api/user-auth", json={"employee_id": emp_id, "pin": pin})
+
+    def tearDown(self):
+        self.db.close()
+
+    def login(self, pin):
+        return self.client.post("/api/login", json={"first_name": "Grace", "pin": pin})
+
+    def test_login_resolves_the_pin_owner(self):
+        body = self.login(2222).json()
+        self.assertEqual(body["employee_id"], self.manager_id)
+        self.assertEqual(body["last_name"], "Njeri")
+        self.assertEqual(body["dashboard"], "/manager-dashboard")
+        self.assertEqual(self.login(1111).json()["employee_id"], self.staff_id)
+        self.assertEqual(self.login(3333).status_code, 401)
+
+    def test_login_is_one_query(self):
+        with QueryCounter(self.engine) as q:
+            self.assertEqual(self.login(1111).status_code, 200)
+        self.assertEqual(q.count, 1)
+        self.assertIn("JOIN", q.statements[0].upper())
+
+    def test_set_pin_updates_in_place(self):
+        self.client.post("/api/user-auth", json={"employee_id": self.staff_id, "pin": 4444})
+        rows = self.db.query(UserAuth).filter(UserAuth.employee_id == self.staff_id).all()
+        self.assertEqual([r.pin for r in rows], [4444])
+        self.assertEqual(self.client.get(f"/api/user-auth/{self.manager_id}").json()["pin"], 2222)
+
+    def test_same_first_name_cannot_share_a_pin(self):
+        resp = self.client.post("/api/user-auth", json={"employee_id": self.manager_id, "pin": 1111})
+        self.assertEqual(resp.status_code, 409)
+        self.assertEqual(self.client.get(f"/api/user-auth/{self.manager_id}").json()["pin"], 2222)
+        # Re-saving your own PIN is fine
+        resp = self.client.post("/api/user-auth", json={"employee_id": self.staff_id, "pin": 1111})
+        self.assertEqual(resp.status_code, 201)
+
+    def test_legacy_shared_pin_is_refused_not_guessed(self):
+        self.db.query(UserAuth).filter(UserAuth.employee_id == self.manager_id).update({"pin": 1111})
+        self.db.commit()
+        self.assertEqual(self.login(1111).status_code, 409)
+        with self.engine.connect() as conn:
+            self.assertEqual(find_login_collisions(conn), [("Grace", [self.staff_id, self.manager_id])])
+
+
+class UserAuthMigrationTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        with self.engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE employee (id INTEGER PRIMARY KEY, first_name VARCHAR(100) NOT NULL)"
+            ))
+            conn.execute(text(
+                "CREATE TABLE user_auth (id INTEGER PRIMARY KEY, pin INTEGER NOT NULL, "
+                "first_name VARCHAR(100) NOT NULL, created_at DATETIME)"
+            ))
+            conn.execute(text(
+                "INSERT INTO employee (id, first_name) VALUES (1, 'Ann'), (2, 'Ben'), (3, 'Ben')"
+            ))
+            conn.execute(text(
+                "INSERT INTO user_auth (id, pin, first_name) VALUES "
+                "(1, 1000, 'Ann'), (2, 2000, 'Ben'), (3, 3000, 'Ann'), (4, 4000, 'Zed')"
+            ))
+
+    def rows(self):
+        with self.engine.connect() as conn:
+            return conn.execute(text(
+                "SELECT id, employee_id FROM user_auth ORDER BY id"
+            )).all()
+
+    def test_backfill_dedupes_and_indexes(self):
+        migrate(self.engine)
+        # Ann's newer PIN wins; Ben maps to the lowest id; Zed stays unlinked
+        self.assertEqual(self.rows(), [(2, 2), (3, 1), (4, None)])
+        indexes = {i["name"]: i for i in inspect(self.engine).get_indexes("user_auth")}
+        self.assertTrue(indexes["ix_user_auth_employee_id"]["unique"])
+        self.assertIn("ix_user_auth_first_name_pin", indexes)
+
+    def test_rerun_is_a_no_op(self):
+        migrate(self.engine)
+        migrate(self.engine)
+        self.assertEqual(self.rows(), [(2, 2), (3, 1), (4, None)])
+
+
+if __name__ == "__main__":
+    unittest.main()
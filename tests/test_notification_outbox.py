@@ -0,0 +1,163 @@
+"""
+Notification outbox: alerts are queued with the request and delivered later.
+"""
+import datetime as dt
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schema import Advance, NotificationOutbox, OutboxStatus
+from app.services import notification_service, outbox_service
+from tests.smtp_sink import SMTPSink
+from tests.support import QueryCounter, add_employee, api_client, memory_engine
+
+LATER = dt.datetime.utcnow() + dt.timedelta(days=1)
+
+
+def smtp_settings(sink):
+    """Point notification_service at ``sink`` with admin alerts enabled."""
+    return patch.multiple(
+        notification_service,
+        ENABLE_ADMIN_EMAIL_NOTIFICATIONS=True,
+        ADMIN_NOTIFICATION_EMAIL="admin@example.com",
+        EMAIL_HOST=sink.host,
+        EMAIL_PORT=sink.port,
+        EMAIL_USER="alerts@example.com",
+        EMAIL_PASSWORD="secret",
+        EMAIL_FROM="alerts@example.com",
+        SMTP_USE_SSL=False,
+        SMTP_USE_TLS=False,
+    )
+
+
+class OutboxTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.client = api_client(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.db = self.Session()
+        self.staff = add_employee(self.db, "Ann", last_name="Kamau", salary=60000.0,
+                                  employment_start_date=dt.date(2025, 1, 1))
+        self.sink = SMTPSink().__enter__()
+        self.settings = smtp_settings(self.sink)
+        self.settings.start()
+
+    def tearDown(self):
+        self.settings.stop()
+        notification_service.smtp_connections.close()
+        self.sink.__exit__(None, None, None)
+        self.db.close()
+
+    def _outbox(self):
+        self.db.expire_all()
+        return self.db.query(NotificationOutbox).order_by(NotificationOutbox.id).all()
+
+    def test_request_queues_instead_of_sending(self):
+        r = self.client.post("/api/advances", json={
+            "employee_id": self.staff.id, "amount": 100, "reason": "Rent"})
+        self.assertEqual(r.status_code, 201)
+        self.assertEqual(self.sink.connections, 0)
+        [row] = self._outbox()
+        self.assertEqual((row.kind, row.record_id), ("advance.created", r.json()["id"]))
+        self.assertEqual(row.status, OutboxStatus.PENDING)
+
+        result = outbox_service.dispatch_pending(self.db)
+        self.assertEqual(result, {"sent": 1, "retrying": 0, "failed": 0})
+        [msg] = self.sink.messages
+        self.assertEqual(msg["To"], "admin@example.com")
+        self.assertIn(f"New advance request #{row.record_id}", msg["Subject"])
+        self.assertIn("Ann Kamau", msg.get_body(("plain",)).get_content())
+        self.assertEqual(self._outbox()[0].status, OutboxStatus.SENT)
+
+    def test_off_day_request_is_queued_too(self):
+        r = self.client.post("/api/off-days", json={
+            "employee_id": self.staff.id, "date": "2026-06-01", "day_count": 1, "off_type": "full"})
+        self.assertEqual(r.status_code, 201)
+        self.assertEqual([row.kind for row in self._outbox()], ["off_day.created"])
+
+    def test_rolled_back_change_queues_nothing(self):
+        advance = Advance(employee_id=self.staff.id, amount_for_advance=50)
+        self.db.add(advance)
+        self.db.flush()
+        notification_service.queue_admin_new_advance(self.db, advance)
+        self.db.rollback()
+        self.assertEqual(self._outbox(), [])
+
+    def test_failures_back_off_then_succeed(self):
+        self.client.post("/api/advances", json={"employee_id": self.staff.id, "amount": 100})
+        self.sink.fail_next(1)
+        now = dt.datetime.utcnow()
+        self.assertEqual(outbox_service.dispatch_pending(self.db, now=now)["retrying"], 1)
+        [row] = self._outbox()
+        self.assertEqual(row.attempts, 1)
+        self.assertIn("451", row.last_error)
+        self.assertEqual(row.next_attempt_at, now + outbox_service.retry_delay(1))
+
+        # Not due yet
+        self.assertEqual(outbox_service.dispatch_pending(self.db, now=now)["sent"], 0)
+        self.assertEqual(outbox_service.dispatch_pending(self.db, now=LATER)["sent"], 1)
+        self.assertEqual(len(self.sink.messages), 1)
+        self.assertEqual(self._outbox()[0].attempts, 2)
+
+    def test_gives_up_after_max_attempts(self):
+        self.client.post("/api/advances", json={"employee_id": self.staff.id, "amount": 100})
+
+        def broken(rows):
+            return [ConnectionRefusedError("down") for _ in rows]
+
+        with patch.object(outbox_service, "OUTBOX_MAX_ATTEMPTS", 2):
+            outbox_service.dispatch_pending(self.db, send=broken)
+            result = outbox_service.dispatch_pending(self.db, now=LATER, send=broken)
+        self.assertEqual(result["failed"], 1)
+        [row] = self._outbox()
+        self.assertEqual(row.status, OutboxStatus.FAILED)
+        self.assertEqual(outbox_service.dispatch_pending(self.db, now=LATER + LATER.resolution)["sent"], 0)
+
+    def test_results_are_committed_group_by_group(self):
+        for amount in (10, 20, 30, 40, 50):
+            self.client.post("/api/advances", json={"employee_id": self.staff.id, "amount": amount})
+        now = dt.datetime.utcnow()
+        commits, leases = [], []
+
+        def send(rows):
+            commits.append(counter.commits)
+            with self.Session() as other:
+                leases.append([r.next_attempt_at for r in other.query(NotificationOutbox)
+                               .filter(NotificationOutbox.status == OutboxStatus.PENDING)])
+            return [None for _ in rows]
+
+        with patch.object(outbox_service, "SEND_GROUP_SIZE", 2), QueryCounter(self.engine) as counter:
+            result = outbox_service.dispatch_pending(self.db, now=now, send=send)
+        self.assertEqual(result["sent"], 5)
+        # Claim, then one commit per group of results
+        self.assertEqual(commits, [1, 2, 3])
+        self.assertEqual(counter.commits, 4)
+        # Rows still waiting keep a lease running from their last renewal
+        lease = now + dt.timedelta(seconds=outbox_service.CLAIM_LEASE_SECONDS)
+        self.assertEqual([len(waiting) for waiting in leases], [5, 3, 1])
+        self.assertTrue(all(at >= lease for waiting in leases for at in waiting))
+        self.assertEqual({row.status for row in self._outbox()}, {OutboxStatus.SENT})
+
+    def test_cron_route_drains_with_secret(self):
+        for amount in (10, 20, 30):
+            self.client.post("/api/advances", json={"employee_id": self.staff.id, "amount": amount})
+        with patch("app.config.config.CRON_SECRET", "cron-token"):
+            self.assertEqual(self.client.get("/api/internal/cron/notifications").status_code, 401)
+            r = self.client.get("/api/internal/cron/notifications",
+                                headers={"Authorization": "Bearer cron-token"})
+        self.assertEqual(r.json(), {"ok": True, "sent": 3, "retrying": 0, "failed": 0})
+        self.assertEqual(len(self.sink.messages), 3)
+
+    def test_worker_is_woken_by_commit(self):
+        worker = outbox_service.OutboxWorker(self.Session, poll_seconds=60)
+        worker.start()
+        try:
+            self.client.post("/api/advances", json={"employee_id": self.staff.id, "amount": 100})
+            self.assertTrue(self.sink.wait_for(1, timeout=5))
+        finally:
+            worker.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
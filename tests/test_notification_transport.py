@@ -0,0 +1,101 @@
+"""
+Reused SMTP session and shared Twilio client behind notification delivery.
+"""
+import unittest
+from email.message import EmailMessage
+from unittest.mock import patch
+
+from app.services import notification_transport
+from app.services.notification_transport import SMTPConnectionManager, SMTPSettings
+from tests.smtp_sink import SMTPSink
+
+
+def message(n: int) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = "alerts@example.com"
+    msg["To"] = f"user{n}@example.com"
+    msg["Subject"] = f"Message {n}"
+    msg.set_content(f"Body {n}")
+    return msg
+
+
+class SMTPConnectionManagerTests(unittest.TestCase):
+    def setUp(self):
+        self.sink = SMTPSink().__enter__()
+        self.settings = SMTPSettings(
+            self.sink.host, self.sink.port, "alerts@example.com", "secret",
+            use_tls=False, timeout=5,
+        )
+        self.manager = SMTPConnectionManager(lambda: self.settings)
+
+    def tearDown(self):
+        self.manager.close()
+        self.sink.__exit__(None, None, None)
+
+    def test_one_session_carries_many_messages(self):
+        for n in range(3):
+            self.manager.send(message(n))
+        self.assertEqual(self.manager.send_many([message(n) for n in range(3, 10)]), [None] * 7)
+        self.assertEqual(len(self.sink.messages), 10)
+        self.assertEqual((self.sink.connections, self.sink.logins), (1, 1))
+
+    def test_rejected_message_does_not_end_the_batch(self):
+        self.sink.fail_next(1)
+        errors = self.manager.send_many([message(n) for n in range(3)])
+        self.assertIn("451", str(errors[0]))
+        self.assertEqual(errors[1:], [None, None])
+        self.assertEqual([m["Subject"] for m in self.sink.messages], ["Message 1", "Message 2"])
+        self.assertEqual(self.sink.connections, 1)
+
+    def test_reconnects_when_server_drops_the_session(self):
+        self.manager.send(message(0))
+        self.sink.drop_connections()
+        self.manager.send(message(1))
+        self.assertEqual(len(self.sink.messages), 2)
+        self.assertEqual(self.sink.connections, 2)
+
+    def test_idle_session_is_health_checked(self):
+        self.manager.healthcheck_after = 0
+        self.manager.send(message(0))
+        self.sink.drop_connections()
+        self.manager.send(message(1))
+        self.assertEqual(self.manager.connects, 2)
+        self.assertEqual(len(self.sink.messages), 2)
+
+    def test_session_is_replaced_after_max_messages(self):
+        self.manager.max_messages = 2
+        self.manager.send_many([message(n) for n in range(5)])
+        self.assertEqual(self.sink.connections, 3)
+
+    def test_changed_settings_reconnect(self):
+        self.manager.send(message(0))
+        with SMTPSink() as other:
+            self.settings = SMTPSettings(other.host, other.port, "alerts@example.com",
+                                         "secret", use_tls=False, timeout=5)
+            self.manager.send(message(1))
+            self.assertEqual(len(other.messages), 1)
+            self.manager.close()
+        self.assertEqual(len(self.sink.messages), 1)
+
+    def test_close_idle_keeps_a_recent_session(self):
+        self.manager.send(message(0))
+        self.manager.close_idle()
+        self.manager.send(message(1))
+        self.assertEqual(self.sink.connections, 1)
+        self.manager.keepalive = 0
+        self.manager.close_idle()
+        self.manager.send(message(2))
+        self.assertEqual(self.sink.connections, 2)
+
+
+class TwilioClientTests(unittest.TestCase):
+    def test_client_is_shared_per_account(self):
+        with patch.dict(notification_transport._twilio_clients, clear=True):
+            client = notification_transport.twilio_client("AC1", "token")
+            self.assertIs(notification_transport.twilio_client("AC1", "token"), client)
+            self.assertIsNot(notification_transport.twilio_client("AC2", "token"), client)
+            self.assertIsNotNone(client.http_client.session)
+
+
+if __name__ == "__main__":
+    unittest.main()
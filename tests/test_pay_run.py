@@ -0,0 +1,130 @@
+"""
+Company-wide pay run: batched net pay, one transaction, dry run, idempotent per period.
+"""
+import datetime as dt
+import os
+import time
+import unittest
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schema import Employee, PayrollPeriodClose, PayRunEntry, Role, SalaryPayment
+from app.services.employee_directory import employee_directory
+from app.services.payroll_service import get_net_pay_remaining
+from tests.support import QueryCounter, add_employee, api_client, memory_engine
+
+
+class PayRunTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.client = api_client(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.admin_id = add_employee(self.db, "Ada", role=Role.ADMIN).id
+        self.staff_ids = [add_employee(self.db, f"Staff{n}", salary=3000.0 * (n + 1)).id for n in range(4)]
+        self.today = dt.date.today()
+        self.period = {"year": self.today.year, "month": self.today.month}
+
+    def tearDown(self):
+        self.db.close()
+
+    def _run(self, **kw):
+        payload = {"admin_id": self.admin_id, "employee_ids": self.staff_ids, **self.period, **kw}
+        return self.client.post("/api/salary-payments/pay-run", json=payload)
+
+    def _payments(self):
+        self.db.expire_all()
+        return self.db.query(SalaryPayment).order_by(SalaryPayment.employee_id).all()
+
+    def test_dry_run_previews_net_remaining_without_writing(self):
+        r = self._run(dry_run=True)
+        self.assertEqual(r.status_code, 200, r.text)
+        body = r.json()
+        self.assertTrue(body["dry_run"])
+        self.assertEqual(body["payments"], 4)
+        for result, employee_id in zip(body["results"], self.staff_ids):
+            self.assertEqual(result["status"], "would_pay")
+            self.assertAlmostEqual(
+                result["amount"], get_net_pay_remaining(self.db, employee_id, self.today), places=2
+            )
+        self.assertEqual(self._payments(), [])
+
+    def test_pays_everyone_tagged_to_the_period(self):
+        preview = self._run(dry_run=True).json()
+        r = self._run(notes="October")
+        self.assertEqual(r.status_code, 200, r.text)
+        body = r.json()
+        self.assertEqual(body["total_amount"], preview["total_amount"])
+
+        payments = self._payments()
+        self.assertEqual([p.employee_id for p in payments], self.staff_ids)
+        self.assertEqual([p.amount_paid for p in payments], [x["amount"] for x in preview["results"]])
+        self.assertEqual({(p.payroll_year, p.payroll_month) for p in payments},
+                         {(self.today.year, self.today.month)})
+        self.assertEqual({p.paid_by_id for p in payments}, {self.admin_id})
+        self.assertEqual({p.notes for p in payments}, {"October"})
+        self.assertEqual([x["salary_payment_id"] for x in body["results"]], [p.id for p in payments])
+        self.assertEqual(self.db.query(PayRunEntry).count(), 4)
+
+    def test_paid_employees_are_stamped_in_utc(self):
+        # On a UTC+3 host a local stamp would hide these rows from /api/sync for three hours
+        previous = os.environ.get("TZ")
+        os.environ["TZ"] = "Etc/GMT-3"
+        time.tzset()
+        try:
+            self._run(employee_ids=self.staff_ids[:2])
+            r = self.client.post("/api/salary-payments", json={
+                "employee_id": self.staff_ids[2], "admin_id": self.admin_id, "amount_paid": 100})
+            self.assertEqual(r.status_code, 201, r.text)
+            now = dt.datetime.utcnow()
+        finally:
+            if previous is None:
+                os.environ.pop("TZ", None)
+            else:
+                os.environ["TZ"] = previous
+            time.tzset()
+        self.db.expire_all()
+        for employee_id in self.staff_ids[:3]:
+            stamp = self.db.get(Employee, employee_id).updated_at
+            self.assertLess(abs(now - stamp), dt.timedelta(minutes=5))
+
+    def test_second_run_pays_nobody_twice(self):
+        self._run(employee_ids=self.staff_ids[:2])
+        body = self._run().json()
+        self.assertEqual([x["status"] for x in body["results"]],
+                         ["already_paid", "already_paid", "paid", "paid"])
+        self.assertEqual(len(self._payments()), 4)
+        self.assertEqual(self._run().json()["payments"], 0)
+        self.assertEqual(len(self._payments()), 4)
+
+    def test_manual_payments_closed_months_and_unknown_ids(self):
+        manual, closed = self.staff_ids[0], self.staff_ids[1]
+        self.db.add(SalaryPayment(employee_id=manual, paid_by_id=self.admin_id, amount_paid=100.0,
+                                  payroll_year=self.today.year, payroll_month=self.today.month))
+        self.db.add(PayrollPeriodClose(employee_id=closed, rolled_unpaid=0.0, **self.period))
+        self.db.commit()
+        net = get_net_pay_remaining(self.db, manual, self.today)
+
+        results = self._run(employee_ids=[manual, closed, 9999]).json()["results"]
+        self.assertAlmostEqual(results[0]["amount"], round(net - 100.0, 2), places=2)
+        self.assertEqual([x["status"] for x in results], ["paid", "period_closed", "not_found"])
+
+    def test_query_count_does_not_grow_with_employees(self):
+        employee_directory.warm(self.db)
+        with QueryCounter(self.engine) as few:
+            self._run(employee_ids=self.staff_ids[:1])
+        with QueryCounter(self.engine) as many:
+            self._run(employee_ids=self.staff_ids[1:])
+        self.assertEqual(many.count, few.count)
+        self.assertEqual(many.commits, 1)
+        inserts = [s for s in many.statements if s.startswith("INSERT INTO salary_payment")]
+        self.assertEqual(len(inserts), 1)
+
+    def test_rejects_non_admins_and_future_months(self):
+        staff = self.staff_ids[0]
+        self.assertEqual(self._run(admin_id=staff).status_code, 403)
+        nxt = self.today.replace(day=1) + dt.timedelta(days=32)
+        self.assertEqual(self._run(year=nxt.year, month=nxt.month).status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Monthly payroll register: batched rows, CSV / NDJSON files, closed months cached.
+"""
+import csv
+import datetime as dt
+import io
+import json
+import unittest
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schema import Advance, AdvanceStatus, Bill, Employee, Role, SalaryPayment
+from app.services.payroll_register_service import REGISTER_COLUMNS, register_cache, register_data_version
+from app.services.payroll_service import close_employee_payroll_period
+from tests.support import QueryCounter, add_employee, api_client, memory_engine, token_headers
+
+YEAR, MONTH = 2026, 5
+
+
+class PayrollRegisterTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.client = api_client(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.admin = add_employee(self.db, "Ada", role=Role.ADMIN)
+        self.ann = add_employee(self.db, "Ann", salary=31000.0, salary_arrears=500.0)
+        self.ben = add_employee(self.db, "Ben", salary=62000.0)
+        self.late = add_employee(self.db, "Late", employment_start_date=dt.date(YEAR, MONTH + 1, 10))
+        self.db.add_all([
+            Bill(employee_id=self.ann.id, billed_employee_id=self.ann.id, amount_billed=120.0,
+                 date=dt.datetime(YEAR, MONTH, 3), recorded_by_id=self.admin.id),
+            Advance(employee_id=self.ben.id, amount_for_advance=400.0, status=AdvanceStatus.APPROVED,
+                    approved_at=dt.datetime(YEAR, MONTH, 10)),
+            SalaryPayment(employee_id=self.ben.id, paid_by_id=self.admin.id, amount_paid=1000.0,
+                          payment_date=dt.date(YEAR, MONTH, 28), payroll_year=YEAR, payroll_month=MONTH),
+        ])
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _register(self, fmt="ndjson", year=YEAR, month=MONTH):
+        return self.client.get(f"/api/admin/payroll/register?year={year}&month={month}&format={fmt}")
+
+    def _rows(self, **kw):
+        r = self._register(**kw)
+        self.assertEqual(r.status_code, 200, r.text)
+        return {row["employee_id"]: row for row in map(json.loads, r.text.splitlines())}
+
+    def _close_all(self, year=YEAR, month=MONTH):
+        ids = [e.id for e in self.db.query(Employee).filter(
+            Employee.employment_start_date <= dt.date(year, month, 28))]
+        return {i: close_employee_payroll_period(self.db, i, year, month) for i in ids}
+
+    def test_admin_only(self):
+        path = f"/api/admin/payroll/register?year={YEAR}&month={MONTH}"
+        staff = self.client.get(path, headers=token_headers(self, self.ann.id, Role.STAFF))
+        self.assertEqual(staff.status_code, 403)
+        admin = self.client.get(path, headers=token_headers(self, self.admin.id, Role.ADMIN))
+        self.assertEqual(admin.status_code, 200)
+
+    def test_rows_cover_each_employee_employed_that_month(self):
+        rows = self._rows()
+        self.assertEqual(sorted(rows), [self.admin.id, self.ann.id, self.ben.id])
+        ann, ben = rows[self.ann.id], rows[self.ben.id]
+        self.assertEqual((ann["eligible_days"], ann["earned_gross"], ann["bills"]), (31, 31000.0, 120.0))
+        self.assertEqual((ann["arrears_brought_forward"], ann["balance"]), (500.0, 31380.0))
+        self.assertEqual((ben["advances"], ben["payments"], ben["net_for_month"]), (400.0, 1000.0, 61600.0))
+        self.assertEqual(ben["balance"], 60600.0)
+        self.assertEqual((ann["employee_name"], ann["role"], ann["closed"]), ("Ann Test", "staff", False))
+
+    def test_closed_month_balance_matches_close_and_survives_later_closes(self):
+        closes = self._close_all()
+        self._close_all(YEAR, MONTH + 1)
+        rows = self._rows()
+        for employee_id, closed in closes.items():
+            self.assertTrue(rows[employee_id]["closed"])
+            self.assertAlmostEqual(rows[employee_id]["balance"], closed["salary_arrears_after"], places=2)
+        self.assertEqual(rows[self.ann.id]["arrears_brought_forward"], 500.0)
+
+    def test_csv_file(self):
+        r = self._register("csv")
+        self.assertTrue(r.headers["content-type"].startswith("text/csv"))
+        self.assertIn("payroll-register-2026-05.csv", r.headers["content-disposition"])
+        table = list(csv.reader(io.StringIO(r.text)))
+        self.assertEqual(tuple(table[0]), REGISTER_COLUMNS)
+        self.assertEqual(len(table), 4)
+
+    def test_closed_months_are_cached_and_open_months_are_not(self):
+        with QueryCounter(self.engine) as q:
+            self._register()
+            self._register()
+        self.assertGreater(q.count, 0)
+        self.assertIsNone(register_cache.get((YEAR, MONTH, "ndjson", register_data_version(self.db))))
+
+        self._close_all()
+        first = self._register().content
+        with QueryCounter(self.engine) as q:
+            again = self._register().content
+        self.assertEqual(q.count, 1)  # the data version
+        self.assertEqual(again, first)
+        self.assertEqual(register_cache.get((YEAR, MONTH, "ndjson", register_data_version(self.db))), first)
+
+    def test_backdated_writes_refresh_a_closed_month(self):
+        self._close_all()
+        self._rows()
+        self.db.add_all([
+            Bill(employee_id=self.ann.id, billed_employee_id=self.ann.id, amount_billed=80.0,
+                 date=dt.datetime(YEAR, MONTH, 20), recorded_by_id=self.admin.id),
+            SalaryPayment(employee_id=self.ann.id, paid_by_id=self.admin.id, amount_paid=300.0,
+                          payment_date=dt.date(YEAR, MONTH + 1, 2), payroll_year=YEAR, payroll_month=MONTH),
+        ])
+        self.db.commit()
+        ann = self._rows()[self.ann.id]
+        self.assertEqual((ann["bills"], ann["payments"]), (200.0, 300.0))
+
+        hire = add_employee(self.db, "Backdated", employment_start_date=dt.date(YEAR, MONTH, 1))
+        self.assertIn(hire.id, self._rows())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+Monthly payslip ZIP: one text and one HTML payslip per employee, rendered
+in-process or on the process pool, closed months cached.
+"""
+import datetime as dt
+import io
+import unittest
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schema import Employee, Role, SalaryPayment
+from app.services import payslip_service
+from app.services.payroll_service import close_employee_payroll_period
+from tests.support import QueryCounter, add_employee, api_client, memory_engine, token_headers
+
+YEAR, MONTH = 2026, 5
+
+
+class PayslipZipTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.client = api_client(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.admin = add_employee(self.db, "Ada", role=Role.ADMIN)
+        self.ann = add_employee(self.db, "Ann <b>", salary=31000.0, salary_arrears=500.0)
+        self.ben = add_employee(self.db, "Ben", salary=62000.0)
+        self.db.add(SalaryPayment(employee_id=self.ben.id, paid_by_id=self.admin.id, amount_paid=1000.0,
+                                  payment_date=dt.date(YEAR, MONTH, 28), payroll_year=YEAR, payroll_month=MONTH))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _download(self):
+        r = self.client.get(f"/api/admin/payroll/payslips?year={YEAR}&month={MONTH}")
+        self.assertEqual(r.status_code, 200, r.text)
+        return r
+
+    def _open(self, content):
+        archive = zipfile.ZipFile(io.BytesIO(content))
+        self.assertIsNone(archive.testzip())
+        return archive
+
+    def _close_all(self):
+        for employee in self.db.query(Employee).all():
+            close_employee_payroll_period(self.db, employee.id, YEAR, MONTH)
+
+    def test_admin_only(self):
+        path = f"/api/admin/payroll/payslips?year={YEAR}&month={MONTH}"
+        staff = self.client.get(path, headers=token_headers(self, self.ann.id, Role.STAFF))
+        self.assertEqual(staff.status_code, 403)
+        admin = self.client.get(path, headers=token_headers(self, self.admin.id, Role.ADMIN))
+        self.assertEqual(admin.status_code, 200)
+
+    def test_zip_has_text_and_html_payslip_per_employee(self):
+        r = self._download()
+        self.assertEqual(r.headers["content-type"], "application/zip")
+        self.assertIn("payslips-2026-05.zip", r.headers["content-disposition"])
+        archive = self._open(r.content)
+        names = archive.namelist()
+        self.assertEqual(len(names), 6)
+        ann_stem = f"payslip-2026-05-{self.ann.id:05d}-ann-b-test"
+        self.assertIn(f"{ann_stem}.txt", names)
+        self.assertEqual(archive.getinfo(f"{ann_stem}.txt").date_time, (2026, 5, 31, 0, 0, 0))
+
+        text = archive.read(f"{ann_stem}.txt").decode()
+        self.assertIn("PAYSLIP - May 2026", text)
+        self.assertIn("Ann <b> Test", text)
+        self.assertIn("Arrears brought forward      KSH 500.00", text)
+        self.assertIn("Balance                      KSH 31,500.00", text)
+        page = archive.read(f"{ann_stem}.html").decode()
+        self.assertIn("Ann &lt;b&gt; Test", page)
+        self.assertNotIn("<b> Test", page)
+
+        ben_text = archive.read(f"payslip-2026-05-{self.ben.id:05d}-ben-test.txt").decode()
+        self.assertIn("Payments received          - KSH 1,000.00", ben_text)
+        self.assertIn("Balance                      KSH 61,000.00", ben_text)
+
+    def test_months_outside_zip_dates_are_clamped(self):
+        self.db.query(Employee).update({Employee.employment_start_date: dt.date(1970, 1, 1)})
+        self.db.commit()
+        for year, stamp in ((1975, (1980, 1, 1, 0, 0, 0)), (2150, (2107, 12, 31, 23, 59, 58))):
+            r = self.client.get(f"/api/admin/payroll/payslips?year={year}&month=1")
+            self.assertEqual(r.status_code, 200, r.text)
+            archive = self._open(r.content)
+            self.assertEqual(len(archive.namelist()), 6)
+            self.assertEqual(archive.infolist()[0].date_time, stamp)
+
+    def test_closed_months_are_cached(self):
+        self.assertIsNone(payslip_service.cached_payslip_zip(self.db, YEAR, MONTH))
+        self._close_all()
+        first = self._download().content
+        with QueryCounter(self.engine) as q:
+            again = self._download().content
+        self.assertEqual(q.count, 1)  # the data version
+        self.assertEqual(again, first)
+        self._open(first)
+
+    def test_backdated_payment_refreshes_a_closed_month(self):
+        self._close_all()
+        self._download()
+        self.db.add(SalaryPayment(employee_id=self.ann.id, paid_by_id=self.admin.id, amount_paid=700.0,
+                                  payment_date=dt.date(YEAR, MONTH + 1, 2), payroll_year=YEAR, payroll_month=MONTH))
+        self.db.commit()
+        archive = self._open(self._download().content)
+        text = archive.read(f"payslip-2026-05-{self.ann.id:05d}-ann-b-test.txt").decode()
+        self.assertIn("Payments received          - KSH 700.00", text)
+
+    def test_process_pool_output_matches_in_process(self):
+        in_process = self._download().content
+        with mock.patch.object(payslip_service, "PAYSLIP_POOL_MIN_BATCH", 1), \
+                mock.patch.object(payslip_service, "PAYSLIP_RENDER_WORKERS", 2):
+            self.addCleanup(payslip_service.shutdown_render_pool)
+            pooled = self._download().content
+            self.assertIsNotNone(payslip_service._pool)
+        self.assertEqual(pooled, in_process)
+
+    def _pooled(self, **patches):
+        with mock.patch.object(payslip_service, "PAYSLIP_POOL_MIN_BATCH", 1), \
+                mock.patch.object(payslip_service, "PAYSLIP_RENDER_WORKERS", 2), \
+                mock.patch.multiple(payslip_service, **patches):
+            return self._download().content
+
+    def test_falls_back_when_no_pool_can_start(self):
+        in_process = self._download().content
+
+        def no_semaphores(*args, **kwargs):
+            raise OSError(38, "Function not implemented")
+
+        self.assertEqual(self._pooled(ProcessPoolExecutor=no_semaphores), in_process)
+        self.assertIsNone(payslip_service._pool)
+
+    def test_worker_crash_mid_stream_still_yields_a_complete_zip(self):
+        in_process = self._download().content
+
+        class DiesAfterOne:
+            def map(self, fn, rows, chunksize=1):
+                yield fn(rows[0])
+                raise BrokenProcessPool("worker died")
+
+        pooled = self._pooled(_render_pool=lambda: DiesAfterOne())
+        self.assertEqual(pooled, in_process)
+        self.assertEqual(len(self._open(pooled).namelist()), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
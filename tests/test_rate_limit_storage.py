@@ -0,0 +1,85 @@
+"""
+SQLite rate-limit storage: sliding-window accounting shared between processes.
+"""
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, SlidingWindowCounterRateLimiter
+
+import app.utils.rate_limit_storage  # noqa: F401  (registers sqlite://)
+from app.utils.rate_limit_storage import SQLiteStorage, _path_from_uri
+
+FIVE_PER_MINUTE = parse("5/minute")
+
+
+def _hit_many(path, hits, results):
+    limiter = SlidingWindowCounterRateLimiter(storage_from_string(f"sqlite:///{path}"))
+    item = parse("15/minute")
+    results.put(sum(limiter.hit(item, "shared") for _ in range(hits)))
+
+
+class SQLiteStorageTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "limits.db")
+        self.uri = f"sqlite:///{self.path}"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scheme_is_registered(self):
+        storage = storage_from_string(self.uri)
+        self.assertIsInstance(storage, SQLiteStorage)
+        self.assertEqual(storage.path, self.path)
+        self.assertEqual(storage_from_string("sqlite://").path, ":memory:")
+
+    def test_uri_paths(self):
+        self.assertEqual(_path_from_uri("sqlite:///rel/limits.db"), "rel/limits.db")
+        self.assertEqual(_path_from_uri("sqlite:////var/run/limits.db"), "/var/run/limits.db")
+        self.assertEqual(_path_from_uri("sqlite://"), ":memory:")
+        with self.assertRaises(ValueError):
+            _path_from_uri("sqlite://rel/l.db")
+
+    def test_sliding_window_limits_and_clears(self):
+        limiter = SlidingWindowCounterRateLimiter(storage_from_string(self.uri))
+        self.assertEqual([limiter.hit(FIVE_PER_MINUTE, "ip") for _ in range(6)], [True] * 5 + [False])
+        self.assertTrue(limiter.hit(FIVE_PER_MINUTE, "other-ip"))
+        limiter.clear(FIVE_PER_MINUTE, "ip")
+        self.assertTrue(limiter.hit(FIVE_PER_MINUTE, "ip"))
+
+    def test_previous_window_is_weighted(self):
+        limiter = SlidingWindowCounterRateLimiter(storage_from_string(self.uri))
+        clock = "app.utils.rate_limit_storage.time.time"
+        with patch(clock, return_value=6000.0):  # start of a 60s window
+            for _ in range(5):
+                self.assertTrue(limiter.hit(FIVE_PER_MINUTE, "ip"))
+        # 45s into the next window a quarter of the previous one still counts: floor(1.25) = 1
+        with patch(clock, return_value=6105.0):
+            self.assertEqual(
+                [limiter.hit(FIVE_PER_MINUTE, "ip") for _ in range(5)], [True] * 4 + [False]
+            )
+
+    def test_fixed_window_uses_counters(self):
+        limiter = FixedWindowRateLimiter(storage_from_string(self.uri))
+        self.assertEqual([limiter.hit(FIVE_PER_MINUTE, "ip") for _ in range(6)], [True] * 5 + [False])
+        self.assertEqual(limiter.get_window_stats(FIVE_PER_MINUTE, "ip").remaining, 0)
+
+    def test_limit_is_exact_across_processes(self):
+        SQLiteStorage(self.uri)  # create the file before the workers race for it
+        ctx = multiprocessing.get_context("fork")
+        results = ctx.Queue()
+        workers = [ctx.Process(target=_hit_many, args=(self.path, 10, results)) for _ in range(4)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join(30)
+        self.assertEqual(sum(results.get(timeout=5) for _ in workers), 15)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Salary payment listings resolve names with a constant number of queries.
+"""
+import datetime as dt
+import unittest
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schema import Role, SalaryPayment
+from tests.support import QueryCounter, add_employee, api_client, memory_engine
+
+
+class SalaryPaymentListingTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.client = api_client(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.admin = add_employee(self.db, "Ada", role=Role.ADMIN, last_name="Admin")
+        self.staff = [add_employee(self.db, f"S{i}", last_name="Staff") for i in range(3)]
+
+    def tearDown(self):
+        self.db.close()
+
+    def _pay(self, n):
+        for i in range(n):
+            emp = self.staff[i % len(self.staff)]
+            self.db.add(
+                SalaryPayment(
+                    employee_id=emp.id,
+                    paid_by_id=self.admin.id,
+                    amount_paid=1000.0 + i,
+                    payment_date=dt.date(2026, 5, 1),
+                )
+            )
+        self.db.commit()
+
+    def test_list_query_count_is_constant(self):
+        self._pay(3)
+        self.client.get("/api/salary-payments")  # warm the employee directory
+        with QueryCounter(self.engine) as few:
+            r = self.client.get("/api/salary-payments")
+        self.assertEqual(len(r.json()), 3)
+
+        self._pay(30)
+        with QueryCounter(self.engine) as many:
+            r = self.client.get("/api/salary-payments")
+        body = r.json()
+        self.assertEqual(len(body), 33)
+        self.assertEqual(many.count, few.count)
+        self.assertEqual(body[0]["paid_by_name"], "Ada Admin")
+
+    def test_employee_listing(self):
+        self._pay(6)
+        emp = self.staff[0]
+        r = self.client.get(f"/api/salary-payments/employee/{emp.id}")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(len(r.json()), 2)
+        self.assertTrue(all(p["employee_name"] == "S0 Staff" for p in r.json()))
+        self.assertEqual(
+            self.client.get("/api/salary-payments/employee/999").status_code, 404
+        )
+
+    def test_create_payment_names(self):
+        r = self.client.post(
+            "/api/salary-payments",
+            json={
+                "employee_id": self.staff[1].id,
+                "admin_id": self.admin.id,
+                "amount_paid": 1500,
+                "payment_date": "2026-05-02",
+            },
+        )
+        self.assertEqual(r.status_code, 201, r.text)
+        self.assertEqual(r.json()["employee_name"], "S1 Staff")
+        self.assertEqual(r.json()["paid_by_name"], "Ada Admin")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Sparse fieldsets: ``fields=`` narrows both the SELECT list and the payload.
+"""
+import datetime as dt
+import unittest
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schema import Advance, Bill, Role
+from app.services.employee_directory import employee_directory
+from tests.support import QueryCounter, add_employee, api_client, memory_engine
+
+
+class SparseFieldsTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.client = api_client(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.manager = add_employee(self.db, "Mia", role=Role.MANAGER, last_name="Boss")
+        self.staff = add_employee(self.db, "Sam", last_name="Staff")
+        self.db.add_all([
+            Advance(employee_id=self.staff.id, amount_for_advance=300),
+            Bill(employee_id=self.staff.id, billed_employee_id=self.staff.id,
+                 amount_billed=40, date=dt.datetime(2026, 4, 2),
+                 recorded_by_id=self.manager.id),
+        ])
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_employees_projection(self):
+        with QueryCounter(self.engine) as q:
+            r = self.client.get("/api/employees", params={"fields": "id,first_name"})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(
+            r.json(),
+            [{"id": self.manager.id, "first_name": "Mia"},
+             {"id": self.staff.id, "first_name": "Sam"}],
+        )
+        listing = next(s for s in q.statements if "ORDER BY" in s)
+        select_list = listing.split("FROM")[0]
+        self.assertIn("first_name", select_list)
+        self.assertNotIn("salary", select_list)
+        self.assertNotIn("phone_no", select_list)
+
+    def test_all_fields_by_default(self):
+        row = self.client.get("/api/employees").json()[0]
+        self.assertIn("salary_arrears", row)
+        self.assertIn("phone_no", row)
+
+    def test_name_lookup_skipped_when_not_requested(self):
+        employee_directory.clear()
+        with QueryCounter(self.engine) as q:
+            r = self.client.get("/api/admin/advances", params={"fields": "id,amount_for_advance"})
+        self.assertEqual(r.json(), [{"id": 1, "amount_for_advance": 300}])
+        self.assertEqual(q.count, 2)  # ETag versions + the listing; no name lookup
+
+    def test_joined_and_constant_fields(self):
+        r = self.client.get(
+            f"/api/manager/{self.manager.id}/recent-bills",
+            params={"fields": "employee_name,recorded_by_name,record_type"},
+        )
+        self.assertEqual(
+            r.json(),
+            [{"employee_name": "Sam Staff", "recorded_by_name": "Mia Boss",
+              "record_type": "bill"}],
+        )
+        r = self.client.get("/api/admin/bills", params={"fields": "record_type"})
+        self.assertEqual(r.json(), [{"record_type": "bill"}])
+
+    def test_unknown_field_is_rejected(self):
+        r = self.client.get("/api/admin/off-days", params={"fields": "id,pin"})
+        self.assertEqual(r.status_code, 400)
+        self.assertIn("pin", r.json()["detail"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+Delta sync: keyset over updated_at per table, tombstones for deletes.
+"""
+import datetime as dt
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schema import Advance, AdvanceStatus, Bill, Role, SalaryPayment, SyncTombstone
+from app.services import auth_service
+from app.services.auth_service import issue_access_token
+from app.services.sync_service import get_changes
+from tests.support import QueryCounter, add_employee, api_client, memory_engine
+
+LATER = dt.datetime.utcnow() + dt.timedelta(minutes=5)
+
+
+def upserted_ids(page, table):
+    return [r["id"] for r in page["changes"][table]["upserted"]]
+
+
+class SyncTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.db = sessionmaker(bind=self.engine)()
+        self.client = api_client(self.engine)
+        self.staff_id = add_employee(self.db, "Ann").id
+        self.admin_id = add_employee(self.db, "Ben", role=Role.ADMIN).id
+        self.advances = [
+            Advance(employee_id=self.staff_id, amount_for_advance=100 * i) for i in range(1, 4)
+        ]
+        self.db.add_all(self.advances)
+        self.db.add(Bill(employee_id=self.staff_id, billed_employee_id=self.staff_id,
+                         amount_billed=50, recorded_by_id=self.admin_id))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_initial_sync_returns_everything_in_one_query_per_table(self):
+        with QueryCounter(self.engine) as q:
+            page = get_changes(self.db, now=LATER)
+        self.assertEqual(q.count, 6)  # five tables + latest tombstone id
+        self.assertFalse(page["has_more"])
+        self.assertEqual(upserted_ids(page, "employees"), [self.staff_id, self.admin_id])
+        self.assertEqual(len(upserted_ids(page, "advances")), 3)
+        self.assertEqual(len(upserted_ids(page, "bills")), 1)
+        row = page["changes"]["advances"]["upserted"][0]
+        self.assertEqual(row["status"], "pending")
+        self.assertNotIn("used_salary", page["changes"]["employees"]["upserted"][0])
+
+    def test_incremental_sync_returns_only_changes(self):
+        cursor = get_changes(self.db, now=LATER)["cursor"]
+        empty = get_changes(self.db, since=cursor, now=LATER)
+        self.assertTrue(all(not c["upserted"] and not c["deleted"]
+                            for c in empty["changes"].values()))
+
+        advance = self.advances[1]
+        advance.status = AdvanceStatus.APPROVED
+        advance.updated_at = LATER - dt.timedelta(minutes=1)
+        self.db.commit()
+        page = get_changes(self.db, since=empty["cursor"], now=LATER)
+        self.assertEqual(upserted_ids(page, "advances"), [advance.id])
+        self.assertEqual(page["changes"]["advances"]["upserted"][0]["status"], "approved")
+        self.assertEqual(upserted_ids(page, "employees"), [])
+
+    def test_recent_rows_wait_for_the_settle_window(self):
+        now = max(a.updated_at for a in self.advances)
+        page = get_changes(self.db, now=now)
+        self.assertEqual(upserted_ids(page, "advances"), [])
+        later = get_changes(self.db, since=page["cursor"], now=LATER)
+        self.assertEqual(len(upserted_ids(later, "advances")), 3)
+
+    def test_limit_pages_through_ties_without_gaps(self):
+        stamp = dt.datetime(2026, 3, 1, 12)
+        for a in self.advances:
+            a.updated_at = stamp  # identical timestamps: the id breaks the tie
+        self.db.commit()
+        seen, cursor = [], None
+        while True:
+            page = get_changes(self.db, since=cursor, limit=2, now=LATER)
+            seen.extend(upserted_ids(page, "advances"))
+            cursor = page["cursor"]
+            if not page["has_more"]:
+                break
+        self.assertEqual(seen, sorted(a.id for a in self.advances))
+
+    def test_orm_delete_leaves_tombstone(self):
+        cursor = get_changes(self.db, now=LATER)["cursor"]
+        gone = self.advances[0].id
+        self.db.delete(self.advances[0])
+        self.db.commit()
+        self.assertEqual(self.db.query(SyncTombstone).count(), 1)
+
+        page = get_changes(self.db, since=cursor, now=LATER)
+        self.assertEqual(page["changes"]["advances"]["deleted"], [gone])
+        again = get_changes(self.db, since=page["cursor"], now=LATER)
+        self.assertEqual(again["changes"]["advances"]["deleted"], [])
+
+    def test_endpoint_and_bad_cursor(self):
+        res = self.client.get("/api/sync", params={"employee_id": self.admin_id})
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("cursor", res.json())
+        self.assertEqual(res.headers["cache-control"], "no-store")
+        res = self.client.get("/api/sync", params={"employee_id": self.admin_id, "since": "not-a-cursor"})
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(self.client.get("/api/sync").status_code, 401)
+
+    def test_staff_sync_only_their_own_rows(self):
+        other_id = add_employee(self.db, "Cleo").id
+        self.db.add_all([
+            Advance(employee_id=other_id, amount_for_advance=900),
+            Bill(employee_id=other_id, billed_employee_id=other_id, amount_billed=70,
+                 recorded_by_id=self.admin_id),
+            SalaryPayment(employee_id=other_id, paid_by_id=self.admin_id, amount_paid=500,
+                          payment_date=dt.date(2026, 5, 28)),
+        ])
+        self.db.commit()
+
+        page = get_changes(self.db, now=LATER, employee_id=self.staff_id)
+        self.assertEqual(upserted_ids(page, "employees"), [self.staff_id])
+        self.assertEqual(len(upserted_ids(page, "advances")), 3)
+        self.assertEqual(len(upserted_ids(page, "bills")), 1)
+        self.assertEqual(upserted_ids(page, "salary_payments"), [])
+        with self.assertRaises(ValueError):
+            get_changes(self.db, since=page["cursor"], now=LATER)
+        everything = get_changes(self.db, now=LATER)
+        self.assertEqual(len(upserted_ids(everything, "advances")), 4)
+
+    def test_admin_id_without_token_is_scoped(self):
+        with patch("app.services.sync_service.SYNC_SETTLE_SECONDS", 0):
+            res = self.client.get("/api/sync", params={"employee_id": self.admin_id})
+        self.assertEqual(res.status_code, 200)
+        changes = res.json()["changes"]
+        self.assertEqual([r["id"] for r in changes["employees"]["upserted"]], [self.admin_id])
+        self.assertEqual(changes["advances"]["upserted"], [])
+        self.assertEqual(changes["bills"]["upserted"], [])
+        self.assertEqual(self.client.get("/api/sync", params={"employee_id": 9999}).status_code, 404)
+
+    def test_token_scopes_the_endpoint(self):
+        with patch.object(auth_service, "_signing_key", "test-signing-key"), \
+                patch("app.services.sync_service.SYNC_SETTLE_SECONDS", 0):
+            staff = {"Authorization": f"Bearer {issue_access_token(self.staff_id, Role.STAFF)[0]}"}
+            admin = {"Authorization": f"Bearer {issue_access_token(None, Role.ADMIN)[0]}"}
+            res = self.client.get("/api/sync", headers=staff)
+            self.assertEqual(res.status_code, 200)
+            rows = res.json()["changes"]["employees"]["upserted"]
+            self.assertEqual([r["id"] for r in rows], [self.staff_id])
+            res = self.client.get("/api/sync", params={"employee_id": self.admin_id}, headers=staff)
+            self.assertEqual(res.status_code, 403)
+            res = self.client.get("/api/sync", headers=admin)
+            self.assertEqual(res.status_code, 200)
+            rows = res.json()["changes"]["employees"]["upserted"]
+            self.assertEqual([r["id"] for r in rows], [self.staff_id, self.admin_id])
+
+
+if __name__ == "__main__":
+    unittest.main()
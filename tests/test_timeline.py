@@ -0,0 +1,85 @@
+"""
+Employee timeline: one UNION ALL query per page, keyset-paged.
+"""
+import datetime as dt
+import unittest
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schema import Advance, Bill, OffDay, Role, SalaryPayment
+from app.services.timeline_service import get_timeline
+from tests.support import QueryCounter, add_employee, api_client, memory_engine
+
+
+class TimelineTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.db = sessionmaker(bind=self.engine)()
+        self.client = api_client(self.engine)
+        self.staff_id = add_employee(self.db, "Ann").id
+        self.other_id = add_employee(self.db, "Eve").id
+        admin_id = add_employee(self.db, "Ben", role=Role.ADMIN).id
+        day = lambda d, h=0: dt.datetime(2026, 3, d, h)  # noqa: E731
+        self.db.add_all([
+            Advance(employee_id=self.staff_id, amount_for_advance=500, created_at=day(2, 9)),
+            Advance(employee_id=self.staff_id, amount_for_advance=700, created_at=day(9, 15)),
+            Advance(employee_id=self.other_id, amount_for_advance=900, created_at=day(9, 16)),
+            OffDay(employee_id=self.staff_id, date=dt.date(2026, 3, 5), reason="Clinic"),
+            OffDay(employee_id=self.staff_id, date=dt.date(2026, 3, 9)),  # ties with the bill below
+            Bill(employee_id=self.staff_id, billed_employee_id=self.staff_id, amount_billed=120,
+                 date=day(9), recorded_by_id=admin_id),
+            Bill(employee_id=self.staff_id, billed_employee_id=self.staff_id, amount_billed=80,
+                 date=day(3, 12), recorded_by_id=admin_id),
+            SalaryPayment(employee_id=self.staff_id, amount_paid=20000,
+                          payment_date=dt.date(2026, 3, 1), paid_by_id=admin_id),
+        ])
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_merges_all_kinds_newest_first(self):
+        items, next_cursor = get_timeline(self.db, self.staff_id, limit=50)
+        self.assertIsNone(next_cursor)
+        self.assertEqual(
+            [(i["kind"], i["date"].day) for i in items],
+            [("advance", 9), ("off_day", 9), ("bill", 9), ("off_day", 5),
+             ("bill", 3), ("advance", 2), ("salary_payment", 1)],
+        )
+        self.assertEqual(items[0]["status"], "pending")
+        self.assertEqual(items[3]["reason"], "Clinic")
+
+    def test_keyset_pages_cover_history_once(self):
+        seen, cursor, pages = [], None, 0
+        while True:
+            with QueryCounter(self.engine) as q:
+                items, cursor = get_timeline(self.db, self.staff_id, limit=2, cursor=cursor)
+            self.assertEqual(q.count, 1)
+            seen.extend((i["kind"], i["id"]) for i in items)
+            pages += 1
+            if cursor is None:
+                break
+        full, _ = get_timeline(self.db, self.staff_id, limit=50)
+        self.assertEqual(seen, [(i["kind"], i["id"]) for i in full])
+        self.assertEqual(pages, 4)
+
+    def test_endpoints(self):
+        recent = self.client.get(f"/api/employees/{self.staff_id}/recent-activity?limit=3").json()
+        self.assertEqual([i["kind"] for i in recent], ["advance", "off_day", "off_day"])
+
+        page = self.client.get(f"/api/employees/{self.staff_id}/timeline?limit=5").json()
+        self.assertEqual(len(page["items"]), 5)
+        rest = self.client.get(
+            f"/api/employees/{self.staff_id}/timeline", params={"cursor": page["next_cursor"]}
+        ).json()
+        self.assertEqual([i["kind"] for i in rest["items"]], ["advance", "salary_payment"])
+        self.assertIsNone(rest["next_cursor"])
+
+        self.assertEqual(
+            self.client.get(f"/api/employees/{self.staff_id}/timeline?cursor=bogus").status_code, 400
+        )
+        self.assertEqual(self.client.get("/api/employees/999/timeline").status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
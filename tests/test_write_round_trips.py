@@ -0,0 +1,116 @@
+"""
+Write endpoints run as one transaction: one commit per request and no reload
+round trips after it. Statement counts are pinned so a stray refresh or
+intermediate commit shows up here.
+"""
+import datetime as dt
+import unittest
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schema import Advance, AdvanceStatus, Employee, OffDay, OffDayStatus, Role
+from app.services.employee_directory import employee_directory
+from tests.support import QueryCounter, add_employee, api_client, memory_engine
+
+
+class WriteRoundTripTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = memory_engine()
+        self.client = api_client(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.admin_id = add_employee(self.db, "Ada", role=Role.ADMIN).id
+        self.manager_id = add_employee(self.db, "Mo", role=Role.MANAGER).id
+        self.staff_id = add_employee(self.db, "Sam").id
+        self.today = dt.date.today()
+        # Counts below are for a warm process (the directory loads once per process)
+        employee_directory.warm(self.db)
+
+    def tearDown(self):
+        self.db.close()
+
+    def _call(self, method, url, payload, statements, expected_status=200):
+        with QueryCounter(self.engine) as q:
+            r = self.client.request(method, url, json=payload)
+        self.assertEqual(r.status_code, expected_status, r.text)
+        self.assertEqual(q.commits, 1, q.statements)
+        self.assertEqual(q.count, statements, q.statements)
+        return r.json()
+
+    def _pending(self, model, **kw):
+        row = model(employee_id=self.staff_id, **kw)
+        self.db.add(row)
+        self.db.commit()
+        return row.id
+
+    def test_create_employee(self):
+        body = self._call("POST", "/api/employees", {
+            "first_name": "New", "last_name": "Hire", "role": "staff",
+            "salary": 30000, "phone_no": "0799999999",
+            "employment_start_date": str(self.today),
+        }, statements=4, expected_status=201)
+        self.assertEqual(body["days_worked_this_month"], 1)
+        self.assertEqual(body["total_days_worked"], 1)
+
+    def test_set_user_pin(self):
+        body = self._call("POST", "/api/user-auth", {"employee_id": self.staff_id, "pin": 1234},
+                          statements=2, expected_status=201)
+        self.assertEqual(body["first_name"], "Sam")
+        self.assertIsNotNone(body["id"])
+
+    def test_request_advance(self):
+        body = self._call("POST", "/api/advances", {"employee_id": self.staff_id, "amount": 100},
+                          statements=5, expected_status=201)
+        self.assertIsNotNone(self.db.get(Advance, body["id"]))
+
+    def test_approve_advance(self):
+        advance_id = self._pending(Advance, amount_for_advance=100, status=AdvanceStatus.PENDING)
+        # Includes the employee row lock that serialises approvals per employee
+        body = self._call("PUT", f"/api/advances/{advance_id}/approve", {"approved": True}, statements=7)
+        self.assertEqual(body["status"], "approved")
+
+    def test_auto_rejected_advance_commits_once(self):
+        advance_id = self._pending(Advance, amount_for_advance=10**7, status=AdvanceStatus.PENDING)
+        body = self._call("PUT", f"/api/advances/{advance_id}/approve", {"approved": True}, statements=7)
+        self.assertEqual(body["status"], "denied")
+        self.assertIn("AUTO-REJECTED", body["approval_notes"])
+
+    def test_add_bill(self):
+        self._call("POST", "/api/bills", {
+            "manager_id": self.manager_id, "employee_id": self.staff_id,
+            "amount": 50, "date": str(self.today),
+        }, statements=5, expected_status=201)
+
+    def test_request_off_day(self):
+        self._call("POST", "/api/off-days", {
+            "employee_id": self.staff_id, "date": str(self.today), "day_count": 1, "off_type": "full",
+        }, statements=1, expected_status=201)
+
+    def test_approve_off_day_updates_attendance_in_same_commit(self):
+        off_day_id = self._pending(
+            OffDay, date=self.today, day_count=1, off_type="full", status=OffDayStatus.PENDING
+        )
+        staff = self.db.get(Employee, self.staff_id)
+        expected = (self.today - staff.employment_start_date).days  # one day off
+        body = self._call("PUT", f"/api/off-days/{off_day_id}/approve", {"approved": True}, statements=5)
+        self.assertEqual(body["total_days_worked"], expected)
+        self.db.expire_all()
+        self.assertEqual(self.db.get(Employee, self.staff_id).total_days_worked, expected)
+
+    def test_record_salary_payment(self):
+        body = self._call("POST", "/api/salary-payments", {
+            "employee_id": self.staff_id, "admin_id": self.admin_id, "amount_paid": 100,
+        }, statements=4, expected_status=201)
+        self.assertIsNotNone(body["id"])
+
+    def test_close_payroll_period(self):
+        body = self._call("POST", "/api/admin/payroll/close-period", {
+            "employee_id": self.staff_id, "year": self.today.year, "month": self.today.month,
+        }, statements=8)
+        self.db.expire_all()
+        self.assertAlmostEqual(
+            body["salary_arrears_after"], self.db.get(Employee, self.staff_id).salary_arrears, places=2
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()